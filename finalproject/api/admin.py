@@ -0,0 +1,73 @@
+from typing import Protocol
+
+from fastapi import APIRouter, HTTPException
+from fastapi.requests import Request
+from pydantic import BaseModel
+
+from finalproject.store.backup import BackupResult, BackupUnavailable
+from finalproject.store.slow_queries import SlowQueryLog
+
+admin_api = APIRouter()
+
+
+class _Distributor(Protocol):
+    def slow_queries(self) -> SlowQueryLog:
+        pass
+
+    def backup(self, incremental: bool = False) -> BackupResult:
+        pass
+
+
+class SlowQueryItem(BaseModel):
+    sql: str
+    occurrences: int
+    worst_ms: float
+    parameters: list[str]
+    plan: list[str]
+
+
+class SlowQueriesResponse(BaseModel):
+    slow_queries: list[SlowQueryItem]
+
+
+class BackupResponse(BaseModel):
+    path: str
+    incremental: bool
+    size: int
+
+
+@admin_api.get(
+    "/slow_queries",
+    status_code=200,
+    response_model=SlowQueriesResponse,
+)
+def list_slow_queries(request: Request, limit: int = 10) -> SlowQueriesResponse:
+    distributor: _Distributor = request.app.state.distributor
+    return SlowQueriesResponse(
+        slow_queries=[
+            SlowQueryItem(
+                sql=summary.sql,
+                occurrences=summary.occurrences,
+                worst_ms=summary.worst.duration_ms,
+                parameters=list(summary.worst.parameters),
+                plan=list(summary.worst.plan),
+            )
+            for summary in distributor.slow_queries().worst(limit)
+        ]
+    )
+
+
+@admin_api.post(
+    "/backups",
+    status_code=201,
+    response_model=BackupResponse,
+)
+def create_backup(request: Request, incremental: bool = False) -> BackupResponse:
+    distributor: _Distributor = request.app.state.distributor
+    try:
+        result = distributor.backup(incremental)
+    except BackupUnavailable as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return BackupResponse(
+        path=result.path, incremental=result.incremental, size=result.size
+    )
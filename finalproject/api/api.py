@@ -6,10 +6,16 @@ from apexdevkit.server import UvicornServer
 from fastapi import FastAPI
 from starlette.testclient import TestClient
 
+from finalproject.api.admin import admin_api
 from finalproject.api.campaigns.buy_n_get_n import buy_n_get_n_api
 from finalproject.api.campaigns.combos import combos_api
 from finalproject.api.campaigns.product_discounts import product_discounts_api
 from finalproject.api.campaigns.receipt_discounts import receipt_discount_api
+from finalproject.api.metrics import (
+    metrics_api,
+    request_activity_middleware,
+    store_summary_middleware,
+)
 from finalproject.api.products import products_api
 from finalproject.api.receipts import receipts_api
 
@@ -25,6 +31,8 @@ class API(Protocol):
 class APIUsingFastAPI:
     def __init__(self, run_strategy: RunFastAPIStrategy) -> None:
         self._fast_api = FastAPI()
+        self._fast_api.middleware("http")(store_summary_middleware)
+        self._fast_api.middleware("http")(request_activity_middleware)
         self._register_routes()
         self._run_strategy = run_strategy
 
@@ -47,6 +55,8 @@ class APIUsingFastAPI:
             buy_n_get_n_api, prefix="/buy_n_get_n", tags=["BuyNGetN"]
         )
         self._fast_api.include_router(combos_api, prefix="/combos", tags=["Combos"])
+        self._fast_api.include_router(metrics_api, prefix="/metrics", tags=["Metrics"])
+        self._fast_api.include_router(admin_api, prefix="/admin", tags=["Admin"])
 
     def run(self) -> None:
         self._run_strategy.run(self._fast_api)
@@ -2,10 +2,13 @@ from typing import Protocol
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.requests import Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from finalproject.api.streaming import stream_list
 from finalproject.models.campaigns import BuyNGetN
 from finalproject.service.campaigns.buy_n_get_n import BuyNGetNService
+from finalproject.service.campaigns.snapshot import CampaignCatalog
 from finalproject.service.exceptions import BuyNGetNNotFound
 from finalproject.store.buy_n_get_n import BuyNGetNStore
 from finalproject.store.product import ProductStore
@@ -38,9 +41,11 @@ class ListBuyNGetNsResponse(BaseModel):
 
 def get_buy_n_get_n_service(request: Request) -> BuyNGetNService:
     distributor: _Distributor = request.app.state.distributor
+    campaigns: CampaignCatalog = request.app.state.campaigns
     return BuyNGetNService(
         distributor.products(),
         distributor.buy_n_get_n(),
+        campaigns,
     )
 
 
@@ -102,6 +107,5 @@ def remove_buy_n_get_n(
 )
 def list_buy_n_get_ns(
     campaign_service: BuyNGetNService = Depends(get_buy_n_get_n_service),
-) -> ListBuyNGetNsResponse:
-    buy_n_get_ns = campaign_service.get_all_buy_n_get_ns()
-    return ListBuyNGetNsResponse(buy_n_get_ns=buy_n_get_ns)
+) -> StreamingResponse:
+    return stream_list("buy_n_get_ns", campaign_service.iter_all_buy_n_get_ns())
@@ -1,11 +1,15 @@
+from contextlib import AbstractContextManager
 from typing import Protocol
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.requests import Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from finalproject.api.streaming import stream_list
 from finalproject.models.campaigns import Combo, ComboItem
 from finalproject.service.campaigns.combos import ComboService
+from finalproject.service.campaigns.snapshot import CampaignCatalog
 from finalproject.service.exceptions import ComboNotFound
 from finalproject.store.combo import ComboStore
 from finalproject.store.combo_item import ComboItemStore
@@ -24,6 +28,9 @@ class _Distributor(Protocol):
     def combo_items(self) -> ComboItemStore:
         pass
 
+    def transaction(self) -> AbstractContextManager[None]:
+        pass
+
 
 class ComboRequest(BaseModel):
     name: str
@@ -41,10 +48,13 @@ class ListCombosResponse(BaseModel):
 
 def get_combo_service(request: Request) -> ComboService:
     distributor: _Distributor = request.app.state.distributor
+    campaigns: CampaignCatalog = request.app.state.campaigns
     return ComboService(
         distributor.products(),
         distributor.combos(),
         distributor.combo_items(),
+        distributor,
+        campaigns,
     )
 
 
@@ -55,9 +65,8 @@ def get_combo_service(request: Request) -> ComboService:
 )
 def list_combos(
     campaign_service: ComboService = Depends(get_combo_service),
-) -> ListCombosResponse:
-    combos = campaign_service.get_all_combos()
-    return ListCombosResponse(combos=combos)
+) -> StreamingResponse:
+    return stream_list("combos", campaign_service.iter_all_combos())
 
 
 @combos_api.post(
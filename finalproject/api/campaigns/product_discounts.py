@@ -2,10 +2,13 @@ from typing import Protocol
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.requests import Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from finalproject.api.streaming import stream_list
 from finalproject.models.campaigns import ProductDiscount
 from finalproject.service.campaigns.product_discounts import ProductDiscountService
+from finalproject.service.campaigns.snapshot import CampaignCatalog
 from finalproject.service.exceptions import ProductDiscountNotFound
 from finalproject.store.product import ProductStore
 from finalproject.store.product_discount import ProductDiscountStore
@@ -36,9 +39,11 @@ class ListProductDiscountsResponse(BaseModel):
 
 def get_product_discount_service(request: Request) -> ProductDiscountService:
     distributor: _Distributor = request.app.state.distributor
+    campaigns: CampaignCatalog = request.app.state.campaigns
     return ProductDiscountService(
         distributor.products(),
         distributor.product_discount(),
+        campaigns,
     )
 
 
@@ -108,6 +113,7 @@ def list_product_discounts(
     product_discount_service: ProductDiscountService = Depends(
         get_product_discount_service
     ),
-) -> ListProductDiscountsResponse:
-    product_discounts = product_discount_service.get_all_product_discounts()
-    return ListProductDiscountsResponse(product_discounts=product_discounts)
+) -> StreamingResponse:
+    return stream_list(
+        "product_discounts", product_discount_service.iter_all_product_discounts()
+    )
@@ -2,10 +2,13 @@ from typing import Protocol
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.requests import Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from finalproject.api.streaming import stream_list
 from finalproject.models.campaigns import ReceiptDiscount
 from finalproject.service.campaigns.receipt_discounts import ReceiptDiscountService
+from finalproject.service.campaigns.snapshot import CampaignCatalog
 from finalproject.service.exceptions import ReceiptDiscountNotFound
 from finalproject.store.receipt_discount import ReceiptDiscountStore
 
@@ -32,8 +35,10 @@ class ListReceiptDiscountsResponse(BaseModel):
 
 def get_receipt_discount_service(request: Request) -> ReceiptDiscountService:
     distributor: _Distributor = request.app.state.distributor
+    campaigns: CampaignCatalog = request.app.state.campaigns
     return ReceiptDiscountService(
         distributor.receipt_discounts(),
+        campaigns,
     )
 
 
@@ -103,6 +108,7 @@ def list_receipt_discounts(
     receipt_discount_service: ReceiptDiscountService = Depends(
         get_receipt_discount_service
     ),
-) -> ListReceiptDiscountsResponse:
-    receipt_discounts = receipt_discount_service.get_all_receipt_discounts()
-    return ListReceiptDiscountsResponse(receipt_discounts=receipt_discounts)
+) -> StreamingResponse:
+    return stream_list(
+        "receipt_discounts", receipt_discount_service.iter_all_receipt_discounts()
+    )
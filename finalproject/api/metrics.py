@@ -0,0 +1,55 @@
+from typing import Awaitable, Callable, Protocol
+
+from fastapi import APIRouter, Response
+from fastapi.requests import Request
+
+from finalproject.store.maintenance import ActivityMonitor
+from finalproject.store.metrics import StoreMetrics, track_request
+
+metrics_api = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Distributor(Protocol):
+    def metrics(self) -> StoreMetrics:
+        pass
+
+    def activity(self) -> ActivityMonitor:
+        pass
+
+
+@metrics_api.get("", response_class=Response)
+def get_metrics(request: Request) -> Response:
+    distributor: _Distributor = request.app.state.distributor
+    return Response(
+        distributor.metrics().to_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE
+    )
+
+
+async def store_summary_middleware(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """
+    Reports the store work of each request in its Server-Timing header
+    """
+    with track_request() as summary:
+        response = await call_next(request)
+
+    response.headers["Server-Timing"] = (
+        f"store;dur={summary.seconds * 1000:.3f};"
+        f'desc="{summary.operations} operations, {summary.rows} rows, '
+        f'{summary.commits} commits"'
+    )
+    return response
+
+
+async def request_activity_middleware(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """
+    Counts requests, so maintenance can wait for a quiet period
+    """
+    distributor: _Distributor = request.app.state.distributor
+    distributor.activity().record_request()
+    return await call_next(request)
@@ -2,8 +2,10 @@ from typing import Protocol
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.requests import Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from finalproject.api.streaming import stream_list
 from finalproject.models.product import Product
 from finalproject.service.exceptions import ProductNotFound
 from finalproject.service.products import ProductService
@@ -43,9 +45,8 @@ def get_product_service(request: Request) -> ProductService:
 )
 def list_products(
     product_service: ProductService = Depends(get_product_service),
-) -> ListProductsResponse:
-    products = product_service.get_all_products()
-    return ListProductsResponse(products=products)
+) -> StreamingResponse:
+    return stream_list("products", product_service.iter_all_products())
 
 
 @products_api.post(
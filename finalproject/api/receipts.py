@@ -1,3 +1,4 @@
+from contextlib import AbstractContextManager
 from typing import Protocol
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -5,6 +6,7 @@ from pydantic import BaseModel
 from starlette.requests import Request
 
 from finalproject.models.models import Receipt
+from finalproject.service.campaigns.snapshot import CampaignCatalog
 from finalproject.service.currency_conversion.currency_conversion import (
     CurrencyConversionService,
 )
@@ -62,6 +64,9 @@ class _Distributor(Protocol):
     def paid_receipts(self) -> PaidReceiptStore:
         pass
 
+    def transaction(self) -> AbstractContextManager[None]:
+        pass
+
 
 class CreateReceiptRequest(BaseModel):
     shift_id: str
@@ -114,6 +119,7 @@ class DiscountResponse(BaseModel):
 
 def get_receipt_service(request: Request) -> ReceiptService:
     distributor: _Distributor = request.app.state.distributor
+    campaigns: CampaignCatalog = request.app.state.campaigns
 
     return ReceiptService(
         distributor.receipt(),
@@ -127,6 +133,8 @@ def get_receipt_service(request: Request) -> ReceiptService:
         distributor.receipt_discounts(),
         distributor.buy_n_get_n(),
         ExchangeRateAPIFacade(),
+        distributor,
+        campaigns,
     )
 
 
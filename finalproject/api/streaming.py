@@ -0,0 +1,22 @@
+import json
+from typing import Any, Iterable, Iterator
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+
+def stream_list(key: str, items: Iterable[Any]) -> StreamingResponse:
+    """
+    Writes {key: [...]} one item at a time, the same body as the list
+    response models, without holding every item or the whole body in memory
+    """
+
+    def body() -> Iterator[bytes]:
+        yield f"{{{json.dumps(key)}:[".encode()
+        separator = ""
+        for item in items:
+            yield (separator + json.dumps(jsonable_encoder(item))).encode()
+            separator = ","
+        yield b"]}"
+
+    return StreamingResponse(body(), media_type="application/json")
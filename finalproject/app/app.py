@@ -3,9 +3,11 @@ from __future__ import annotations
 from typing import Protocol
 
 from finalproject.api.api import API
+from finalproject.service.campaigns.snapshot import CampaignCatalog
 from finalproject.store.distributor import StoreDistributor
 
 STORE_DISTRIBUTOR_STATE_NAME = "distributor"
+CAMPAIGN_CATALOG_STATE_NAME = "campaigns"
 
 
 class App(Protocol):
@@ -19,6 +21,7 @@ class App(Protocol):
 class DefaultApp:
     def __init__(self, store_distributor: StoreDistributor):
         self._store_distributor = store_distributor
+        self._campaigns = CampaignCatalog()
         self._api_list: list[API] = []
 
     def with_api(self, api: API) -> App:
@@ -28,6 +31,7 @@ class DefaultApp:
 
     def _setup_state(self, api: API) -> None:
         api.register_state(STORE_DISTRIBUTOR_STATE_NAME, self._store_distributor)
+        api.register_state(CAMPAIGN_CATALOG_STATE_NAME, self._campaigns)
         # Add any state variables here
 
     def run_app(self) -> None:
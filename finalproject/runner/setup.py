@@ -1,13 +1,28 @@
+import os
+
 from finalproject.api.api import (
     APIUsingFastAPI,
     RunFastAPIStrategy,
 )
 from finalproject.app.app import App, DefaultApp
-from finalproject.store.distributor import SQLiteStoreDistributor, StoreDistributor
+from finalproject.store.archive import ArchiveConfig
+from finalproject.store.backup import BackupConfig
+from finalproject.store.distributor import (
+    DEFAULT_STORE_CACHES,
+    SQLiteStoreDistributor,
+    StoreDistributor,
+)
+from finalproject.store.maintenance import MaintenanceConfig
 
 
 def setup(run_strategy: RunFastAPIStrategy, database: str) -> App:
-    store_distributor = SQLiteStoreDistributor(database)
+    store_distributor = SQLiteStoreDistributor(
+        database,
+        caches=DEFAULT_STORE_CACHES,
+        maintenance=MaintenanceConfig(),
+        archive=ArchiveConfig(os.path.join(os.path.dirname(database), "archive")),
+        backup=BackupConfig(os.path.join(os.path.dirname(database), "backups")),
+    )
 
     api = APIUsingFastAPI(run_strategy)
 
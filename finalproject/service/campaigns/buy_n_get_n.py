@@ -1,8 +1,11 @@
 from dataclasses import dataclass
+from typing import Iterator
 
 from finalproject.models.campaigns import BuyNGetN
+from finalproject.service.campaigns.snapshot import CampaignCatalog
 from finalproject.service.exceptions import BuyNGetNNotFound
-from finalproject.service.store_utils import _validate_product, generate_id
+from finalproject.service.ids import generate_id
+from finalproject.service.store_utils import _validate_products
 from finalproject.store.buy_n_get_n import BuyNGetNStore
 from finalproject.store.product import ProductStore
 from finalproject.store.store import RecordNotFound
@@ -12,12 +15,16 @@ from finalproject.store.store import RecordNotFound
 class BuyNGetNService:
     product_store: ProductStore
     buy_n_get_n_store: BuyNGetNStore
+    campaigns: CampaignCatalog
 
     def add_buy_n_get_n(self, buy_n_get_n: BuyNGetN) -> BuyNGetN:
-        _validate_product(self.product_store, buy_n_get_n.buy_product_id)
-        _validate_product(self.product_store, buy_n_get_n.get_product_id)
+        _validate_products(
+            self.product_store,
+            [buy_n_get_n.buy_product_id, buy_n_get_n.get_product_id],
+        )
         buy_n_get_n.id = generate_id()
         self.buy_n_get_n_store.add(buy_n_get_n.to_record())
+        self.campaigns.bump()
         return buy_n_get_n
 
     def get_buy_n_get_n(self, buy_n_get_n_id: str) -> BuyNGetN:
@@ -29,12 +36,15 @@ class BuyNGetNService:
             raise BuyNGetNNotFound(buy_n_get_n_id)
 
     def get_all_buy_n_get_ns(self) -> list[BuyNGetN]:
-        buy_n_get_n_records = self.buy_n_get_n_store.list_all()
-        buy_n_get_ns = [BuyNGetN.from_record(record) for record in buy_n_get_n_records]
-        return buy_n_get_ns
+        return list(self.iter_all_buy_n_get_ns())
+
+    def iter_all_buy_n_get_ns(self) -> Iterator[BuyNGetN]:
+        for record in self.buy_n_get_n_store.iter_all():
+            yield BuyNGetN.from_record(record)
 
     def remove_buy_n_get_n(self, buy_n_get_n_id: str) -> None:
         try:
             self.buy_n_get_n_store.remove(buy_n_get_n_id)
         except RecordNotFound:
             raise BuyNGetNNotFound(buy_n_get_n_id)
+        self.campaigns.bump()
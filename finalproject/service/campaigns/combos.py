@@ -1,12 +1,18 @@
+from collections import defaultdict
 from dataclasses import dataclass
+from itertools import islice
+from typing import Iterator
 
 from finalproject.models.campaigns import Combo, ComboItem
+from finalproject.service.campaigns.snapshot import CampaignCatalog
 from finalproject.service.exceptions import ComboNotFound
-from finalproject.service.store_utils import _validate_product, generate_id
+from finalproject.service.ids import generate_id
+from finalproject.service.store_utils import _validate_products
 from finalproject.store.combo import ComboStore
 from finalproject.store.combo_item import ComboItemStore
 from finalproject.store.product import ProductStore
-from finalproject.store.store import RecordNotFound
+from finalproject.store.sqlstore import DEFAULT_BATCH_SIZE
+from finalproject.store.store import RecordNotFound, UnitOfWork
 
 
 @dataclass
@@ -14,16 +20,23 @@ class ComboService:
     product_store: ProductStore
     combo_store: ComboStore
     combo_item_store: ComboItemStore
+    unit_of_work: UnitOfWork
+    campaigns: CampaignCatalog
 
     def add_combo(self, combo: Combo) -> Combo:
-        for combo_item in combo.items:
-            _validate_product(self.product_store, combo_item.product_id)
+        _validate_products(
+            self.product_store, [combo_item.product_id for combo_item in combo.items]
+        )
 
         combo.id = generate_id()
-        self.combo_store.add(combo.to_record())
-        for combo_item in combo.items:
-            combo_item.id = generate_id()
-            self.combo_item_store.add(combo_item.to_record(combo.id))
+        with self.unit_of_work.transaction():
+            self.combo_store.add(combo.to_record())
+            for combo_item in combo.items:
+                combo_item.id = generate_id()
+            self.combo_item_store.add_many(
+                [combo_item.to_record(combo.id) for combo_item in combo.items]
+            )
+        self.campaigns.bump()
 
         return combo
 
@@ -40,23 +53,32 @@ class ComboService:
             raise ComboNotFound(combo_id)
 
     def get_all_combos(self) -> list[Combo]:
-        combo_records = self.combo_store.list_all()
-        combos = []
-        for record in combo_records:
-            combo_item_records = self.combo_item_store.filter_by_field(
-                "combo_id", record.id
-            )
-            combo_items = [ComboItem.from_record(item) for item in combo_item_records]
-            combo = Combo.from_record(record, combo_items)
-            combos.append(combo)
-        return combos
+        return list(self.iter_all_combos())
+
+    def iter_all_combos(self) -> Iterator[Combo]:
+        """
+        Combos a batch at a time, with the items of each batch read at once
+        """
+        combos = self.combo_store.iter_all()
+        while combo_records := list(islice(combos, DEFAULT_BATCH_SIZE)):
+            combo_items: defaultdict[str, list[ComboItem]] = defaultdict(list)
+            for item in self.combo_item_store.filter_by_field_in(
+                "combo_id", [record.id for record in combo_records]
+            ):
+                combo_items[item.combo_id].append(ComboItem.from_record(item))
+            for record in combo_records:
+                yield Combo.from_record(record, combo_items[record.id])
 
     def remove_combo(self, combo_id: str) -> None:
-        try:
-            self.combo_store.remove(combo_id)
-        except RecordNotFound:
-            raise ComboNotFound(combo_id)
+        with self.unit_of_work.transaction():
+            try:
+                self.combo_store.remove(combo_id)
+            except RecordNotFound:
+                raise ComboNotFound(combo_id)
 
-        combo_item_records = self.combo_item_store.filter_by_field("combo_id", combo_id)
-        for record in combo_item_records:
-            self.combo_item_store.remove(record.id)
+            combo_item_records = self.combo_item_store.filter_by_field(
+                "combo_id", combo_id
+            )
+            for record in combo_item_records:
+                self.combo_item_store.remove(record.id)
+        self.campaigns.bump()
@@ -1,8 +1,11 @@
 from dataclasses import dataclass
+from typing import Iterator
 
 from finalproject.models.campaigns import ProductDiscount
+from finalproject.service.campaigns.snapshot import CampaignCatalog
 from finalproject.service.exceptions import ProductDiscountNotFound
-from finalproject.service.store_utils import _validate_product, generate_id
+from finalproject.service.ids import generate_id
+from finalproject.service.store_utils import _validate_product
 from finalproject.store.product import ProductStore
 from finalproject.store.product_discount import ProductDiscountStore
 from finalproject.store.store import RecordNotFound
@@ -12,6 +15,7 @@ from finalproject.store.store import RecordNotFound
 class ProductDiscountService:
     product_store: ProductStore
     product_discount_store: ProductDiscountStore
+    campaigns: CampaignCatalog
 
     def add_product_discount(
         self, product_discount: ProductDiscount
@@ -19,6 +23,7 @@ class ProductDiscountService:
         _validate_product(self.product_store, product_discount.product_id)
         product_discount.id = generate_id()
         self.product_discount_store.add(product_discount.to_record())
+        self.campaigns.bump()
         return product_discount
 
     def get_product_discount(self, product_discount_id: str) -> ProductDiscount:
@@ -32,14 +37,15 @@ class ProductDiscountService:
             raise ProductDiscountNotFound(product_discount_id)
 
     def get_all_product_discounts(self) -> list[ProductDiscount]:
-        product_discount_records = self.product_discount_store.list_all()
-        product_discounts = [
-            ProductDiscount.from_record(record) for record in product_discount_records
-        ]
-        return product_discounts
+        return list(self.iter_all_product_discounts())
+
+    def iter_all_product_discounts(self) -> Iterator[ProductDiscount]:
+        for record in self.product_discount_store.iter_all():
+            yield ProductDiscount.from_record(record)
 
     def remove_product_discount(self, product_discount_id: str) -> None:
         try:
             self.product_discount_store.remove(product_discount_id)
         except RecordNotFound:
             raise ProductDiscountNotFound(product_discount_id)
+        self.campaigns.bump()
@@ -1,8 +1,10 @@
 from dataclasses import dataclass
+from typing import Iterator
 
 from finalproject.models.campaigns import ReceiptDiscount
+from finalproject.service.campaigns.snapshot import CampaignCatalog
 from finalproject.service.exceptions import ReceiptDiscountNotFound
-from finalproject.service.store_utils import generate_id
+from finalproject.service.ids import generate_id
 from finalproject.store.receipt_discount import ReceiptDiscountStore
 from finalproject.store.store import RecordNotFound
 
@@ -10,12 +12,14 @@ from finalproject.store.store import RecordNotFound
 @dataclass
 class ReceiptDiscountService:
     receipt_discount_store: ReceiptDiscountStore
+    campaigns: CampaignCatalog
 
     def add_receipt_discount(
         self, receipt_discount: ReceiptDiscount
     ) -> ReceiptDiscount:
         receipt_discount.id = generate_id()
         self.receipt_discount_store.add(receipt_discount.to_record())
+        self.campaigns.bump()
         return receipt_discount
 
     def get_receipt_discount(self, receipt_discount_id: str) -> ReceiptDiscount:
@@ -29,14 +33,15 @@ class ReceiptDiscountService:
             raise ReceiptDiscountNotFound(receipt_discount_id)
 
     def get_all_receipt_discounts(self) -> list[ReceiptDiscount]:
-        receipt_discount_records = self.receipt_discount_store.list_all()
-        receipt_discounts = [
-            ReceiptDiscount.from_record(record) for record in receipt_discount_records
-        ]
-        return receipt_discounts
+        return list(self.iter_all_receipt_discounts())
+
+    def iter_all_receipt_discounts(self) -> Iterator[ReceiptDiscount]:
+        for record in self.receipt_discount_store.iter_all():
+            yield ReceiptDiscount.from_record(record)
 
     def remove_receipt_discount(self, receipt_discount_id: str) -> None:
         try:
             self.receipt_discount_store.remove(receipt_discount_id)
         except RecordNotFound:
             raise ReceiptDiscountNotFound(receipt_discount_id)
+        self.campaigns.bump()
@@ -0,0 +1,88 @@
+import threading
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+from finalproject.models.campaigns import (
+    BuyNGetN,
+    Combo,
+    ProductDiscount,
+    ReceiptDiscount,
+)
+from finalproject.service.receipt_close.campaign_index import CampaignIndex
+from finalproject.service.receipt_close.pricing_engine import PricingEngine
+from finalproject.service.receipt_close.receipt_close import ReceiptClose
+
+
+@dataclass(frozen=True)
+class CampaignSnapshot:
+    """
+    Every campaign at one version of the rules, compiled for pricing.
+
+    Nothing in it changes after compile(), so one snapshot prices any
+    number of receipts from any thread.
+    """
+
+    version: int
+    receipt_discounts: tuple[ReceiptDiscount, ...]
+    index: CampaignIndex
+    buy_n_get_ns: tuple[BuyNGetN, ...]
+    receipt_close: ReceiptClose
+
+    @classmethod
+    def compile(
+        cls,
+        version: int,
+        receipt_discounts: Sequence[ReceiptDiscount],
+        product_discounts: Sequence[ProductDiscount],
+        combos: Sequence[Combo],
+        buy_n_get_ns: Sequence[BuyNGetN],
+    ) -> "CampaignSnapshot":
+        index = CampaignIndex.build(product_discounts, combos, buy_n_get_ns)
+
+        return cls(
+            version=version,
+            receipt_discounts=tuple(receipt_discounts),
+            index=index,
+            buy_n_get_ns=tuple(buy_n_get_ns),
+            receipt_close=PricingEngine(index, receipt_discounts),
+        )
+
+
+class CampaignCatalog:
+    """
+    Version of the campaign rules and the snapshot compiled for it.
+
+    Campaign services bump the version after every change they commit. The
+    next pricing compiles a new snapshot, until then receipts are priced
+    from the cached one without reading the campaign stores. Changes made
+    to the stores directly are not seen before the next bump.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._version = 0
+        self._snapshot: CampaignSnapshot | None = None
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def bump(self) -> None:
+        with self._lock:
+            self._version += 1
+
+    def snapshot(
+        self, compile_snapshot: Callable[[int], CampaignSnapshot]
+    ) -> CampaignSnapshot:
+        with self._lock:
+            version, snapshot = self._version, self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        # Compiled outside the lock, a bump while it runs only means the
+        # next pricing compiles again
+        snapshot = compile_snapshot(version)
+        with self._lock:
+            if self._snapshot is None or self._snapshot.version < snapshot.version:
+                self._snapshot = snapshot
+        return snapshot
@@ -1,8 +1,8 @@
-from typing import List
+from typing import Iterator, List
 
 from finalproject.models.product import Product
 from finalproject.service.exceptions import ProductNotFound
-from finalproject.service.store_utils import generate_id
+from finalproject.service.ids import generate_id
 from finalproject.store.product import ProductStore
 from finalproject.store.store import RecordNotFound
 
@@ -24,9 +24,11 @@ class ProductService:
         return Product.from_record(product_record)
 
     def get_all_products(self) -> List[Product]:
-        product_records = self.product_store.list_all()
-        products = [Product.from_record(record) for record in product_records]
-        return products
+        return list(self.iter_all_products())
+
+    def iter_all_products(self) -> Iterator[Product]:
+        for record in self.product_store.iter_all():
+            yield Product.from_record(record)
 
     def update_product(self, product: Product) -> Product:
         try:
@@ -0,0 +1,77 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Iterable, Mapping, Sequence, TypeVar
+
+from finalproject.models.campaigns import BuyNGetN, Combo, ProductDiscount
+
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True)
+class CampaignIndex:
+    """
+    Item level campaigns keyed by the products that trigger them.
+
+    A campaign whose trigger products are not all in a receipt changes
+    nothing about its price, so only the ones found here for the products
+    of the receipt need to run.
+    """
+
+    product_discounts: Mapping[str, tuple[ProductDiscount, ...]]
+    combos: tuple[Combo, ...]
+    # Position in combos of every combo, under the product of its first item
+    combos_by_product: Mapping[str, tuple[int, ...]]
+    combo_products: tuple[frozenset[str], ...]
+    buy_n_get_ns: Mapping[str, tuple[BuyNGetN, ...]]
+
+    @classmethod
+    def build(
+        cls,
+        product_discounts: Sequence[ProductDiscount],
+        combos: Sequence[Combo],
+        buy_n_get_ns: Sequence[BuyNGetN],
+    ) -> "CampaignIndex":
+        return cls(
+            product_discounts=_group(
+                (discount.product_id, discount) for discount in product_discounts
+            ),
+            combos=tuple(combos),
+            # A combo without items never applies
+            combos_by_product=_group(
+                (combo.items[0].product_id, position)
+                for position, combo in enumerate(combos)
+                if combo.items
+            ),
+            combo_products=tuple(
+                frozenset(item.product_id for item in combo.items) for combo in combos
+            ),
+            buy_n_get_ns=_group(
+                (buy_n_get_n.buy_product_id, buy_n_get_n)
+                for buy_n_get_n in buy_n_get_ns
+            ),
+        )
+
+    def combos_for(self, products: set[str]) -> list[Combo]:
+        """
+        Combos whose products are all in the given set, in their original
+        order
+        """
+        return [
+            self.combos[position] for position in self.combo_positions_for(products)
+        ]
+
+    def combo_positions_for(self, products: set[str]) -> list[int]:
+        return sorted(
+            position
+            for product_id in products
+            for position in self.combos_by_product.get(product_id, ())
+            if self.combo_products[position] <= products
+        )
+
+
+def _group(pairs: Iterable[tuple[str, _T]]) -> Mapping[str, tuple[_T, ...]]:
+    groups: defaultdict[str, list[_T]] = defaultdict(list)
+    for key, value in pairs:
+        groups[key].append(value)
+    return MappingProxyType({key: tuple(values) for key, values in groups.items()})
@@ -0,0 +1,190 @@
+from collections import Counter
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Iterable, Mapping
+
+from finalproject.models.campaigns import Combo
+from finalproject.models.models import Receipt
+from finalproject.service.receipt_close.campaign_index import CampaignIndex
+from finalproject.service.receipt_close.receipt_close import ReceiptCloseInfo
+
+# Quantity vectors the search of one group of combos may keep alive,
+# shared out between its combos, past it only the ones with the biggest
+# savings so far go on
+MAX_STATES = 4096
+# Set counts of one combo tried from each vector, past it they are spread
+# evenly between none and as many as fit
+MAX_COUNTS = 32
+
+_Vector = tuple[int, ...]
+
+
+class ComboMatcher:
+    """
+    Decides how many sets of each combo a receipt gets, the way that saves
+    the customer the most.
+
+    Combos that share no product are solved apart. Within a group, a
+    dynamic program over the combos, biggest saving first, keeps the best
+    saving for every quantity vector still left in the receipt, so the
+    order of the campaigns does not matter and items are never counted
+    twice. Each combo may keep max_states divided by the size of the group
+    vectors alive, the best ones, and tries at most max_counts set counts
+    from each, which keeps small groups and quantities exact and bounds
+    the work of large ones at the cost of exactness there. Results are
+    memoized on the quantity vector of the group.
+    """
+
+    def __init__(
+        self,
+        index: CampaignIndex,
+        max_states: int = MAX_STATES,
+        max_counts: int = MAX_COUNTS,
+    ) -> None:
+        self._index = index
+        self._max_states = max_states
+        self._max_counts = max(max_counts, 2)
+        self._requirements = tuple(_requirement(combo) for combo in index.combos)
+        self._solve = lru_cache(maxsize=1024)(self._solve_group)
+
+    def apply(self, receipt: Receipt, info: ReceiptCloseInfo) -> None:
+        """
+        Records the chosen combo sets in info.combo_discounts, after the
+        product discounts are known, since they scale what a combo saves
+        """
+        quantities: Counter[str] = Counter()
+        values: dict[str, float] = {}
+        for item in receipt.items:
+            quantities[item.product_id] += item.quantity
+            values.setdefault(
+                item.product_id, item.price * info.discounts[item.product_id]
+            )
+
+        positions = [
+            position
+            for position in self._index.combo_positions_for(set(quantities))
+            if self._index.combos[position].discount > 0
+            and self._requirements[position]
+            and all(
+                quantities[product_id] >= quantity
+                for product_id, quantity in self._requirements[position].items()
+            )
+        ]
+
+        for group in self._groups(positions):
+            products = self._products(group)
+            counts = self._solve(
+                group,
+                tuple(quantities[product_id] for product_id in products),
+                tuple(values[product_id] for product_id in products),
+            )
+            for position, count in zip(group, counts):
+                if count == 0:
+                    continue
+                combo = self._index.combos[position]
+                for product_id, quantity in self._requirements[position].items():
+                    info.combo_discounts[product_id].append(
+                        (1 - combo.discount, quantity * count)
+                    )
+
+    def _groups(self, positions: list[int]) -> list[tuple[int, ...]]:
+        """
+        Combos connected through shared products, each one solved alone
+        """
+        parent = {position: position for position in positions}
+
+        def find(position: int) -> int:
+            while parent[position] != position:
+                parent[position] = parent[parent[position]]
+                position = parent[position]
+            return position
+
+        owner: dict[str, int] = {}
+        for position in positions:
+            for product_id in self._requirements[position]:
+                if product_id in owner:
+                    parent[find(position)] = find(owner[product_id])
+                else:
+                    owner[product_id] = position
+
+        groups: dict[int, list[int]] = {}
+        for position in positions:
+            groups.setdefault(find(position), []).append(position)
+        return [tuple(group) for group in groups.values()]
+
+    def _products(self, group: tuple[int, ...]) -> list[str]:
+        return sorted(
+            {
+                product_id
+                for position in group
+                for product_id in self._requirements[position]
+            }
+        )
+
+    def _solve_group(
+        self, group: tuple[int, ...], quantities: _Vector, values: tuple[float, ...]
+    ) -> tuple[int, ...]:
+        products = self._products(group)
+        requirements = [
+            tuple(
+                self._requirements[position].get(product_id, 0)
+                for product_id in products
+            )
+            for position in group
+        ]
+        savings = [
+            self._index.combos[position].discount
+            * sum(quantity * value for quantity, value in zip(requirement, values))
+            for position, requirement in zip(group, requirements)
+        ]
+        order = sorted(range(len(group)), key=lambda i: (-savings[i], group[i]))
+        width = max(self._max_states // len(group), 1)
+
+        states: dict[_Vector, float] = {quantities: 0.0}
+        steps: list[dict[_Vector, tuple[_Vector, int]]] = []
+        for i in order:
+            reached: dict[_Vector, float] = {}
+            step: dict[_Vector, tuple[_Vector, int]] = {}
+            for state, total in states.items():
+                for count in self._counts(state, requirements[i]):
+                    left = tuple(a - count * b for a, b in zip(state, requirements[i]))
+                    saved = total + count * savings[i]
+                    if left not in reached or saved > reached[left]:
+                        reached[left] = saved
+                        step[left] = (state, count)
+
+            if len(reached) > width:
+                best = sorted(reached, key=lambda left: (-reached[left], left))
+                reached = {left: reached[left] for left in best[:width]}
+            states = reached
+            steps.append(step)
+
+        state = max(states, key=lambda left: (states[left], left))
+        counts = [0] * len(group)
+        for i, step in zip(reversed(order), reversed(steps)):
+            state, counts[i] = step[state]
+        return tuple(counts)
+
+    def _counts(self, left: _Vector, requirement: _Vector) -> Iterable[int]:
+        most = min(a // b for a, b in zip(left, requirement) if b > 0)
+        if most < self._max_counts:
+            return range(most + 1)
+        return sorted(
+            {most * j // (self._max_counts - 1) for j in range(self._max_counts)}
+        )
+
+
+def _requirement(combo: Combo) -> Mapping[str, int]:
+    """
+    Quantity of each product one set of the combo takes
+    """
+    quantities: Counter[str] = Counter()
+    for item in combo.items:
+        quantities[item.product_id] += item.quantity
+    return MappingProxyType(
+        {
+            product_id: quantity
+            for product_id, quantity in quantities.items()
+            if quantity > 0
+        }
+    )
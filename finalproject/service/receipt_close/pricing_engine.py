@@ -0,0 +1,78 @@
+from bisect import bisect_right
+from collections import Counter
+from itertools import accumulate
+from typing import Sequence
+
+from finalproject.models.campaigns import ReceiptDiscount
+from finalproject.models.models import Receipt
+from finalproject.service.receipt_close.campaign_index import CampaignIndex
+from finalproject.service.receipt_close.combo_matcher import ComboMatcher
+from finalproject.service.receipt_close.receipt_close import (
+    RECEIPT_KEY,
+    ReceiptClose,
+    ReceiptCloseInfo,
+    ReceiptCloseResult,
+    calculate_subtotal,
+    get_info,
+)
+
+
+class PricingEngine(ReceiptClose):
+    """
+    Prices a receipt in fixed stages, each done once:
+
+    1. discounts of the products in the receipt, then the combo sets that
+       save the most
+    2. the subtotal
+    3. the best receipt discount whose minimum total the subtotal reaches,
+       found by binary search over the tiers sorted by minimum total
+    4. the products given away by buy N get N campaigns
+    """
+
+    def __init__(
+        self, index: CampaignIndex, receipt_discounts: Sequence[ReceiptDiscount]
+    ) -> None:
+        tiers = sorted(receipt_discounts, key=lambda tier: tier.minimum_total)
+        self._index = index
+        self._combos = ComboMatcher(index)
+        self._minimum_totals = [tier.minimum_total for tier in tiers]
+        # Best multiplier among the tiers up to each position
+        self._multipliers = list(accumulate((1 - tier.discount for tier in tiers), min))
+
+    def close(
+        self, receipt: Receipt, info: ReceiptCloseInfo | None = None
+    ) -> ReceiptCloseResult:
+        _info = get_info(info)
+        quantities: Counter[str] = Counter()
+        for item in receipt.items:
+            quantities[item.product_id] += item.quantity
+        products = set(quantities)
+
+        for product_id in products:
+            # Latest first, the order already closed receipts were priced in
+            for discount in reversed(self._index.product_discounts.get(product_id, ())):
+                _info.discounts[product_id] *= 1 - discount.discount
+        self._combos.apply(receipt, _info)
+
+        subtotal = calculate_subtotal(receipt, _info)
+
+        _info.discounts[RECEIPT_KEY] = min(
+            _info.discounts[RECEIPT_KEY], self._receipt_multiplier(subtotal)
+        )
+
+        for product_id in products:
+            for buy_n_get_n in self._index.buy_n_get_ns.get(product_id, ()):
+                amount = quantities[product_id] // buy_n_get_n.buy_product_n
+                if amount > 0:
+                    _info.added_products[buy_n_get_n.get_product_id] += (
+                        buy_n_get_n.get_product_n * amount
+                    )
+
+        return ReceiptCloseResult(
+            price=subtotal * _info.discounts[RECEIPT_KEY],
+            added_products=_info.added_products,
+        )
+
+    def _receipt_multiplier(self, subtotal: float) -> float:
+        reached = bisect_right(self._minimum_totals, subtotal)
+        return self._multipliers[reached - 1] if reached else 1.0
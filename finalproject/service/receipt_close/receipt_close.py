@@ -28,7 +28,11 @@ def get_info(info: ReceiptCloseInfo | None) -> ReceiptCloseInfo:
     return info
 
 
-def calculate_cost(receipt: Receipt, info: ReceiptCloseInfo) -> float:
+def calculate_subtotal(receipt: Receipt, info: ReceiptCloseInfo) -> float:
+    """
+    Cost of the items after item level discounts and combos, before the
+    receipt discount
+    """
     total = 0.0
     for item in receipt.items:
         paid_amount = item.quantity
@@ -42,7 +46,6 @@ def calculate_cost(receipt: Receipt, info: ReceiptCloseInfo) -> float:
 
         item_cost *= info.discounts[item.product_id] * item.price
         total += item_cost
-    total *= info.discounts[RECEIPT_KEY]
     return total
 
 
@@ -1,3 +1,6 @@
+from collections import defaultdict
+from typing import Iterator
+
 from finalproject.models.campaigns import (
     BuyNGetN,
     Combo,
@@ -6,6 +9,7 @@ from finalproject.models.campaigns import (
     ReceiptDiscount,
 )
 from finalproject.models.models import Receipt, ReceiptItem
+from finalproject.service.campaigns.snapshot import CampaignCatalog, CampaignSnapshot
 from finalproject.service.currency_conversion.currency_conversion import (
     CurrencyConversionService,
 )
@@ -16,28 +20,20 @@ from finalproject.service.exceptions import (
     ReceiptNotFound,
     ShiftNotFound,
 )
-from finalproject.service.receipt_close.buy_n_get_n_decorator import BuyNGetNDecorator
-from finalproject.service.receipt_close.combo_decorator import ComboDecorator
-from finalproject.service.receipt_close.default_receipt_close import DefaultReceiptClose
-from finalproject.service.receipt_close.product_discount_decorator import (
-    ProductDiscountDecorator,
-)
+from finalproject.service.ids import generate_id
 from finalproject.service.receipt_close.receipt_close import ReceiptClose
-from finalproject.service.receipt_close.receipt_discount_decorator import (
-    ReceiptDiscountDecorator,
-)
+from finalproject.service.store_utils import _validate_products
 from finalproject.store.buy_n_get_n import BuyNGetNStore
 from finalproject.store.combo import ComboStore
 from finalproject.store.combo_item import ComboItemStore
 from finalproject.store.paid_receipt import PaidReceiptRecord, PaidReceiptStore
 from finalproject.store.product import ProductStore
 from finalproject.store.product_discount import ProductDiscountStore
-from finalproject.store.receipt import ReceiptStore
+from finalproject.store.receipt import ReceiptStore, ReceiptWithItems
 from finalproject.store.receipt_discount import ReceiptDiscountStore
-from finalproject.store.receipt_item import ReceiptItemRecord, ReceiptItemStore
+from finalproject.store.receipt_item import ReceiptItemStore
 from finalproject.store.shift import ShiftStore
-from finalproject.store.store import RecordAlreadyExists, RecordNotFound
-from tests.service.service_utils import generate_id
+from finalproject.store.store import RecordAlreadyExists, RecordNotFound, UnitOfWork
 
 
 class ReceiptService:
@@ -54,6 +50,8 @@ class ReceiptService:
         receipt_discount_store: ReceiptDiscountStore,
         buy_n_get_n_store: BuyNGetNStore,
         currency_conversion_service: CurrencyConversionService,
+        unit_of_work: UnitOfWork,
+        campaigns: CampaignCatalog,
     ):
         self.receipt_store = receipt_store
         self.receipt_item_store = receipt_item_store
@@ -68,151 +66,112 @@ class ReceiptService:
         self.buy_n_get_n_store = buy_n_get_n_store
 
         self.currency_conversion_service = currency_conversion_service
+        self.unit_of_work = unit_of_work
+        self.campaigns = campaigns
 
     def add_receipt(self, receipt: Receipt) -> Receipt:
         self._validate_shift(receipt.shift_id)
-        self._add_receipt_to_store(receipt)
-        self._add_items_to_receipt(receipt)
+        with self.unit_of_work.transaction():
+            self._add_receipt_to_store(receipt)
+            self._add_items_to_receipt(receipt)
         return receipt
 
     def get_receipt(self, receipt_id: str) -> Receipt:
         try:
-            receipt_record = self.receipt_store.get_by_id(receipt_id)
-            receipt_item_records = self.receipt_item_store.get_by_receipt_id(receipt_id)
-            receipt_items = [
-                ReceiptItem.from_record(item) for item in receipt_item_records
-            ]
-            receipt = Receipt.from_record(receipt_record, receipt_items)
-            return receipt
+            return self._to_receipt(self.receipt_store.get_with_items(receipt_id))
         except RecordNotFound:
             raise ReceiptNotFound(receipt_id)
 
     def get_all_receipts(self) -> list[Receipt]:
-        receipt_records = self.receipt_store.list_all()
-        receipts = []
-        for record in receipt_records:
-            receipt_item_records = self.receipt_item_store.get_by_receipt_id(record.id)
-            receipt_items = [
-                ReceiptItem.from_record(item) for item in receipt_item_records
-            ]
-            receipt = Receipt.from_record(record, receipt_items)
-            receipts.append(receipt)
-        return receipts
+        return list(self.iter_all_receipts())
+
+    def iter_all_receipts(self) -> Iterator[Receipt]:
+        for receipt in self.receipt_store.iter_all_with_items():
+            yield self._to_receipt(receipt)
 
     def get_receipts_by_shift_id(self, shift_id: str) -> list[Receipt]:
         self._validate_shift(shift_id)
-        receipt_records = self.receipt_store.get_by_shift_id(shift_id)
-        receipts = []
-        for record in receipt_records:
-            receipt_item_records = self.receipt_item_store.get_by_receipt_id(record.id)
-            receipt_items = [
-                ReceiptItem.from_record(item) for item in receipt_item_records
-            ]
-            receipt = Receipt.from_record(record, receipt_items)
-            receipts.append(receipt)
-        return receipts
+        return [
+            self._to_receipt(receipt)
+            for receipt in self.receipt_store.get_by_shift_id_with_items(shift_id)
+        ]
 
     def close_receipt(self, receipt_id: str, currency_name: str) -> Receipt:
         try:
-            receipt = self.get_receipt(receipt_id)
-            if not receipt.open:
-                return receipt
-
-            close_result = self._build_receipt_close().close(receipt)
-
-            for added_product_id in close_result.added_products:
-                self.update_product_in_receipt(
-                    receipt_id,
-                    added_product_id,
-                    close_result.added_products[added_product_id],
+            while True:
+                # Priced and converted before taking the write lock, the
+                # conversion may wait on a remote service
+                receipt = self.get_receipt(receipt_id)
+                if not receipt.open:
+                    return receipt
+
+                close_result = self._build_receipt_close().close(receipt)
+                in_currency_paid = self.currency_conversion_service.convert(
+                    close_result.price, "GEL", currency_name
                 )
 
-            in_currency_paid = self.currency_conversion_service.convert(
-                close_result.price, "GEL", currency_name
-            )
+                with self.unit_of_work.transaction():
+                    current = self.get_receipt(receipt_id)
+                    if not current.open:
+                        return current
+                    if current.items != receipt.items:
+                        # Items changed while it was priced, price it again
+                        continue
+
+                    for added_product_id in close_result.added_products:
+                        self.update_product_in_receipt(
+                            receipt_id,
+                            added_product_id,
+                            close_result.added_products[added_product_id],
+                        )
 
-            self.receipt_store.close_receipt_by_id(receipt_id)
+                    self.receipt_store.close_receipt_by_id(receipt_id)
 
-            self.paid_receipt_store.add(
-                PaidReceiptRecord(
-                    id=generate_id(),
-                    receipt_id=receipt_id,
-                    currency_name=currency_name,
-                    paid=in_currency_paid,
-                )
-            )
+                    self.paid_receipt_store.add(
+                        PaidReceiptRecord(
+                            id=generate_id(),
+                            receipt_id=receipt_id,
+                            currency_name=currency_name,
+                            paid=in_currency_paid,
+                        )
+                    )
 
-            return self.get_receipt(receipt_id)
+                    return self.get_receipt(receipt_id)
         except RecordNotFound:
             raise ReceiptNotFound(receipt_id)
 
     def update_product_in_receipt(
         self, receipt_id: str, product_id: str, quantity: int
     ) -> Receipt:
-        self._validate_product(product_id)
+        price = self._get_product_price(product_id)
         try:
-            receipt = self.get_receipt(receipt_id)
-
-            if not receipt.open:
-                return receipt
-
-            receipt_items = [
-                ReceiptItem.from_record(record)
-                for record in self.receipt_item_store.get_by_receipt_id(receipt_id)
-            ]
-
-            for receipt_item in receipt_items:
-                if product_id == receipt_item.product_id:
-                    new_quantity = max(receipt_item.quantity + quantity, 0)
-                    if new_quantity == 0:
-                        self.remove_product_from_receipt(receipt_id, product_id)
-                        return self.get_receipt(receipt_id)
-                    self.receipt_item_store.update(
-                        ReceiptItemRecord(
-                            id=receipt_item.id,
-                            receipt_id=receipt_id,
-                            product_id=product_id,
-                            quantity=new_quantity,
-                            price=receipt_item.price,
-                        )
-                    )
-                    return self.get_receipt(receipt_id)
-
-            if quantity > 0:
-                self.receipt_item_store.add(
-                    ReceiptItemRecord(
-                        id=generate_id(),
-                        receipt_id=receipt_id,
-                        product_id=product_id,
-                        quantity=quantity,
-                        price=self.product_store.get_by_id(product_id).price,
-                    )
-                )
-
-            return self.get_receipt(receipt_id)
+            receipt = self.receipt_store.get_by_id(receipt_id)
         except RecordNotFound:
             raise ReceiptNotFound(receipt_id)
 
-    def remove_product_from_receipt(self, receipt_id: str, product_id: str) -> None:
-        receipt: Receipt
+        if receipt.open:
+            self.receipt_item_store.increment_quantity(
+                receipt_id, product_id, quantity, price, new_id=generate_id()
+            )
+        return self.get_receipt(receipt_id)
 
+    def remove_product_from_receipt(self, receipt_id: str, product_id: str) -> None:
         try:
-            receipt = self.get_receipt(receipt_id)
-            if not receipt.open:
-                return None
+            receipt = self.receipt_store.get_by_id(receipt_id)
         except RecordNotFound:
             raise ReceiptNotFound(receipt_id)
 
+        if not receipt.open:
+            return None
+
         try:
-            for item in receipt.items:
-                if item.product_id == product_id:
-                    self.receipt_item_store.remove(item.id)
-                    return None
+            item = self.receipt_item_store.get_by_receipt_and_product(
+                receipt_id, product_id
+            )
+            self.receipt_item_store.remove(item.id)
         except RecordNotFound:
             raise ReceiptItemNotFound(product_id)
 
-        raise ReceiptItemNotFound(product_id)
-
     def get_receipt_cost(self, receipt_id: str) -> float:
         try:
             receipt = self.get_receipt(receipt_id)
@@ -232,36 +191,40 @@ class ReceiptService:
             raise ReceiptNotFound(receipt_id)
 
     def _build_receipt_close(self) -> ReceiptClose:
-        close: ReceiptClose = DefaultReceiptClose()
-
-        for rec_discount in self.receipt_discount_store.list_all():
-            close = ReceiptDiscountDecorator(
-                close, ReceiptDiscount.from_record(rec_discount)
-            )
-
-        for prod_discount in self.product_discount_store.list_all():
-            close = ProductDiscountDecorator(
-                close, ProductDiscount.from_record(prod_discount)
-            )
-
-        for combo in self.combo_store.list_all():
-            close = ComboDecorator(
-                close,
-                Combo.from_record(
-                    combo,
-                    [
-                        ComboItem.from_record(item)
-                        for item in self.combo_item_store.filter_by_field(
-                            "combo_id", combo.id
-                        )
-                    ],
-                ),
-            )
-
-        for bngn in self.buy_n_get_n_store.list_all():
-            close = BuyNGetNDecorator(close, BuyNGetN.from_record(bngn))
-
-        return close
+        return self.campaigns.snapshot(self._compile_campaigns).receipt_close
+
+    def _compile_campaigns(self, version: int) -> CampaignSnapshot:
+        combos = self.combo_store.list_all()
+        combo_items: defaultdict[str, list[ComboItem]] = defaultdict(list)
+        for item in self.combo_item_store.filter_by_field_in(
+            "combo_id", [combo.id for combo in combos]
+        ):
+            combo_items[item.combo_id].append(ComboItem.from_record(item))
+
+        return CampaignSnapshot.compile(
+            version,
+            receipt_discounts=[
+                ReceiptDiscount.from_record(record)
+                for record in self.receipt_discount_store.iter_all()
+            ],
+            product_discounts=[
+                ProductDiscount.from_record(record)
+                for record in self.product_discount_store.iter_all()
+            ],
+            combos=[
+                Combo.from_record(combo, combo_items[combo.id]) for combo in combos
+            ],
+            buy_n_get_ns=[
+                BuyNGetN.from_record(record)
+                for record in self.buy_n_get_n_store.iter_all()
+            ],
+        )
+
+    def _to_receipt(self, receipt: ReceiptWithItems) -> Receipt:
+        receipt_record, item_records = receipt
+        return Receipt.from_record(
+            receipt_record, [ReceiptItem.from_record(item) for item in item_records]
+        )
 
     def _validate_shift(self, shift_id: str) -> None:
         try:
@@ -277,13 +240,25 @@ class ReceiptService:
             raise ReceiptAlreadyExists(receipt.id)
 
     def _add_items_to_receipt(self, receipt: Receipt) -> None:
+        _validate_products(
+            self.product_store, [item.product_id for item in receipt.items]
+        )
+        # A receipt holds one line per product, like increment_quantity keeps it
+        lines: dict[str, ReceiptItem] = {}
+        for item in receipt.items:
+            if item.product_id in lines:
+                lines[item.product_id].quantity += item.quantity
+            else:
+                lines[item.product_id] = item
+        receipt.items = list(lines.values())
         for item in receipt.items:
             item.id = generate_id()
-            self._validate_product(item.product_id)
-            self.receipt_item_store.add(item.to_record(receipt.id))
+        self.receipt_item_store.add_many(
+            [item.to_record(receipt.id) for item in receipt.items]
+        )
 
-    def _validate_product(self, product_id: str) -> None:
+    def _get_product_price(self, product_id: str) -> float:
         try:
-            self.product_store.get_by_id(product_id)
+            return self.product_store.get_by_id(product_id).price
         except RecordNotFound:
             raise ProductNotFound(product_id)
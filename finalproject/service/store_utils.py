@@ -1,14 +1,8 @@
-import uuid
-
 from finalproject.service.exceptions import ProductNotFound
 from finalproject.store.product import ProductStore
 from finalproject.store.store import RecordNotFound
 
 
-def generate_id() -> str:
-    return str(uuid.uuid4())
-
-
 def check_correct_currency_name(currency_name: str) -> bool:
     return currency_name in ["USD", "EUR", "GEL"]
 
@@ -17,3 +11,10 @@ def _validate_product(product_store: ProductStore, product_id: str) -> None:
         product_store.get_by_id(product_id)
     except RecordNotFound:
         raise ProductNotFound(product_id)
+
+
+def _validate_products(product_store: ProductStore, product_ids: list[str]) -> None:
+    found = {record.id for record in product_store.get_many_by_ids(product_ids)}
+    for product_id in product_ids:
+        if product_id not in found:
+            raise ProductNotFound(product_id)
@@ -0,0 +1,155 @@
+import logging
+import os
+import re
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Sequence
+
+from finalproject.store.backup import CHANGE_LOG_TABLE
+from finalproject.store.database import SQLiteDatabase
+from finalproject.store.sqlstore import SQLBasicStore
+
+logger = logging.getLogger(__name__)
+
+_OF_SHIFT = "receipt_id IN (SELECT id FROM main.receipt WHERE shift_id = ?)"
+# Rows of a shift by table, children first, since they are selected
+# through the receipts of the shift
+_MOVED_ROWS = {
+    "receipt_item": _OF_SHIFT,
+    "paid_receipt": _OF_SHIFT,
+    "receipt": "shift_id = ?",
+    "shift": "id = ?",
+}
+_YEAR = re.compile(r"^\d{4}$")
+
+
+@dataclass(frozen=True)
+class ArchiveConfig:
+    directory: str
+    # Closed shifts that ended longer ago than this are moved out
+    retention_days: int = 90
+    closed_status: str = "closed"
+    file_prefix: str = "pos-archive"
+
+
+def archive_schema(year: str) -> str:
+    return f"archive_{year}"
+
+
+class ShiftArchiver:
+    """
+    Moves closed shifts past the retention age, with their receipts, items
+    and payments, out of the main database into one file per year of
+    their end time, which keeps the hot tables and their indexes small.
+
+    Archive files are attached to every connection and read through the
+    all_<table> views, see SQLiteDatabase.attach_archive. A year per file
+    keeps them within the databases SQLite attaches at once, a shift of a
+    year that would go past that limit stays in the main database. Every
+    shift is moved in its own transaction, so the write lock is held for
+    one shift at a time.
+    """
+
+    def __init__(
+        self,
+        database: SQLiteDatabase,
+        stores: Sequence[SQLBasicStore[Any]],
+        config: ArchiveConfig,
+        now: Callable[[], datetime] = datetime.now,
+    ) -> None:
+        self._db = database
+        self._stores = [store for store in stores if store.table_name in _MOVED_ROWS]
+        self._config = config
+        self._now = now
+        self._created: set[str] = set()
+
+    def attach_existing(self) -> None:
+        if not os.path.isdir(self._config.directory):
+            return
+        prefix = f"{self._config.file_prefix}-"
+        for name in sorted(os.listdir(self._config.directory), reverse=True):
+            year = name.removeprefix(prefix).removesuffix(".db")
+            if name.startswith(prefix) and name.endswith(".db") and _YEAR.match(year):
+                self._attach(year)
+
+    def archive(self) -> int:
+        """
+        Moves every closed shift past the retention age, returns how many
+        were moved
+        """
+        cutoff = self._now() - timedelta(days=self._config.retention_days)
+        shifts = self._db.reader.execute(
+            "SELECT id, end_time FROM main.shift WHERE status = ? AND end_time < ?",
+            (self._config.closed_status, cutoff.isoformat(timespec="seconds")),
+        ).fetchall()
+
+        moved = 0
+        for shift_id, end_time in shifts:
+            year = str(end_time)[:4]
+            if not _YEAR.match(year):
+                logger.warning("Shift %s has no usable end time", shift_id)
+                continue
+            schema = self._attach(year)
+            if schema is None:
+                logger.warning("Too many archives to attach, kept shift %s", shift_id)
+                continue
+            moved += self._move(shift_id, schema)
+        return moved
+
+    def run(self) -> bool:
+        """
+        Maintenance task, see MaintenanceScheduler
+        """
+        return self.archive() > 0
+
+    def _attach(self, year: str) -> str | None:
+        schema = archive_schema(year)
+        if schema in self._created:
+            return schema
+        limit = self._db.connection.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+        if len(self._created) >= limit:
+            return None
+
+        os.makedirs(self._config.directory, exist_ok=True)
+        path = os.path.join(
+            self._config.directory, f"{self._config.file_prefix}-{year}.db"
+        )
+        # Archives get the same tables and indexes as the main database
+        conn = sqlite3.connect(path)
+        try:
+            for store in self._stores:
+                conn.execute(store.table_schema())
+                for statement in store.index_statements():
+                    conn.execute(statement)
+            conn.commit()
+        finally:
+            conn.close()
+
+        self._db.attach_archive(schema, path, list(_MOVED_ROWS))
+        self._created.add(schema)
+        return schema
+
+    def _move(self, shift_id: Any, schema: str) -> bool:
+        conn = self._db.connection
+        if schema not in self._db.archives(conn):
+            # Out of attachable databases, the shift stays where it is
+            return False
+
+        # Under WAL a commit is atomic per file only, a crash in between
+        # leaves the rows in both, and the next run finishes the move
+        with self._db.transaction():
+            # A move changes no record, and incremental backups only cover
+            # the main database, so it stays out of the change log
+            logged = conn.execute(
+                f"SELECT coalesce(max(seq), 0) FROM {CHANGE_LOG_TABLE}"
+            ).fetchone()[0]
+            for table, where in _MOVED_ROWS.items():
+                conn.execute(
+                    f"INSERT OR IGNORE INTO {schema}.{table} "
+                    f"SELECT * FROM main.{table} WHERE {where}",
+                    (shift_id,),
+                )
+                conn.execute(f"DELETE FROM main.{table} WHERE {where}", (shift_id,))
+            conn.execute(f"DELETE FROM {CHANGE_LOG_TABLE} WHERE seq > ?", (logged,))
+        return True
@@ -0,0 +1,319 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Iterable
+
+from finalproject.store.binary_ids import IdCodec, decode_id
+from finalproject.store.database import SQLiteDatabase
+from finalproject.store.migrations import SCHEMA_METADATA_TABLE
+
+CHANGE_LOG_TABLE = "change_log"
+BACKUP_WATERMARK_KEY = "backup_change_seq"
+TRIGGER_PREFIX = "track_"
+FULL_PREFIX = "pos"
+INCREMENTAL_PREFIX = "pos-changes"
+_STAMP_FORMAT = "%Y%m%d-%H%M%S-%f"
+_STAMP_LENGTH = len("20240101-000000-000000")
+
+
+class BackupUnavailable(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class BackupConfig:
+    directory: str
+    # Pages copied per step of a full backup, and the pause after each
+    # step, which lets writers of other connections in between
+    pages_per_step: int = 256
+    step_sleep_seconds: float = 0.005
+    # How often the maintenance scheduler takes each kind, None never
+    full_every_seconds: float | None = 24 * 60 * 60
+    incremental_every_seconds: float | None = 60 * 60
+    # Full backups kept after a new one is taken, with the incremental
+    # ones taken since the oldest of them, None keeps every backup
+    keep_full: int | None = 7
+
+
+@dataclass(frozen=True)
+class BackupResult:
+    path: str
+    incremental: bool
+    # Pages copied by a full backup, changed rows in an incremental one
+    size: int
+    # Copies of the attached archive files, taken with a full backup
+    archives: tuple[str, ...] = ()
+
+
+# Filled by the triggers of change_trigger_statements, one row per written
+# record, so an incremental backup knows what changed since the last one
+CHANGE_LOG_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS {CHANGE_LOG_TABLE} (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name TEXT NOT NULL,
+    row_id
+)
+"""
+
+
+def change_trigger_statements(tables: Iterable[str]) -> tuple[str, ...]:
+    statements = []
+    for table in tables:
+        for event, row in [("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")]:
+            statements.append(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {TRIGGER_PREFIX}{table}_{event.lower()}
+                AFTER {event} ON {table}
+                BEGIN
+                    INSERT INTO {CHANGE_LOG_TABLE} (table_name, row_id)
+                    VALUES ('{table}', {row}.id);
+                END
+                """
+            )
+    return tuple(statements)
+
+
+def track_changes(
+    conn: sqlite3.Connection, tables: Iterable[str], enabled: bool
+) -> None:
+    """
+    Installs the change log triggers when backups are configured and drops
+    them with the logged changes when not, since only backups prune the log.
+
+    Changes made while the triggers were missing are in no change log, so
+    turning them on forgets the last backup, and the next incremental one
+    is taken as a full one.
+    """
+    tables = list(tables)
+    installed = {
+        name
+        for (name,) in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name GLOB ?",
+            (f"{TRIGGER_PREFIX}*",),
+        )
+    }
+    statements = change_trigger_statements(tables)
+    if enabled and len(installed) == len(statements):
+        return
+    if not enabled and not installed:
+        return
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if enabled:
+            for statement in statements:
+                conn.execute(statement)
+        else:
+            for name in installed:
+                conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+            conn.execute(f"DELETE FROM {CHANGE_LOG_TABLE}")
+        conn.execute(
+            f"DELETE FROM {SCHEMA_METADATA_TABLE} WHERE key = ?",
+            (BACKUP_WATERMARK_KEY,),
+        )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+class Backups:
+    """
+    Online backups of a running database.
+
+    A full backup copies the database with the SQLite backup API, a few
+    pages at a time, so it never needs the server stopped, along with every
+    attached archive file, which archived shifts are only found in. Moving
+    shifts to the archives is left out of the change log, so a shift moved
+    after the last full backup stays in its copy of the main database. An
+    incremental
+    backup writes every record changed since the previous backup, or its
+    removal, as JSON lines, taken from the change log, which is pruned up
+    to what was backed up. Without a full backup to build on, an
+    incremental one is taken as a full one.
+
+    Every full backup removes the ones past config.keep_full, and the
+    incremental ones older than the oldest full backup kept.
+    """
+
+    def __init__(
+        self,
+        database: SQLiteDatabase,
+        config: BackupConfig,
+        clock: Callable[[], float] = time.monotonic,
+        now: Callable[[], datetime] = datetime.now,
+    ) -> None:
+        self._db = database
+        self._config = config
+        self._clock = clock
+        self._now = now
+        self._lock = threading.Lock()
+        self._last_full: float | None = None
+        self._last_incremental: float | None = None
+
+    def full(self) -> BackupResult:
+        with self._lock:
+            return self._full()
+
+    def incremental(self) -> BackupResult:
+        with self._lock:
+            conn = self._db.reader
+            watermark = self._watermark(conn)
+            if watermark is None:
+                return self._full()
+
+            os.makedirs(self._config.directory, exist_ok=True)
+            path = self._path(INCREMENTAL_PREFIX, "jsonl")
+            changes = conn.execute(
+                f"""
+                SELECT table_name, row_id, max(seq) AS last_seq
+                FROM {CHANGE_LOG_TABLE} WHERE seq > ?
+                GROUP BY table_name, row_id ORDER BY last_seq
+                """,
+                (watermark,),
+            ).fetchall()
+
+            with open(path, "w", encoding="utf-8") as file:
+                for table_name, row_id, _ in changes:
+                    file.write(json.dumps(self._change(conn, table_name, row_id)))
+                    file.write("\n")
+
+            self._advance(max((seq for *_, seq in changes), default=watermark))
+            self._last_incremental = self._clock()
+            return BackupResult(path, incremental=True, size=len(changes))
+
+    def _full(self) -> BackupResult:
+        os.makedirs(self._config.directory, exist_ok=True)
+        path = self._path(FULL_PREFIX, "db")
+        source = self._db.reader
+        # Changes after this point may also be in the copy, exporting
+        # them again later is harmless
+        watermark = self._latest_change(source)
+
+        pages = self._copy(source, "main", path)
+        archives = []
+        for schema in self._db.archives(source):
+            archives.append(path.removesuffix(".db") + f"-{schema}.db")
+            self._copy(source, schema, archives[-1])
+
+        self._advance(watermark)
+        self._last_full = self._last_incremental = self._clock()
+        self._prune()
+        return BackupResult(
+            path, incremental=False, size=pages, archives=tuple(archives)
+        )
+
+    def _copy(self, source: sqlite3.Connection, schema: str, path: str) -> int:
+        """
+        Copies one database of the connection, returns its size in pages
+        """
+        pages = 0
+
+        def pause(status: int, remaining: int, total: int) -> None:
+            nonlocal pages
+            pages = total
+            if remaining:
+                time.sleep(self._config.step_sleep_seconds)
+
+        target = sqlite3.connect(path)
+        try:
+            source.backup(
+                target,
+                pages=self._config.pages_per_step,
+                progress=pause,
+                name=schema,
+            )
+        finally:
+            target.close()
+        return pages
+
+    def run_due(self) -> bool:
+        """
+        Maintenance task, takes the backups whose interval has passed
+        """
+        now = self._clock()
+        if _due(self._last_full, self._config.full_every_seconds, now):
+            self.full()
+            return True
+        if _due(self._last_incremental, self._config.incremental_every_seconds, now):
+            self.incremental()
+            return True
+        return False
+
+    def _path(self, prefix: str, extension: str) -> str:
+        stamp = self._now().strftime(_STAMP_FORMAT)
+        return os.path.join(self._config.directory, f"{prefix}-{stamp}.{extension}")
+
+    def _prune(self) -> None:
+        if self._config.keep_full is None:
+            return
+        # The backup just taken is always kept
+        keep = max(self._config.keep_full, 1)
+
+        # Every file of a backup starts with its stamp, archive copies after
+        # it carry the schema they were copied from
+        stamps: dict[str, str] = {}
+        fulls: list[str] = []
+        for name in os.listdir(self._config.directory):
+            if name.startswith(f"{INCREMENTAL_PREFIX}-") and name.endswith(".jsonl"):
+                stamps[name] = name[len(INCREMENTAL_PREFIX) + 1 :][:_STAMP_LENGTH]
+            elif name.startswith(f"{FULL_PREFIX}-") and name.endswith(".db"):
+                stamps[name] = name[len(FULL_PREFIX) + 1 :][:_STAMP_LENGTH]
+                if len(name) == len(FULL_PREFIX) + _STAMP_LENGTH + 4:
+                    fulls.append(stamps[name])
+        fulls.sort(reverse=True)
+        if len(fulls) <= keep:
+            return
+
+        oldest_kept = fulls[keep - 1]
+        for name, stamp in stamps.items():
+            if stamp < oldest_kept:
+                os.remove(os.path.join(self._config.directory, name))
+
+    def _change(
+        self, conn: sqlite3.Connection, table_name: str, row_id: Any
+    ) -> dict[str, Any]:
+        cursor = conn.execute(f"SELECT * FROM {table_name} WHERE id = ?", (row_id,))
+        row = cursor.fetchone()
+        record = None
+        if row is not None:
+            columns = [column[0] for column in cursor.description]
+            record = dict(zip(columns, IdCodec(columns).decode_row(row)))
+        return {"table": table_name, "id": decode_id(row_id), "record": record}
+
+    def _latest_change(self, conn: sqlite3.Connection) -> int:
+        seq: int | None = conn.execute(
+            f"SELECT max(seq) FROM {CHANGE_LOG_TABLE}"
+        ).fetchone()[0]
+        return seq or 0
+
+    def _watermark(self, conn: sqlite3.Connection) -> int | None:
+        """
+        Last change covered by a backup, None when there is no full backup
+        the change log builds on
+        """
+        row = conn.execute(
+            f"SELECT value FROM {SCHEMA_METADATA_TABLE} WHERE key = ?",
+            (BACKUP_WATERMARK_KEY,),
+        ).fetchone()
+        return None if row is None else int(row[0])
+
+    def _advance(self, watermark: int) -> None:
+        conn = self._db.connection
+        with self._db.transaction():
+            conn.execute(
+                f"""
+                INSERT INTO {SCHEMA_METADATA_TABLE} (key, value) VALUES (?, ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value
+                """,
+                (BACKUP_WATERMARK_KEY, str(watermark)),
+            )
+            conn.execute(f"DELETE FROM {CHANGE_LOG_TABLE} WHERE seq <= ?", (watermark,))
+
+
+def _due(last: float | None, every: float | None, now: float) -> bool:
+    return every is not None and (last is None or now - last >= every)
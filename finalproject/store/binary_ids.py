@@ -0,0 +1,106 @@
+import sqlite3
+from typing import Any, Iterable, Sequence
+from uuid import UUID
+
+from finalproject.store.migrations import SCHEMA_METADATA_TABLE
+
+ID_STORAGE_KEY = "id_storage"
+TEXT_IDS = "text"
+BINARY_IDS = "binary"
+
+
+def is_id_column(column: str) -> bool:
+    return column == "id" or column.endswith("_id")
+
+
+def encode_id(value: Any) -> Any:
+    """
+    Canonical UUID text becomes its 16 bytes, anything else is kept as is,
+    so ids that are not UUIDs still round trip
+    """
+    if type(value) is not str or len(value) != 36:
+        return value
+    try:
+        uuid = UUID(value)
+    except ValueError:
+        return value
+    return uuid.bytes if str(uuid) == value else value
+
+
+def decode_id(value: Any) -> Any:
+    if type(value) is bytes and len(value) == 16:
+        return str(UUID(bytes=value))
+    return value
+
+
+class IdCodec:
+    """
+    Converts the id columns of a table's rows between records and storage
+    """
+
+    def __init__(self, columns: Sequence[str]) -> None:
+        self._positions = tuple(i for i, c in enumerate(columns) if is_id_column(c))
+
+    def encode_row(self, row: tuple[Any, ...]) -> tuple[Any, ...]:
+        encoded = list(row)
+        for position in self._positions:
+            encoded[position] = encode_id(encoded[position])
+        return tuple(encoded)
+
+    def decode_row(self, row: tuple[Any, ...]) -> tuple[Any, ...]:
+        decoded = list(row)
+        for position in self._positions:
+            decoded[position] = decode_id(decoded[position])
+        return tuple(decoded)
+
+
+def migrate_id_storage(
+    conn: sqlite3.Connection,
+    tables: Iterable[tuple[str, Sequence[str]]],
+    binary: bool,
+) -> bool:
+    """
+    Rewrites the id columns of every table when the database stores ids in
+    the other format, returns whether anything was converted.
+
+    The format is kept in schema_metadata, so this is a single lookup once
+    the database matches the configuration.
+    """
+    wanted = BINARY_IDS if binary else TEXT_IDS
+    if _id_storage(conn) == wanted:
+        return False
+
+    conn.create_function("convert_id", 1, encode_id if binary else decode_id)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if _id_storage(conn) == wanted:
+            conn.rollback()
+            return False
+
+        for table_name, columns in tables:
+            id_columns = [column for column in columns if is_id_column(column)]
+            assignments = ", ".join(f"{c} = convert_id({c})" for c in id_columns)
+            conn.execute(f"UPDATE {table_name} SET {assignments}")
+        conn.execute(
+            f"""
+            INSERT INTO {SCHEMA_METADATA_TABLE} (key, value) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value
+            """,
+            (ID_STORAGE_KEY, wanted),
+        )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.create_function("convert_id", 1, None)
+
+    return True
+
+
+def _id_storage(conn: sqlite3.Connection) -> str:
+    row = conn.execute(
+        f"SELECT value FROM {SCHEMA_METADATA_TABLE} WHERE key = ?",
+        (ID_STORAGE_KEY,),
+    ).fetchone()
+    return TEXT_IDS if row is None else str(row[0])
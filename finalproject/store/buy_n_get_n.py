@@ -1,8 +1,10 @@
-import sqlite3
 from dataclasses import dataclass
 from typing import Protocol
 
-from finalproject.store.sqlstore import SQLRemovableStore
+from finalproject.store.database import SQLiteDatabase
+from finalproject.store.memorystore import MemoryDatabase, MemoryRemovableStore
+from finalproject.store.metrics import observed
+from finalproject.store.sqlstore import Index, SQLRemovableStore
 from finalproject.store.store import (
     BasicStore,
     Record,
@@ -25,22 +27,31 @@ class BuyNGetNStore(BasicStore[BuyNGetNRecord], RemovableStore, Protocol):
 
 
 class BuyNGetNSQLiteStore(SQLRemovableStore[BuyNGetNRecord]):
-    def __init__(self, connection: sqlite3.Connection) -> None:
-        super().__init__(connection, "buy_n_get_n")
-
-    def _create_table(self) -> None:
-        self._conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS buy_n_get_n (
-                id TEXT PRIMARY KEY,
-                buy_product_id TEXT,
-                buy_product_n INTEGER,
-                get_product_id TEXT,
-                get_product_n INTEGER
-            );
-            """
-        )
-        self._conn.commit()
+    def __init__(self, database: SQLiteDatabase) -> None:
+        super().__init__(database, "buy_n_get_n")
+
+    def table_schema(self) -> str:
+        return """
+        CREATE TABLE IF NOT EXISTS buy_n_get_n (
+            id TEXT PRIMARY KEY,
+            buy_product_id TEXT,
+            buy_product_n INTEGER,
+            get_product_id TEXT,
+            get_product_n INTEGER
+        );
+        """
+
+    def indexes(self) -> list[Index]:
+        return [Index(("buy_product_id",))]
+
+    def _columns(self) -> list[str]:
+        return [
+            "id",
+            "buy_product_id",
+            "buy_product_n",
+            "get_product_id",
+            "get_product_n",
+        ]
 
     def _record_to_row(self, record: BuyNGetNRecord) -> tuple[str, str, int, str, int]:
         return (
@@ -54,14 +65,18 @@ class BuyNGetNSQLiteStore(SQLRemovableStore[BuyNGetNRecord]):
     def _row_to_record(self, row: tuple[str, str, int, str, int]) -> BuyNGetNRecord:
         return BuyNGetNRecord(*row)
 
+    @observed("get_by_product_id")
     def get_by_product_id(self, product_id: str) -> list[BuyNGetNRecord]:
-        cursor = self._conn.cursor()
-        cursor.execute(
-            """
-            SELECT * FROM buy_n_get_n
-            WHERE buy_product_id = ?;
-            """,
-            (product_id,),
-        )
+        return self.filter_by_field("buy_product_id", product_id)
 
-        return [self._row_to_record(row) for row in cursor.fetchall()]
+
+class BuyNGetNMemoryStore(MemoryRemovableStore[BuyNGetNRecord]):
+    def __init__(self, database: MemoryDatabase) -> None:
+        super().__init__(database, "buy_n_get_n", BuyNGetNRecord)
+
+    def indexed_fields(self) -> tuple[str, ...]:
+        return ("buy_product_id",)
+
+    @observed("get_by_product_id")
+    def get_by_product_id(self, product_id: str) -> list[BuyNGetNRecord]:
+        return self.filter_by_field("buy_product_id", product_id)
@@ -0,0 +1,331 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Hashable,
+    Iterator,
+    Protocol,
+    Sequence,
+    TypeVar,
+    cast,
+)
+
+from finalproject.store.query import Query
+from finalproject.store.sqlstore import DEFAULT_BATCH_SIZE
+from finalproject.store.store import RecordT
+
+StoreT = TypeVar("StoreT")
+ValueT = TypeVar("ValueT")
+
+# Store specific reads that return records of the wrapped store only, cached
+# like filter_by_field
+_CACHED_READS = frozenset({"get_by_product_id", "get_by_receipt_id", "get_by_shift_id"})
+# Store specific reads that are passed through, they either return a single
+# record or join the records of other stores, whose writes the cache never sees
+_READS = frozenset(
+    {
+        "get_by_receipt_and_product",
+        "get_with_items",
+        "get_by_shift_id_with_items",
+        "list_all_with_items",
+        "iter_all_with_items",
+        "table_schema",
+        "indexes",
+        "index_statements",
+        "indexed_fields",
+        "unique_fields",
+    }
+)
+
+
+@dataclass(frozen=True)
+class CacheConfig:
+    max_entries: int = 1024
+    # Bounds how stale an entry can get when another process writes the
+    # same database, None keeps entries until they are evicted
+    ttl_seconds: float | None = None
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class TransactionHooks(Protocol):
+    @property
+    def in_transaction(self) -> bool:
+        pass
+
+    def after_transaction(self, callback: Callable[[], None]) -> None:
+        pass
+
+
+class LRUCache(Generic[ValueT]):
+    """
+    Bounded mapping that evicts the least recently used entry when full
+    and treats entries older than the TTL as missing
+    """
+
+    def __init__(
+        self,
+        config: CacheConfig,
+        stats: CacheStats,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._config = config
+        self._stats = stats
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, ValueT]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> ValueT | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[0]):
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self._stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: ValueT) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._config.max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _expired(self, stored_at: float) -> bool:
+        ttl = self._config.ttl_seconds
+        return ttl is not None and self._clock() - stored_at > ttl
+
+
+class CachedStore(Generic[RecordT]):
+    """
+    Read-through cache in front of a store.
+
+    Records are cached by id, list_all and filter_by_field results by their
+    arguments. Writes go to the store first, then replace the cached record
+    and drop every cached result list, since any write can change them.
+
+    Inside a transaction the writing thread bypasses the cache and writes
+    only evict, so a rollback never leaves uncommitted records behind, and
+    the written ids are evicted once more when the transaction ends.
+
+    Store specific reads are cached by their arguments when they return
+    records of this store alone, and passed through otherwise. Any other
+    store specific method, like close_receipt_by_id or increment_quantity,
+    is passed through clearing the cache before and after, since it may
+    write.
+
+    Every write bumps a counter, and a read that missed only fills the
+    cache when no write happened while it loaded, so a slow read never
+    puts back a record older than one written meanwhile.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        config: CacheConfig,
+        hooks: TransactionHooks,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._store = store
+        self._hooks = hooks
+        self.stats = CacheStats()
+        self._records: LRUCache[RecordT] = LRUCache(config, self.stats, clock)
+        self._results: LRUCache[list[RecordT]] = LRUCache(config, self.stats, clock)
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._store, name)
+        if not callable(attribute) or name in _READS:
+            return attribute
+        if name in _CACHED_READS:
+
+            def cached_read(*args: Any) -> list[RecordT]:
+                return self._cached_result((name, *args), lambda: attribute(*args))
+
+            return cached_read
+
+        def passthrough(*args: Any, **kwargs: Any) -> Any:
+            self._invalidate_all()
+            try:
+                return attribute(*args, **kwargs)
+            finally:
+                self._invalidate_all()
+
+        return passthrough
+
+    def get_by_id(self, unique_id: str) -> RecordT:
+        if self._hooks.in_transaction:
+            return cast(RecordT, self._store.get_by_id(unique_id))
+
+        record = self._records.get(unique_id)
+        if record is None:
+            writes = self._writes
+            record = self._store.get_by_id(unique_id)
+            self._fill(self._records, unique_id, record, writes)
+        return record
+
+    def get_many_by_ids(self, unique_ids: Sequence[str]) -> list[RecordT]:
+        if self._hooks.in_transaction:
+            return cast(list[RecordT], self._store.get_many_by_ids(unique_ids))
+
+        found: dict[str, RecordT] = {}
+        missing: list[str] = []
+        for unique_id in dict.fromkeys(unique_ids):
+            record = self._records.get(unique_id)
+            if record is None:
+                missing.append(unique_id)
+            else:
+                found[unique_id] = record
+
+        writes = self._writes
+        for record in self._store.get_many_by_ids(missing) if missing else []:
+            self._fill(self._records, record.id, record, writes)
+            found[record.id] = record
+        return [found[i] for i in dict.fromkeys(unique_ids) if i in found]
+
+    def list_all(self) -> list[RecordT]:
+        return self._cached_result(("list_all",), self._store.list_all)
+
+    def iter_all(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[RecordT]:
+        return iter(self.list_all())
+
+    def filter_by_field(self, field: str, value: str) -> list[RecordT]:
+        return self._cached_result(
+            ("filter_by_field", field, value),
+            lambda: self._store.filter_by_field(field, value),
+        )
+
+    def iter_filter(
+        self, field: str, value: str, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[RecordT]:
+        return iter(self.filter_by_field(field, value))
+
+    def filter_by_field_in(self, field: str, values: Sequence[str]) -> list[RecordT]:
+        return cast(list[RecordT], self._store.filter_by_field_in(field, values))
+
+    def find(self, query: Query) -> list[RecordT]:
+        return cast(list[RecordT], self._store.find(query))
+
+    def find_first(self, query: Query) -> RecordT:
+        return cast(RecordT, self._store.find_first(query))
+
+    def count(self, query: Query = Query()) -> int:
+        return cast(int, self._store.count(query))
+
+    def project(self, query: Query, fields: Sequence[str]) -> list[tuple[Any, ...]]:
+        return cast(list[tuple[Any, ...]], self._store.project(query, fields))
+
+    def add(self, record: RecordT) -> RecordT:
+        self._store.add(record)
+        self._written([record])
+        return record
+
+    def add_many(self, records: Sequence[RecordT]) -> list[RecordT]:
+        self._store.add_many(records)
+        self._written(records)
+        return list(records)
+
+    def update(self, record: RecordT) -> RecordT:
+        self._store.update(record)
+        self._written([record])
+        return record
+
+    def upsert(self, record: RecordT) -> RecordT:
+        self._store.upsert(record)
+        self._written([record])
+        return record
+
+    def remove(self, unique_id: str) -> None:
+        try:
+            self._store.remove(unique_id)
+        finally:
+            self._removed(unique_id)
+
+    def _cached_result(
+        self, key: Hashable, load: Callable[[], list[RecordT]]
+    ) -> list[RecordT]:
+        if self._hooks.in_transaction:
+            return load()
+
+        records = self._results.get(key)
+        if records is None:
+            writes = self._writes
+            records = load()
+            self._fill(self._results, key, records, writes)
+        # Callers own the list they get back
+        return list(records)
+
+    def _fill(
+        self, cache: LRUCache[ValueT], key: Hashable, value: ValueT, writes: int
+    ) -> None:
+        """
+        Caches what a read loaded, unless a write happened since it started
+        """
+        with self._lock:
+            if self._writes == writes:
+                cache.put(key, value)
+
+    def _bump(self) -> None:
+        with self._lock:
+            self._writes += 1
+
+    def _written(self, records: Sequence[RecordT]) -> None:
+        self._bump()
+        self._results.clear()
+        if self._hooks.in_transaction:
+            for record in records:
+                self._removed(record.id)
+        else:
+            for record in records:
+                self._records.put(record.id, record)
+
+    def _removed(self, unique_id: str) -> None:
+        self._bump()
+        self._records.pop(unique_id)
+        self._results.clear()
+        if self._hooks.in_transaction:
+            self._hooks.after_transaction(lambda: self._removed(unique_id))
+
+    def _invalidate_all(self) -> None:
+        self._bump()
+        self._records.clear()
+        self._results.clear()
+        if self._hooks.in_transaction:
+            self._hooks.after_transaction(self._invalidate_all)
+
+
+def with_cache(
+    store: StoreT, config: CacheConfig | None, hooks: TransactionHooks
+) -> StoreT:
+    """
+    Wraps the store in a CachedStore, or returns it as is without a config
+    """
+    if config is None:
+        return store
+    # CachedStore offers every method of the store it wraps
+    return cast(StoreT, CachedStore(store, config, hooks))
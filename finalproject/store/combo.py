@@ -1,7 +1,8 @@
-import sqlite3
 from dataclasses import dataclass
 from typing import Protocol
 
+from finalproject.store.database import SQLiteDatabase
+from finalproject.store.memorystore import MemoryDatabase, MemoryRemovableStore
 from finalproject.store.sqlstore import SQLRemovableStore
 from finalproject.store.store import (
     BasicStore,
@@ -26,23 +27,28 @@ class ComboStore(BasicStore[ComboRecord], RemovableStore, Protocol):
 
 
 class ComboSQLiteStore(SQLRemovableStore[ComboRecord]):
-    def __init__(self, connection: sqlite3.Connection) -> None:
-        super().__init__(connection, "combo")
-
-    def _create_table(self) -> None:
-        self._conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS combo (
-                id TEXT PRIMARY KEY,
-                name TEXT,
-                discount REAL
-            );
-            """
-        )
-        self._conn.commit()
+    def __init__(self, database: SQLiteDatabase) -> None:
+        super().__init__(database, "combo")
+
+    def table_schema(self) -> str:
+        return """
+        CREATE TABLE IF NOT EXISTS combo (
+            id TEXT PRIMARY KEY,
+            name TEXT,
+            discount REAL
+        );
+        """
+
+    def _columns(self) -> list[str]:
+        return ["id", "name", "discount"]
 
     def _record_to_row(self, record: ComboRecord) -> tuple[str, str, float]:
         return record.id, record.name, record.discount
 
     def _row_to_record(self, row: tuple[str, str, float]) -> ComboRecord:
         return ComboRecord(*row)
+
+
+class ComboMemoryStore(MemoryRemovableStore[ComboRecord]):
+    def __init__(self, database: MemoryDatabase) -> None:
+        super().__init__(database, "combo", ComboRecord)
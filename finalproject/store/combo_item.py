@@ -1,8 +1,9 @@
-import sqlite3
 from dataclasses import dataclass
 from typing import Protocol
 
-from finalproject.store.sqlstore import SQLRemovableStore
+from finalproject.store.database import SQLiteDatabase
+from finalproject.store.memorystore import MemoryDatabase, MemoryRemovableStore
+from finalproject.store.sqlstore import Index, SQLRemovableStore
 from finalproject.store.store import (
     BasicStore,
     Record,
@@ -27,24 +28,35 @@ class ComboItemStore(BasicStore[ComboItemRecord], RemovableStore, Protocol):
 
 
 class ComboItemSQLiteStore(SQLRemovableStore[ComboItemRecord]):
-    def __init__(self, connection: sqlite3.Connection) -> None:
-        super().__init__(connection, "combo_item")
-
-    def _create_table(self) -> None:
-        self._conn.execute(
-            f"""
-            CREATE TABLE IF NOT EXISTS {self.table_name} (
-                id TEXT PRIMARY KEY,
-                combo_id TEXT,
-                product_id TEXT,
-                quantity INTEGER
-            );
-            """
-        )
-        self._conn.commit()
+    def __init__(self, database: SQLiteDatabase) -> None:
+        super().__init__(database, "combo_item")
+
+    def table_schema(self) -> str:
+        return f"""
+        CREATE TABLE IF NOT EXISTS {self.table_name} (
+            id TEXT PRIMARY KEY,
+            combo_id TEXT,
+            product_id TEXT,
+            quantity INTEGER
+        );
+        """
+
+    def indexes(self) -> list[Index]:
+        return [Index(("combo_id",))]
+
+    def _columns(self) -> list[str]:
+        return ["id", "combo_id", "product_id", "quantity"]
 
     def _record_to_row(self, record: ComboItemRecord) -> tuple[str, str, str, int]:
         return record.id, record.combo_id, record.product_id, record.quantity
 
     def _row_to_record(self, row: tuple[str, str, str, int]) -> ComboItemRecord:
         return ComboItemRecord(*row)
+
+
+class ComboItemMemoryStore(MemoryRemovableStore[ComboItemRecord]):
+    def __init__(self, database: MemoryDatabase) -> None:
+        super().__init__(database, "combo_item", ComboItemRecord)
+
+    def indexed_fields(self) -> tuple[str, ...]:
+        return ("combo_id", "product_id")
@@ -0,0 +1,327 @@
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Iterator, Sequence
+
+from finalproject.store.metrics import StoreMetrics
+from finalproject.store.slow_queries import SlowQueryConfig, SlowQueryLog
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SQLiteConfig:
+    # Set on new databases only, an existing one keeps its mode until a
+    # full VACUUM
+    auto_vacuum: str = "INCREMENTAL"
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    busy_timeout_ms: int = 5000
+    cache_size_kib: int = 16 * 1024
+    mmap_size_bytes: int = 256 * 1024 * 1024
+    # Prepared statements kept per connection, keyed by SQL text
+    cached_statements: int = 256
+    # Stores UUID ids as 16 byte BLOBs instead of 36 character TEXT
+    binary_ids: bool = False
+    slow_queries: SlowQueryConfig = SlowQueryConfig()
+
+    def pragmas(self) -> list[str]:
+        return [
+            f"PRAGMA journal_mode = {self.journal_mode}",
+            f"PRAGMA synchronous = {self.synchronous}",
+            f"PRAGMA busy_timeout = {self.busy_timeout_ms}",
+            # Negative cache_size is in KiB rather than pages
+            f"PRAGMA cache_size = -{self.cache_size_kib}",
+            f"PRAGMA mmap_size = {self.mmap_size_bytes}",
+        ]
+
+    def read_pragmas(self) -> list[str]:
+        """
+        Pragmas of the read-only connections, which can not change the
+        journal mode
+        """
+        return [pragma for pragma in self.pragmas() if "journal_mode" not in pragma]
+
+
+def is_in_memory(database: str) -> bool:
+    return database in ("", ":memory:") or "mode=memory" in database
+
+
+def read_only_uri(database: str) -> str:
+    if database.startswith("file:"):
+        return f"{database}{'&' if '?' in database else '?'}mode=ro"
+    return f"{Path(database).absolute().as_uri()}?mode=ro"
+
+
+class SQLiteDatabase:
+    """
+    Connections shared by the SQLite stores.
+
+    Writes go through a single writer connection, one thread at a time,
+    so writers queue on a lock in the process instead of retrying on
+    SQLITE_BUSY. Reads outside of a transaction go through a read-only
+    connection per thread (mode=ro), so under WAL a long listing never
+    waits for a payment, nor a payment for the listing. Reads inside a
+    transaction use the writer, so they see the transaction's own writes.
+    In-memory databases exist per connection, so they keep a single one.
+
+    Writes made inside transaction() are committed together, once, when
+    the outermost transaction of the thread exits, and rolled back together
+    on error. The thread holds the writer for the whole transaction.
+    """
+
+    def __init__(
+        self,
+        database: str,
+        config: SQLiteConfig = SQLiteConfig(),
+        metrics: StoreMetrics | None = None,
+    ) -> None:
+        self._database = database
+        self._config = config
+        self.metrics = StoreMetrics() if metrics is None else metrics
+        self.slow_queries = SlowQueryLog(config.slow_queries)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._connections: list[sqlite3.Connection] = []
+        self._archives: dict[str, str] = {}
+        self._archived_tables: tuple[str, ...] = ()
+        self._archive_generation = 0
+        self._synced: dict[sqlite3.Connection, int] = {}
+        self._attached: dict[sqlite3.Connection, tuple[str, ...]] = {}
+        self._shared = is_in_memory(database)
+        # Also creates the file, which read-only connections need
+        self._writer = self._connect()
+
+    @property
+    def database(self) -> str:
+        return self._database
+
+    @property
+    def config(self) -> SQLiteConfig:
+        return self._config
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        The writer, only written to inside writing() or transaction()
+        """
+        self._sync_archives(self._writer)
+        return self._writer
+
+    @property
+    def reader(self) -> sqlite3.Connection:
+        """
+        Connection for queries, read-only outside of a transaction
+        """
+        if self._shared or self.in_transaction:
+            return self.connection
+
+        connection: sqlite3.Connection | None = getattr(self._local, "reader", None)
+        if connection is None:
+            connection = self._connect(read_only=True)
+            self._local.reader = connection
+        self._sync_archives(connection)
+        return connection
+
+    def attach_archive(self, schema: str, path: str, tables: Sequence[str]) -> None:
+        """
+        Attaches an archive file to every connection as it is next used
+        outside of a transaction, and exposes each of the given tables as a
+        temporary all_<table> view, a UNION ALL of main and every archive
+        """
+        with self._lock:
+            self._archives[schema] = path
+            self._archived_tables = tuple(
+                dict.fromkeys((*self._archived_tables, *tables))
+            )
+            self._archive_generation += 1
+
+    def archives(self, connection: sqlite3.Connection | None = None) -> tuple[str, ...]:
+        """
+        Archive schemas attached to the connection, the reader of this
+        thread by default
+        """
+        return self._attached.get(connection or self.reader, ())
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._depth > 0
+
+    @property
+    def _depth(self) -> int:
+        depth: int = getattr(self._local, "depth", 0)
+        return depth
+
+    @_depth.setter
+    def _depth(self, depth: int) -> None:
+        self._local.depth = depth
+
+    @contextmanager
+    def timed(
+        self, connection: sqlite3.Connection, sql: str, parameters: Sequence[Any] = ()
+    ) -> Iterator[None]:
+        """
+        Times a statement, run and fetched inside the block, for the slow
+        query log
+        """
+        start = perf_counter()
+        yield
+        self.slow_queries.observe(connection, sql, parameters, perf_counter() - start)
+
+    def after_transaction(self, callback: Callable[[], None]) -> None:
+        """
+        Runs the callback once the outermost transaction of this thread has
+        committed or rolled back, or right away outside of a transaction
+        """
+        if not self.in_transaction:
+            callback()
+            return
+
+        callbacks: list[Callable[[], None]] | None = getattr(
+            self._local, "after_transaction", None
+        )
+        if callbacks is None:
+            callbacks = self._local.after_transaction = []
+        callbacks.append(callback)
+
+    @contextmanager
+    def writing(self) -> Iterator[sqlite3.Connection]:
+        """
+        Holds the writer for a write, which is committed on exit unless it
+        is part of a transaction
+        """
+        with self._write_lock:
+            if self.in_transaction:
+                yield self._writer
+                return
+
+            try:
+                yield self._writer
+            except BaseException:
+                self._writer.rollback()
+                raise
+            self._writer.commit()
+            self.metrics.record_commit()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        if not self.in_transaction:
+            self._write_lock.acquire()
+        self._depth += 1
+        try:
+            yield
+        except BaseException:
+            self._depth -= 1
+            if not self.in_transaction:
+                try:
+                    self._writer.rollback()
+                finally:
+                    self._write_lock.release()
+                self._run_after_transaction()
+            raise
+
+        self._depth -= 1
+        if not self.in_transaction:
+            try:
+                self._writer.commit()
+            except BaseException:
+                self._writer.rollback()
+                raise
+            finally:
+                self._write_lock.release()
+            self.metrics.record_commit()
+            self._run_after_transaction()
+
+    def _run_after_transaction(self) -> None:
+        callbacks = getattr(self._local, "after_transaction", None)
+        self._local.after_transaction = None
+        for callback in callbacks or []:
+            callback()
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+            self._synced.clear()
+            self._attached.clear()
+        self._local = threading.local()
+
+    def _sync_archives(self, connection: sqlite3.Connection) -> None:
+        if self._synced.get(connection, 0) == self._archive_generation:
+            return
+        # ATTACH fails inside a transaction, the next call picks it up, and
+        # other threads may be writing through the writer
+        if connection is not self._writer:
+            self._attach_archives(connection)
+        elif self._write_lock.acquire(blocking=False):
+            try:
+                self._attach_archives(connection)
+            finally:
+                self._write_lock.release()
+
+    def _attach_archives(self, connection: sqlite3.Connection) -> None:
+        if connection.in_transaction:
+            return
+
+        with self._lock:
+            archives = dict(self._archives)
+            tables = self._archived_tables
+            generation = self._archive_generation
+
+        attached = {row[1] for row in connection.execute("PRAGMA database_list")}
+        room = connection.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED) - len(
+            attached - {"main", "temp"}
+        )
+        # Newest years first, they are the ones looked up the most
+        for schema in sorted(archives, reverse=True):
+            if schema in attached:
+                continue
+            if room <= 0:
+                logger.warning("Too many archives to attach, skipped %s", schema)
+                continue
+            connection.execute(f"ATTACH DATABASE ? AS {schema}", (archives[schema],))
+            attached.add(schema)
+            room -= 1
+
+        schemas = tuple(sorted(schema for schema in archives if schema in attached))
+        for table in tables:
+            selects = " UNION ALL ".join(
+                f"SELECT * FROM {schema}.{table}" for schema in ("main", *schemas)
+            )
+            connection.execute(f"DROP VIEW IF EXISTS temp.all_{table}")
+            connection.execute(f"CREATE TEMP VIEW all_{table} AS {selects}")
+
+        with self._lock:
+            self._attached[connection] = schemas
+            self._synced[connection] = generation
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        # Readers never leave their thread, except for close(). The writer
+        # is shared, and only written to under the write lock.
+        database = read_only_uri(self._database) if read_only else self._database
+        connection = sqlite3.connect(
+            database,
+            check_same_thread=False,
+            uri=database.startswith("file:"),
+            cached_statements=self._config.cached_statements,
+        )
+        if read_only:
+            pragmas = self._config.read_pragmas()
+        else:
+            # Setting auto_vacuum takes the write lock, and only sticks
+            # before the first table exists
+            if connection.execute("PRAGMA page_count").fetchone()[0] == 0:
+                connection.execute(f"PRAGMA auto_vacuum = {self._config.auto_vacuum}")
+            pragmas = self._config.pragmas()
+        for pragma in pragmas:
+            connection.execute(pragma)
+
+        with self._lock:
+            self._connections.append(connection)
+        return connection
@@ -1,22 +1,119 @@
-import sqlite3
-from typing import Protocol
-
-from finalproject.store.buy_n_get_n import BuyNGetNSQLiteStore, BuyNGetNStore
-from finalproject.store.combo import ComboSQLiteStore, ComboStore
-from finalproject.store.combo_item import ComboItemSQLiteStore, ComboItemStore
-from finalproject.store.paid_receipt import PaidReceiptSQLiteStore, PaidReceiptStore
-from finalproject.store.product import ProductSQLiteStore, ProductStore
+from contextlib import AbstractContextManager
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Iterable, Protocol
+
+from finalproject.store.archive import ArchiveConfig, ShiftArchiver
+from finalproject.store.backup import (
+    CHANGE_LOG_SCHEMA,
+    BackupConfig,
+    BackupResult,
+    Backups,
+    BackupUnavailable,
+    track_changes,
+)
+from finalproject.store.binary_ids import migrate_id_storage
+from finalproject.store.buy_n_get_n import (
+    BuyNGetNMemoryStore,
+    BuyNGetNSQLiteStore,
+    BuyNGetNStore,
+)
+from finalproject.store.cache import CacheConfig, CachedStore, CacheStats, with_cache
+from finalproject.store.combo import ComboMemoryStore, ComboSQLiteStore, ComboStore
+from finalproject.store.combo_item import (
+    ComboItemMemoryStore,
+    ComboItemSQLiteStore,
+    ComboItemStore,
+)
+from finalproject.store.database import SQLiteConfig, SQLiteDatabase, is_in_memory
+from finalproject.store.maintenance import (
+    ActivityMonitor,
+    MaintenanceConfig,
+    MaintenanceScheduler,
+)
+from finalproject.store.memorystore import MemoryDatabase
+from finalproject.store.metrics import StoreMetrics
+from finalproject.store.migrations import Migration, MigrationRegistry
+from finalproject.store.paid_receipt import (
+    PaidReceiptMemoryStore,
+    PaidReceiptSQLiteStore,
+    PaidReceiptStore,
+)
+from finalproject.store.product import (
+    ProductMemoryStore,
+    ProductSQLiteStore,
+    ProductStore,
+)
 from finalproject.store.product_discount import (
+    ProductDiscountMemoryStore,
     ProductDiscountSQLiteStore,
     ProductDiscountStore,
 )
-from finalproject.store.receipt import ReceiptSQLiteStore, ReceiptStore
+from finalproject.store.receipt import (
+    ReceiptMemoryStore,
+    ReceiptSQLiteStore,
+    ReceiptStore,
+)
 from finalproject.store.receipt_discount import (
+    ReceiptDiscountMemoryStore,
     ReceiptDiscountSQLiteStore,
     ReceiptDiscountStore,
 )
-from finalproject.store.receipt_item import ReceiptItemSQLiteStore, ReceiptItemStore
-from finalproject.store.shift import ShiftSQLiteStore, ShiftStore
+from finalproject.store.receipt_item import (
+    RECEIPT_ITEM_UNIQUE_STATEMENTS,
+    ReceiptItemMemoryStore,
+    ReceiptItemSQLiteStore,
+    ReceiptItemStore,
+)
+from finalproject.store.shift import ShiftMemoryStore, ShiftSQLiteStore, ShiftStore
+from finalproject.store.slow_queries import SlowQueryConfig, SlowQueryLog
+from finalproject.store.sqlstore import SQLBasicStore
+
+
+def schema_migrations(stores: Iterable[SQLBasicStore[Any]]) -> MigrationRegistry:
+    """
+    Versioned schema of the SQLite stores.
+
+    Never edit a registered migration, register a new version instead.
+    """
+    stores = list(stores)
+
+    return (
+        MigrationRegistry()
+        .register(
+            Migration(
+                version=1,
+                description="Create store tables",
+                statements=tuple(store.table_schema() for store in stores),
+            )
+        )
+        .register(
+            Migration(
+                version=2,
+                description="Create secondary indexes",
+                statements=tuple(
+                    statement
+                    for store in stores
+                    for statement in store.index_statements()
+                ),
+            )
+        )
+        .register(
+            Migration(
+                version=3,
+                description="Track changes for incremental backups",
+                # The triggers are installed by track_changes, only when
+                # backups are configured
+                statements=(CHANGE_LOG_SCHEMA,),
+            )
+        )
+        .register(
+            Migration(
+                version=4,
+                description="Keep one receipt item per receipt and product",
+                statements=RECEIPT_ITEM_UNIQUE_STATEMENTS,
+            )
+        )
+    )
 
 
 class StoreDistributor(Protocol):
@@ -50,6 +147,37 @@ class StoreDistributor(Protocol):
     def paid_receipts(self) -> PaidReceiptStore:
         pass
 
+    def metrics(self) -> StoreMetrics:
+        """
+        Counters and timings of the store operations
+        """
+        pass
+
+    def slow_queries(self) -> SlowQueryLog:
+        """
+        Statements that took longer than the configured threshold
+        """
+        pass
+
+    def activity(self) -> ActivityMonitor:
+        """
+        Request rate, background maintenance waits for it to drop
+        """
+        pass
+
+    def backup(self, incremental: bool = False) -> BackupResult:
+        """
+        Backs the database up while it is in use, raises BackupUnavailable
+        when backups are not configured
+        """
+        pass
+
+    def transaction(self) -> AbstractContextManager[None]:
+        """
+        Groups every store write made inside it into one atomic commit
+        """
+        pass
+
     def destruct(self) -> None:
         """
         Closes connection to the database
@@ -57,24 +185,227 @@ class StoreDistributor(Protocol):
         pass
 
 
+@dataclass(frozen=True)
+class StoreCaches:
+    """
+    Read cache of each store, named like the distributor methods, None
+    leaves the store uncached
+    """
+
+    products: CacheConfig | None = None
+    buy_n_get_n: CacheConfig | None = None
+    combos: CacheConfig | None = None
+    combo_items: CacheConfig | None = None
+    receipt: CacheConfig | None = None
+    receipt_items: CacheConfig | None = None
+    receipt_discounts: CacheConfig | None = None
+    product_discount: CacheConfig | None = None
+    shifts: CacheConfig | None = None
+    paid_receipts: CacheConfig | None = None
+
+
+# Read on every add to a receipt and every time one is priced, and rarely
+# written, so they benefit the most from caching
+DEFAULT_STORE_CACHES = StoreCaches(
+    products=CacheConfig(),
+    buy_n_get_n=CacheConfig(),
+    combos=CacheConfig(),
+    combo_items=CacheConfig(),
+    receipt_discounts=CacheConfig(),
+    product_discount=CacheConfig(),
+)
+
+
 class SQLiteStoreDistributor:
-    def __init__(self, database: str) -> None:
-        connection = sqlite3.connect(database=database, check_same_thread=False)
-
-        self._products = ProductSQLiteStore(connection)
-        self._combos = ComboSQLiteStore(connection)
-        self._combo_items = ComboItemSQLiteStore(connection)
-        self._buy_n_get_n = BuyNGetNSQLiteStore(connection)
-        self._receipt = ReceiptSQLiteStore(connection)
-        self._receipt_items = ReceiptItemSQLiteStore(connection)
-        self._receipt_discounts = ReceiptDiscountSQLiteStore(connection)
-        self._product_discount = ProductDiscountSQLiteStore(connection)
-        self._shifts = ShiftSQLiteStore(connection)
-        self._paid_receipts = PaidReceiptSQLiteStore(connection)
+    def __init__(
+        self,
+        database: str,
+        config: SQLiteConfig = SQLiteConfig(),
+        caches: StoreCaches = StoreCaches(),
+        maintenance: MaintenanceConfig | None = None,
+        archive: ArchiveConfig | None = None,
+        backup: BackupConfig | None = None,
+    ) -> None:
+        db = SQLiteDatabase(database, config)
+
+        self._products = ProductSQLiteStore(db)
+        self._combos = ComboSQLiteStore(db)
+        self._combo_items = ComboItemSQLiteStore(db)
+        self._buy_n_get_n = BuyNGetNSQLiteStore(db)
+        self._receipt = ReceiptSQLiteStore(db)
+        self._receipt_items = ReceiptItemSQLiteStore(db)
+        self._receipt_discounts = ReceiptDiscountSQLiteStore(db)
+        self._product_discount = ProductDiscountSQLiteStore(db)
+        self._shifts = ShiftSQLiteStore(db)
+        self._paid_receipts = PaidReceiptSQLiteStore(db)
+
+        # Add new stores here
+
+        self._db = db
+
+        schema_migrations(self._sql_stores()).migrate(db.connection)
+        migrate_id_storage(
+            db.connection,
+            [(store.table_name, store.columns) for store in self._sql_stores()],
+            binary=config.binary_ids,
+        )
+        track_changes(
+            db.connection,
+            [store.table_name for store in self._sql_stores()],
+            enabled=backup is not None,
+        )
+
+        self._archiver: ShiftArchiver | None = None
+        if archive is not None:
+            self._archiver = ShiftArchiver(db, self._sql_stores(), archive)
+            self._archiver.attach_existing()
+
+        self._products = with_cache(self._products, caches.products, db)
+        self._combos = with_cache(self._combos, caches.combos, db)
+        self._combo_items = with_cache(self._combo_items, caches.combo_items, db)
+        self._buy_n_get_n = with_cache(self._buy_n_get_n, caches.buy_n_get_n, db)
+        self._receipt = with_cache(self._receipt, caches.receipt, db)
+        self._receipt_items = with_cache(self._receipt_items, caches.receipt_items, db)
+        self._receipt_discounts = with_cache(
+            self._receipt_discounts, caches.receipt_discounts, db
+        )
+        self._product_discount = with_cache(
+            self._product_discount, caches.product_discount, db
+        )
+        self._shifts = with_cache(self._shifts, caches.shifts, db)
+        self._paid_receipts = with_cache(self._paid_receipts, caches.paid_receipts, db)
+
+        self._backups = None if backup is None else Backups(db, backup)
+        tasks: list[tuple[str, Callable[[], bool]]] = []
+        if self._archiver is not None:
+            tasks.append(("archive", self._archiver.run))
+        if self._backups is not None:
+            tasks.append(("backup", self._backups.run_due))
+
+        self._activity = ActivityMonitor()
+        self._maintenance: MaintenanceScheduler | None = None
+        # A second connection would open a different in-memory database
+        if maintenance is not None and not is_in_memory(database):
+            self._activity = ActivityMonitor(maintenance.quiet_window_seconds)
+            self._maintenance = MaintenanceScheduler(
+                database,
+                maintenance,
+                self._activity,
+                tasks=tasks,
+            )
+            self._maintenance.start()
+
+    def cache_stats(self) -> dict[str, CacheStats]:
+        """
+        Hit and miss counters of the cached stores, by store name
+        """
+        stats: dict[str, CacheStats] = {}
+        for field in fields(StoreCaches):
+            store = getattr(self, f"_{field.name}")
+            if isinstance(store, CachedStore):
+                stats[field.name] = store.stats
+        return stats
+
+    def backup(self, incremental: bool = False) -> BackupResult:
+        if self._backups is None:
+            raise BackupUnavailable("Backups are not configured")
+        return self._backups.incremental() if incremental else self._backups.full()
+
+    def archive_shifts(self) -> int:
+        """
+        Moves closed shifts past the retention age to the archive files,
+        returns how many were moved
+        """
+        return 0 if self._archiver is None else self._archiver.archive()
+
+    def _sql_stores(self) -> list[SQLBasicStore[Any]]:
+        return [
+            self._products,
+            self._combos,
+            self._combo_items,
+            self._buy_n_get_n,
+            self._receipt,
+            self._receipt_items,
+            self._receipt_discounts,
+            self._product_discount,
+            self._shifts,
+            self._paid_receipts,
+        ]
+
+    def products(self) -> ProductStore:
+        return self._products
+
+    def buy_n_get_n(self) -> BuyNGetNStore:
+        return self._buy_n_get_n
+
+    def combos(self) -> ComboStore:
+        return self._combos
+
+    def combo_items(self) -> ComboItemStore:
+        return self._combo_items
+
+    def receipt(self) -> ReceiptStore:
+        return self._receipt
+
+    def receipt_items(self) -> ReceiptItemStore:
+        return self._receipt_items
+
+    def receipt_discounts(self) -> ReceiptDiscountStore:
+        return self._receipt_discounts
+
+    def product_discount(self) -> ProductDiscountStore:
+        return self._product_discount
+
+    def shifts(self) -> ShiftStore:
+        return self._shifts
+
+    def paid_receipts(self) -> PaidReceiptStore:
+        return self._paid_receipts
+
+    def metrics(self) -> StoreMetrics:
+        return self._db.metrics
+
+    def slow_queries(self) -> SlowQueryLog:
+        return self._db.slow_queries
+
+    def activity(self) -> ActivityMonitor:
+        return self._activity
+
+    def transaction(self) -> AbstractContextManager[None]:
+        return self._db.transaction()
+
+    def destruct(self) -> None:
+        if self._maintenance is not None:
+            self._maintenance.stop()
+        self._db.close()
+
+
+class InMemoryStoreDistributor:
+    """
+    Stores kept in Python dicts, for tests and terminals that do not need
+    their data to outlive the process
+    """
+
+    def __init__(self) -> None:
+        db = MemoryDatabase()
+
+        self._products = ProductMemoryStore(db)
+        self._combos = ComboMemoryStore(db)
+        self._combo_items = ComboItemMemoryStore(db)
+        self._buy_n_get_n = BuyNGetNMemoryStore(db)
+        self._receipt_items = ReceiptItemMemoryStore(db)
+        self._receipt = ReceiptMemoryStore(db, self._receipt_items)
+        self._receipt_discounts = ReceiptDiscountMemoryStore(db)
+        self._product_discount = ProductDiscountMemoryStore(db)
+        self._shifts = ShiftMemoryStore(db)
+        self._paid_receipts = PaidReceiptMemoryStore(db)
 
         # Add new stores here
 
-        self._connection = connection
+        self._db = db
+        # Nothing here runs SQL
+        self._slow_queries = SlowQueryLog(SlowQueryConfig(threshold_ms=None))
+        self._activity = ActivityMonitor()
 
     def products(self) -> ProductStore:
         return self._products
@@ -106,5 +437,20 @@ class SQLiteStoreDistributor:
     def paid_receipts(self) -> PaidReceiptStore:
         return self._paid_receipts
 
+    def metrics(self) -> StoreMetrics:
+        return self._db.metrics
+
+    def slow_queries(self) -> SlowQueryLog:
+        return self._slow_queries
+
+    def activity(self) -> ActivityMonitor:
+        return self._activity
+
+    def backup(self, incremental: bool = False) -> BackupResult:
+        raise BackupUnavailable("In-memory stores have nothing to back up")
+
+    def transaction(self) -> AbstractContextManager[None]:
+        return self._db.transaction()
+
     def destruct(self) -> None:
-        self._connection.close()
+        pass
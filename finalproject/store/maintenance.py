@@ -0,0 +1,211 @@
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MaintenanceConfig:
+    # How often the scheduler wakes up to look for a quiet period
+    interval_seconds: float = 30.0
+    # Quiet means at most quiet_max_requests in the last quiet_window_seconds
+    quiet_window_seconds: float = 60.0
+    quiet_max_requests: int = 5
+    analyze_every_seconds: float = 6 * 60 * 60
+    # Rows ANALYZE samples per index, bounds how long it holds the write lock
+    analysis_limit: int = 1000
+    # Freelist pages released per write transaction, and time spent on it
+    # per run, so a cashier never waits behind a long vacuum
+    vacuum_pages_per_step: int = 256
+    vacuum_budget_seconds: float = 1.0
+    # Maintenance gives up rather than queue behind a writer
+    busy_timeout_ms: int = 50
+
+
+class ActivityMonitor:
+    """
+    Requests seen in a sliding window, counted per second so memory stays
+    bounded however busy the terminal gets
+    """
+
+    def __init__(
+        self, window_seconds: float = 60.0, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self._window = window_seconds
+        self._clock = clock
+        self._buckets: deque[list[int]] = deque()
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        second = int(self._clock())
+        with self._lock:
+            if self._buckets and self._buckets[-1][0] == second:
+                self._buckets[-1][1] += 1
+            else:
+                self._buckets.append([second, 1])
+            self._prune()
+
+    def requests_in_window(self) -> int:
+        with self._lock:
+            self._prune()
+            return sum(count for _, count in self._buckets)
+
+    def _prune(self) -> None:
+        oldest = self._clock() - self._window
+        while self._buckets and self._buckets[0][0] < oldest:
+            self._buckets.popleft()
+
+
+class MaintenanceScheduler:
+    """
+    Keeps a long running database healthy without getting in the way of
+    the terminal.
+
+    Work only starts once the request rate drops below the quiet threshold
+    and runs on its own connection with a short busy timeout, so it backs
+    off instead of queueing behind a cashier. Each run may:
+
+    - ANALYZE with analysis_limit, so plans follow the data as it grows
+    - release free pages with incremental vacuum, a bounded number of pages
+      per transaction and within a time budget
+    - run a passive WAL checkpoint, which never waits for readers or writers
+
+    Extra tasks, like archiving old shifts, run first, so the pages they
+    free are released in the same run.
+    """
+
+    def __init__(
+        self,
+        database: str,
+        config: MaintenanceConfig = MaintenanceConfig(),
+        activity: ActivityMonitor | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        tasks: Sequence[tuple[str, Callable[[], bool]]] = (),
+    ) -> None:
+        self._database = database
+        self._config = config
+        self.activity = (
+            ActivityMonitor(config.quiet_window_seconds, clock)
+            if activity is None
+            else activity
+        )
+        self._clock = clock
+        self._tasks = list(tasks)
+        self._last_analyze: float | None = None
+        self._conn: sqlite3.Connection | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def is_quiet(self) -> bool:
+        return self.activity.requests_in_window() <= self._config.quiet_max_requests
+
+    def run_once(self) -> list[str]:
+        """
+        Runs the maintenance that is due if the terminal is quiet, returns
+        the names of the tasks that ran
+        """
+        if not self.is_quiet():
+            return []
+
+        ran: list[str] = []
+        for name, task in [
+            *self._tasks,
+            ("analyze", self._analyze),
+            ("incremental_vacuum", self._incremental_vacuum),
+            ("checkpoint", self._checkpoint),
+        ]:
+            try:
+                if task():
+                    ran.append(name)
+            except sqlite3.OperationalError as error:
+                # Busy or locked, the next quiet period tries again
+                logger.info("Skipped %s: %s", name, error)
+            except Exception:
+                # A failing task, say a full disk under the backups, must
+                # not keep the others from running
+                logger.exception("Maintenance task %s failed", name)
+        return ran
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="sqlite-maintenance", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._config.interval_seconds):
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Database maintenance failed")
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # Only the maintenance thread, or a caller of run_once, uses it
+            self._conn = sqlite3.connect(
+                self._database,
+                check_same_thread=False,
+                uri=self._database.startswith("file:"),
+                isolation_level=None,
+            )
+            self._conn.execute(f"PRAGMA busy_timeout = {self._config.busy_timeout_ms}")
+        return self._conn
+
+    def _analyze(self) -> bool:
+        now = self._clock()
+        if (
+            self._last_analyze is not None
+            and now - self._last_analyze < self._config.analyze_every_seconds
+        ):
+            return False
+
+        # PRAGMA optimize only considers tables this connection has queried,
+        # which on a maintenance connection is none, so ANALYZE directly
+        self._connection.execute(
+            f"PRAGMA analysis_limit = {self._config.analysis_limit}"
+        )
+        self._connection.execute("ANALYZE")
+        self._last_analyze = now
+        return True
+
+    def _incremental_vacuum(self) -> bool:
+        conn = self._connection
+        # 2 is INCREMENTAL, other modes have no freelist to hand back
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            return False
+
+        deadline = self._clock() + self._config.vacuum_budget_seconds
+        released = False
+        while conn.execute("PRAGMA freelist_count").fetchone()[0] > 0:
+            if self._clock() >= deadline or not self.is_quiet():
+                break
+            conn.execute(
+                f"PRAGMA incremental_vacuum({self._config.vacuum_pages_per_step})"
+            ).fetchall()
+            released = True
+        return released
+
+    def _checkpoint(self) -> bool:
+        conn = self._connection
+        if conn.execute("PRAGMA journal_mode").fetchone()[0] != "wal":
+            return False
+        conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchall()
+        return True
@@ -0,0 +1,333 @@
+import operator
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import fields
+from typing import Any, Callable, Iterable, Iterator, Sequence, cast
+
+from finalproject.store.metrics import StoreMetrics, observed
+from finalproject.store.query import Query
+from finalproject.store.sqlstore import DEFAULT_BATCH_SIZE
+from finalproject.store.store import (
+    BasicStore,
+    RecordAlreadyExists,
+    RecordNotFound,
+    RecordT,
+    UnknownField,
+)
+
+_COMPARISONS: dict[str, Callable[[Any, Any], bool]] = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def _compare(operator: str, value: Any, other: Any) -> bool:
+    """
+    Comparisons with None are never true, the same as with NULL in SQLite
+    """
+    if value is None or other is None:
+        return False
+    return _COMPARISONS[operator](value, other)
+
+
+def _null_first(value: Any) -> tuple[bool, Any]:
+    return value is not None, value
+
+
+class MemoryDatabase:
+    """
+    State shared by the in-memory stores of one distributor.
+
+    A transaction holds the lock until it exits, so writers are serialized
+    the same way SQLite serializes them. Every write made inside it leaves
+    an undo step, and the steps are replayed in reverse when the outermost
+    transaction fails.
+    """
+
+    def __init__(self, metrics: StoreMetrics | None = None) -> None:
+        self.metrics = StoreMetrics() if metrics is None else metrics
+        self.lock = threading.RLock()
+        self._depth = 0
+        self._undo: list[Callable[[], None]] = []
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._depth > 0
+
+    def record_undo(self, undo: Callable[[], None]) -> None:
+        if self.in_transaction:
+            self._undo.append(undo)
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        with self.lock:
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if not self.in_transaction:
+                    self._rollback()
+                raise
+
+            self._depth -= 1
+            if not self.in_transaction:
+                self._undo.clear()
+                self.metrics.record_commit()
+
+    def _rollback(self) -> None:
+        for undo in reversed(self._undo):
+            undo()
+        self._undo.clear()
+
+
+class MemoryBasicStore(BasicStore[RecordT]):
+    """
+    Records kept in a dict by id, in insertion order.
+
+    Fields listed in indexed_fields() get a hash index from value to ids,
+    kept up to date on every write, so equality lookups on them never scan.
+    """
+
+    def __init__(
+        self, database: MemoryDatabase, table_name: str, record_type: type[RecordT]
+    ) -> None:
+        self._db = database
+        self.table_name = table_name
+        self._records: dict[str, RecordT] = {}
+        # Records are frozen dataclasses, their fields are the columns
+        self._column_names = frozenset(
+            field.name for field in fields(cast(Any, record_type))
+        )
+        self._indexes: dict[str, defaultdict[Any, dict[str, None]]] = {
+            field: defaultdict(dict) for field in self.indexed_fields()
+        }
+
+    @property
+    def metrics(self) -> StoreMetrics:
+        return self._db.metrics
+
+    def indexed_fields(self) -> tuple[str, ...]:
+        """
+        Fields this store filters on, id is always indexed
+        """
+        return ()
+
+    def unique_fields(self) -> tuple[tuple[str, ...], ...]:
+        """
+        Field combinations no two records share, like the unique indexes of
+        the SQLite store
+        """
+        return ()
+
+    def _check_fields(self, fields: Iterable[str]) -> None:
+        for field in fields:
+            if field not in self._column_names:
+                raise UnknownField(field)
+
+    def _check_unique(self, records: Sequence[RecordT]) -> None:
+        for columns in self.unique_fields():
+            owners: dict[tuple[Any, ...], str] = {}
+            for record in records:
+                key = tuple(getattr(record, field) for field in columns)
+                if owners.setdefault(key, record.id) != record.id:
+                    raise RecordAlreadyExists()
+                query = Query()
+                for field, value in zip(columns, key):
+                    query = query.where(field, "=", value)
+                for other in self._candidates(query):
+                    if other.id != record.id and all(
+                        getattr(other, field) == value
+                        for field, value in zip(columns, key)
+                    ):
+                        raise RecordAlreadyExists()
+
+    def _put(self, record: RecordT) -> None:
+        """
+        Inserts or replaces a record, keeping the indexes and undo log current
+        """
+        previous = self._records.get(record.id)
+        self._store(record.id, previous, record)
+        self._db.record_undo(lambda: self._store(record.id, record, previous))
+
+    def _delete(self, record_id: str) -> None:
+        previous = self._records[record_id]
+        self._store(record_id, previous, None)
+        self._db.record_undo(lambda: self._store(record_id, None, previous))
+
+    def _store(
+        self, record_id: str, previous: RecordT | None, record: RecordT | None
+    ) -> None:
+        for field, index in self._indexes.items():
+            if previous is not None:
+                bucket = index[getattr(previous, field)]
+                bucket.pop(record_id, None)
+                if not bucket:
+                    del index[getattr(previous, field)]
+            if record is not None:
+                index[getattr(record, field)][record_id] = None
+
+        if record is None:
+            del self._records[record_id]
+        else:
+            self._records[record_id] = record
+
+    def _candidates(self, query: Query) -> Iterable[RecordT]:
+        """
+        Records that can match the query, narrowed by the first equality on
+        an indexed field
+        """
+        for condition in query.conditions:
+            if condition.operator != "=":
+                continue
+            if condition.field == "id":
+                record = self._records.get(condition.value)
+                return [] if record is None else [record]
+            if condition.field in self._indexes:
+                ids = self._indexes[condition.field].get(condition.value, {})
+                return [self._records[record_id] for record_id in ids]
+        return list(self._records.values())
+
+    @observed("add")
+    def add(self, record: RecordT) -> RecordT:
+        with self._db.lock:
+            if record.id in self._records:
+                raise RecordAlreadyExists()
+            self._check_unique([record])
+            self._put(record)
+        return record
+
+    @observed("get_by_id")
+    def get_by_id(self, unique_id: str) -> RecordT:
+        try:
+            return self._records[unique_id]
+        except KeyError:
+            raise RecordNotFound()
+
+    @observed("list_all")
+    def list_all(self) -> list[RecordT]:
+        with self._db.lock:
+            return list(self._records.values())
+
+    @observed("filter_by_field")
+    def filter_by_field(self, field: str, value: str) -> list[RecordT]:
+        return self.find(Query().where(field, "=", value))
+
+    def iter_all(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[RecordT]:
+        return iter(self.list_all())
+
+    def iter_filter(
+        self, field: str, value: str, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[RecordT]:
+        return iter(self.filter_by_field(field, value))
+
+    @observed("add_many")
+    def add_many(self, records: Sequence[RecordT]) -> list[RecordT]:
+        with self._db.lock:
+            ids = [record.id for record in records]
+            if len(set(ids)) != len(ids) or any(i in self._records for i in ids):
+                raise RecordAlreadyExists()
+            self._check_unique(records)
+            for record in records:
+                self._put(record)
+        return list(records)
+
+    @observed("get_many_by_ids")
+    def get_many_by_ids(self, unique_ids: Sequence[str]) -> list[RecordT]:
+        return self.filter_by_field_in("id", unique_ids)
+
+    @observed("filter_by_field_in")
+    def filter_by_field_in(self, field: str, values: Sequence[str]) -> list[RecordT]:
+        self._check_fields((field,))
+        with self._db.lock:
+            if field != "id" and field not in self._indexes:
+                wanted = set(values)
+                return [
+                    record
+                    for record in self._records.values()
+                    if getattr(record, field) in wanted
+                ]
+
+            records: list[RecordT] = []
+            for value in dict.fromkeys(values):
+                records.extend(self._candidates(Query().where(field, "=", value)))
+            return records
+
+    @observed("find")
+    def find(self, query: Query) -> list[RecordT]:
+        self._check_fields(query.referenced_fields())
+        with self._db.lock:
+            records = [
+                record
+                for record in self._candidates(query)
+                if all(
+                    _compare(
+                        condition.operator,
+                        getattr(record, condition.field),
+                        condition.value,
+                    )
+                    for condition in query.conditions
+                )
+            ]
+
+        # Stable sorts, least significant key first. None sorts first like
+        # NULL does in SQLite, and so last when descending
+        for order in reversed(query.ordering):
+            records.sort(
+                key=lambda record: _null_first(getattr(record, order.field)),
+                reverse=order.descending,
+            )
+        if query.limit_to is None:
+            return records[query.skip :]
+        return records[query.skip : query.skip + query.limit_to]
+
+    @observed("find_first")
+    def find_first(self, query: Query) -> RecordT:
+        records = self.find(query.limit(1))
+        if not records:
+            raise RecordNotFound()
+        return records[0]
+
+    @observed("count")
+    def count(self, query: Query = Query()) -> int:
+        return len(self.find(query.conditions_only()))
+
+    @observed("project")
+    def project(self, query: Query, fields: Sequence[str]) -> list[tuple[Any, ...]]:
+        self._check_fields(fields)
+        return [
+            tuple(getattr(record, field) for field in fields)
+            for record in self.find(query)
+        ]
+
+
+class MemoryUpdatableStore(MemoryBasicStore[RecordT]):
+    @observed("update")
+    def update(self, record: RecordT) -> RecordT:
+        with self._db.lock:
+            if record.id not in self._records:
+                raise RecordNotFound()
+            self._check_unique([record])
+            self._put(record)
+        return record
+
+    @observed("upsert")
+    def upsert(self, record: RecordT) -> RecordT:
+        with self._db.lock:
+            self._check_unique([record])
+            self._put(record)
+        return record
+
+
+class MemoryRemovableStore(MemoryBasicStore[RecordT]):
+    @observed("remove")
+    def remove(self, unique_id: str) -> None:
+        with self._db.lock:
+            if unique_id not in self._records:
+                raise RecordNotFound()
+            self._delete(unique_id)
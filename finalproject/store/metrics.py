@@ -0,0 +1,213 @@
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Concatenate, Iterator, ParamSpec, Protocol, TypeVar
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+@dataclass
+class OperationStats:
+    count: int = 0
+    seconds: float = 0.0
+    rows: int = 0
+    errors: int = 0
+
+
+@dataclass
+class RequestSummary:
+    """
+    Store work done while handling one request
+    """
+
+    operations: int = 0
+    seconds: float = 0.0
+    rows: int = 0
+    commits: int = 0
+    by_operation: Counter[str] = field(default_factory=Counter)
+
+
+@dataclass
+class Observation:
+    rows: int = 0
+
+
+_current_request: ContextVar[RequestSummary | None] = ContextVar(
+    "store_request_summary", default=None
+)
+_observing: ContextVar[bool] = ContextVar("store_observing", default=False)
+
+
+@contextmanager
+def track_request() -> Iterator[RequestSummary]:
+    """
+    Collects the store work of the current context into a RequestSummary,
+    used by the request middleware
+    """
+    summary = RequestSummary()
+    token = _current_request.set(summary)
+    try:
+        yield summary
+    finally:
+        _current_request.reset(token)
+
+
+class StoreMetrics:
+    """
+    Counts and times store operations by table and operation, and counts
+    commits.
+
+    Only the outermost operation is recorded, so get_by_receipt_id running
+    filter_by_field is one get_by_receipt_id, not two operations.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._operations: dict[tuple[str, str], OperationStats] = {}
+        self._commits = 0
+
+    @contextmanager
+    def observe(self, table_name: str, operation: str) -> Iterator[Observation]:
+        observation = Observation()
+        if _observing.get():
+            yield observation
+            return
+
+        token = _observing.set(True)
+        start = perf_counter()
+        failed = False
+        try:
+            yield observation
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            _observing.reset(token)
+            self._record(
+                table_name, operation, perf_counter() - start, observation.rows, failed
+            )
+
+    def record_commit(self) -> None:
+        with self._lock:
+            self._commits += 1
+        summary = _current_request.get()
+        if summary is not None:
+            summary.commits += 1
+
+    @property
+    def commits(self) -> int:
+        return self._commits
+
+    def snapshot(self) -> dict[tuple[str, str], OperationStats]:
+        with self._lock:
+            return {
+                key: OperationStats(**vars(stats))
+                for key, stats in self._operations.items()
+            }
+
+    def to_prometheus(self) -> str:
+        """
+        Counters in the Prometheus text exposition format
+        """
+        snapshot = self.snapshot()
+        lines: list[str] = []
+        for name, help_text, value_of in [
+            ("pos_store_operations_total", "Store operations", _count),
+            ("pos_store_operation_seconds_total", "Time in operations", _seconds),
+            ("pos_store_rows_returned_total", "Records returned", _rows),
+            ("pos_store_operation_errors_total", "Operations that raised", _errors),
+        ]:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for (table_name, operation), stats in sorted(snapshot.items()):
+                labels = f'table="{table_name}",operation="{operation}"'
+                lines.append(f"{name}{{{labels}}} {value_of(stats)}")
+
+        lines.append("# HELP pos_store_commits_total Committed transactions")
+        lines.append("# TYPE pos_store_commits_total counter")
+        lines.append(f"pos_store_commits_total {self._commits}")
+        return "\n".join(lines) + "\n"
+
+    def _record(
+        self, table_name: str, operation: str, seconds: float, rows: int, failed: bool
+    ) -> None:
+        with self._lock:
+            stats = self._operations.setdefault(
+                (table_name, operation), OperationStats()
+            )
+            stats.count += 1
+            stats.seconds += seconds
+            stats.rows += rows
+            stats.errors += failed
+
+        summary = _current_request.get()
+        if summary is not None:
+            summary.operations += 1
+            summary.seconds += seconds
+            summary.rows += rows
+            summary.by_operation[f"{table_name}.{operation}"] += 1
+
+
+def _count(stats: OperationStats) -> str:
+    return str(stats.count)
+
+
+def _seconds(stats: OperationStats) -> str:
+    return f"{stats.seconds:.6f}"
+
+
+def _rows(stats: OperationStats) -> str:
+    return str(stats.rows)
+
+
+def _errors(stats: OperationStats) -> str:
+    return str(stats.errors)
+
+
+class Observable(Protocol):
+    table_name: str
+
+    @property
+    def metrics(self) -> StoreMetrics:
+        pass
+
+
+ObservableT = TypeVar("ObservableT", bound=Observable)
+
+
+def observed(
+    operation: str,
+) -> Callable[
+    [Callable[Concatenate[ObservableT, P], R]],
+    Callable[Concatenate[ObservableT, P], R],
+]:
+    """
+    Records every call of a store method as the given operation
+    """
+
+    def decorate(
+        method: Callable[Concatenate[ObservableT, P], R],
+    ) -> Callable[Concatenate[ObservableT, P], R]:
+        @wraps(method)
+        def wrapper(store: ObservableT, /, *args: P.args, **kwargs: P.kwargs) -> R:
+            with store.metrics.observe(store.table_name, operation) as observation:
+                result = method(store, *args, **kwargs)
+                observation.rows = _rows_in(result)
+            return result
+
+        return wrapper
+
+    return decorate
+
+
+def _rows_in(result: Any) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, list):
+        return len(result)
+    return 1
@@ -0,0 +1,85 @@
+import sqlite3
+from dataclasses import dataclass
+
+SCHEMA_METADATA_TABLE = "schema_metadata"
+SCHEMA_VERSION_KEY = "schema_version"
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    statements: tuple[str, ...]
+
+    def apply(self, conn: sqlite3.Connection) -> None:
+        for statement in self.statements:
+            conn.execute(statement)
+
+
+class MigrationRegistry:
+    """
+    Ordered collection of schema migrations.
+
+    The applied version is kept in the schema_metadata table, so a database
+    that is already up to date costs one lookup on startup and nothing after.
+    """
+
+    def __init__(self) -> None:
+        self._migrations: dict[int, Migration] = {}
+
+    def register(self, migration: Migration) -> "MigrationRegistry":
+        if migration.version <= 0:
+            raise ValueError("Migration versions start at 1")
+        if migration.version in self._migrations:
+            raise ValueError(f"Migration {migration.version} is already registered")
+        self._migrations[migration.version] = migration
+        return self
+
+    @property
+    def latest_version(self) -> int:
+        return max(self._migrations, default=0)
+
+    def current_version(self, conn: sqlite3.Connection) -> int:
+        self._create_metadata_table(conn)
+        row = conn.execute(
+            f"SELECT value FROM {SCHEMA_METADATA_TABLE} WHERE key = ?",
+            (SCHEMA_VERSION_KEY,),
+        ).fetchone()
+        return 0 if row is None else int(row[0])
+
+    def migrate(self, conn: sqlite3.Connection) -> int:
+        if self.current_version(conn) >= self.latest_version:
+            return self.current_version(conn)
+
+        # BEGIN IMMEDIATE takes the write lock up front, so two processes
+        # starting at once can not both apply the same migration.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            current = self.current_version(conn)
+            for version in sorted(self._migrations):
+                if version > current:
+                    self._migrations[version].apply(conn)
+                    current = version
+            conn.execute(
+                f"""
+                INSERT INTO {SCHEMA_METADATA_TABLE} (key, value) VALUES (?, ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value
+                """,
+                (SCHEMA_VERSION_KEY, str(current)),
+            )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+        return current
+
+    def _create_metadata_table(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {SCHEMA_METADATA_TABLE} (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            """
+        )
@@ -1,8 +1,9 @@
-import sqlite3
 from dataclasses import dataclass
 from typing import Protocol
 
-from finalproject.store.sqlstore import SQLBasicStore
+from finalproject.store.database import SQLiteDatabase
+from finalproject.store.memorystore import MemoryBasicStore, MemoryDatabase
+from finalproject.store.sqlstore import Index, SQLBasicStore
 from finalproject.store.store import BasicStore, Record
 
 PAID_RECEIPT_TABLE_NAME = "paid_receipt"
@@ -21,24 +22,35 @@ class PaidReceiptStore(BasicStore[PaidReceiptRecord], Protocol):
 
 
 class PaidReceiptSQLiteStore(SQLBasicStore[PaidReceiptRecord]):
-    def __init__(self, connection: sqlite3.Connection) -> None:
-        super().__init__(conn=connection, table_name=PAID_RECEIPT_TABLE_NAME)
-
-    def _create_table(self) -> None:
-        self._conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS paid_receipt (
-                id TEXT PRIMARY KEY,
-                receipt_id TEXT,
-                currency_name TEXT,
-                paid REAL
-            );
-            """
-        )
-        self._conn.commit()
+    def __init__(self, database: SQLiteDatabase) -> None:
+        super().__init__(database=database, table_name=PAID_RECEIPT_TABLE_NAME)
+
+    def table_schema(self) -> str:
+        return """
+        CREATE TABLE IF NOT EXISTS paid_receipt (
+            id TEXT PRIMARY KEY,
+            receipt_id TEXT,
+            currency_name TEXT,
+            paid REAL
+        );
+        """
+
+    def indexes(self) -> list[Index]:
+        return [Index(("receipt_id",))]
+
+    def _columns(self) -> list[str]:
+        return ["id", "receipt_id", "currency_name", "paid"]
 
     def _record_to_row(self, record: PaidReceiptRecord) -> tuple[str, str, str, float]:
         return record.id, record.receipt_id, record.currency_name, record.paid
 
     def _row_to_record(self, row: tuple[str, str, str, float]) -> PaidReceiptRecord:
         return PaidReceiptRecord(*row)
+
+
+class PaidReceiptMemoryStore(MemoryBasicStore[PaidReceiptRecord]):
+    def __init__(self, database: MemoryDatabase) -> None:
+        super().__init__(database, PAID_RECEIPT_TABLE_NAME, PaidReceiptRecord)
+
+    def indexed_fields(self) -> tuple[str, ...]:
+        return ("receipt_id",)
@@ -1,7 +1,8 @@
-import sqlite3
 from dataclasses import dataclass
 from typing import Protocol
 
+from finalproject.store.database import SQLiteDatabase
+from finalproject.store.memorystore import MemoryDatabase, MemoryUpdatableStore
 from finalproject.store.sqlstore import SQLUpdatableStore
 from finalproject.store.store import (
     BasicStore,
@@ -27,20 +28,17 @@ class ProductStore(BasicStore[ProductRecord], UpdatableStore[ProductRecord], Pro
 
 
 class ProductSQLiteStore(SQLUpdatableStore[ProductRecord]):
-    def __init__(self, connection: sqlite3.Connection) -> None:
-        super().__init__(connection, "product")
-
-    def _create_table(self) -> None:
-        self._conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS product (
-                id TEXT PRIMARY KEY,
-                name TEXT,
-                price REAL
-            );
-            """
-        )
-        self._conn.commit()
+    def __init__(self, database: SQLiteDatabase) -> None:
+        super().__init__(database, "product")
+
+    def table_schema(self) -> str:
+        return """
+        CREATE TABLE IF NOT EXISTS product (
+            id TEXT PRIMARY KEY,
+            name TEXT,
+            price REAL
+        );
+        """
 
     def _columns(self) -> list[str]:
         return ["id", "name", "price"]
@@ -50,3 +48,8 @@ class ProductSQLiteStore(SQLUpdatableStore[ProductRecord]):
 
     def _row_to_record(self, row: tuple[str, str, float]) -> ProductRecord:
         return ProductRecord(*row)
+
+
+class ProductMemoryStore(MemoryUpdatableStore[ProductRecord]):
+    def __init__(self, database: MemoryDatabase) -> None:
+        super().__init__(database, "product", ProductRecord)
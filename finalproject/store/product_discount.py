@@ -1,8 +1,10 @@
-import sqlite3
 from dataclasses import dataclass
 from typing import Protocol
 
-from finalproject.store.sqlstore import SQLRemovableStore
+from finalproject.store.database import SQLiteDatabase
+from finalproject.store.memorystore import MemoryDatabase, MemoryRemovableStore
+from finalproject.store.metrics import observed
+from finalproject.store.sqlstore import Index, SQLRemovableStore
 from finalproject.store.store import (
     BasicStore,
     Record,
@@ -23,20 +25,23 @@ class ProductDiscountStore(BasicStore[ProductDiscountRecord], RemovableStore, Pr
 
 
 class ProductDiscountSQLiteStore(SQLRemovableStore[ProductDiscountRecord]):
-    def __init__(self, connection: sqlite3.Connection) -> None:
-        super().__init__(connection, "product_discount")
-
-    def _create_table(self) -> None:
-        self._conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS product_discount (
-                id TEXT PRIMARY KEY,
-                product_id TEXT,
-                discount REAL
-            );
-            """
-        )
-        self._conn.commit()
+    def __init__(self, database: SQLiteDatabase) -> None:
+        super().__init__(database, "product_discount")
+
+    def table_schema(self) -> str:
+        return """
+        CREATE TABLE IF NOT EXISTS product_discount (
+            id TEXT PRIMARY KEY,
+            product_id TEXT,
+            discount REAL
+        );
+        """
+
+    def indexes(self) -> list[Index]:
+        return [Index(("product_id",))]
+
+    def _columns(self) -> list[str]:
+        return ["id", "product_id", "discount"]
 
     def _record_to_row(self, record: ProductDiscountRecord) -> tuple[str, str, float]:
         return record.id, record.product_id, record.discount
@@ -44,14 +49,18 @@ class ProductDiscountSQLiteStore(SQLRemovableStore[ProductDiscountRecord]):
     def _row_to_record(self, row: tuple[str, str, float]) -> ProductDiscountRecord:
         return ProductDiscountRecord(*row)
 
+    @observed("get_by_product_id")
+    def get_by_product_id(self, product_id: str) -> list[ProductDiscountRecord]:
+        return self.filter_by_field("product_id", product_id)
+
+
+class ProductDiscountMemoryStore(MemoryRemovableStore[ProductDiscountRecord]):
+    def __init__(self, database: MemoryDatabase) -> None:
+        super().__init__(database, "product_discount", ProductDiscountRecord)
+
+    def indexed_fields(self) -> tuple[str, ...]:
+        return ("product_id",)
+
+    @observed("get_by_product_id")
     def get_by_product_id(self, product_id: str) -> list[ProductDiscountRecord]:
-        cursor = self._conn.cursor()
-        cursor.execute(
-            """
-            SELECT * FROM product_discount
-            WHERE product_id = ?;
-            """,
-            (product_id,),
-        )
-
-        return [self._row_to_record(row) for row in cursor.fetchall()]
+        return self.filter_by_field("product_id", product_id)
@@ -0,0 +1,121 @@
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Any, Literal
+
+Operator = Literal["=", "!=", "<", "<=", ">", ">="]
+
+
+@dataclass(frozen=True)
+class Condition:
+    field: str
+    operator: Operator
+    value: Any
+
+
+@dataclass(frozen=True)
+class Order:
+    field: str
+    descending: bool = False
+
+
+@dataclass(frozen=True)
+class Query:
+    """
+    Filter over the columns of a single store, built step by step:
+
+        Query().where("receipt_id", "=", receipt_id).order_by("price").limit(10)
+
+    Conditions are joined with AND. Values always travel as parameters, and
+    stores reject field names that are not columns of their table.
+    """
+
+    conditions: tuple[Condition, ...] = ()
+    ordering: tuple[Order, ...] = ()
+    limit_to: int | None = None
+    skip: int = 0
+
+    def where(self, field: str, operator: Operator, value: Any) -> "Query":
+        if operator not in _OPERATORS:
+            raise ValueError(f"Unsupported operator {operator!r}")
+        return replace(
+            self, conditions=(*self.conditions, Condition(field, operator, value))
+        )
+
+    def between(self, field: str, lower: Any, upper: Any) -> "Query":
+        return self.where(field, ">=", lower).where(field, "<=", upper)
+
+    def order_by(self, field: str, descending: bool = False) -> "Query":
+        return replace(self, ordering=(*self.ordering, Order(field, descending)))
+
+    def limit(self, count: int, offset: int = 0) -> "Query":
+        if count < 0 or offset < 0:
+            raise ValueError("Limit and offset can not be negative")
+        return replace(self, limit_to=count, skip=offset)
+
+    def offset(self, count: int) -> "Query":
+        if count < 0:
+            raise ValueError("Limit and offset can not be negative")
+        return replace(self, skip=count)
+
+    def conditions_only(self) -> "Query":
+        return Query(conditions=self.conditions)
+
+    def referenced_fields(self) -> set[str]:
+        return {condition.field for condition in self.conditions} | {
+            order.field for order in self.ordering
+        }
+
+    def shape(self) -> "QueryShape":
+        return QueryShape(
+            conditions=tuple((c.field, c.operator) for c in self.conditions),
+            ordering=tuple((o.field, o.descending) for o in self.ordering),
+            limited=self.limit_to is not None or self.skip > 0,
+        )
+
+    def parameters(self) -> tuple[Any, ...]:
+        values = tuple(condition.value for condition in self.conditions)
+        if self.shape().limited:
+            # A negative limit is no limit in SQLite
+            values += (-1 if self.limit_to is None else self.limit_to, self.skip)
+        return values
+
+
+_OPERATORS = frozenset(["=", "!=", "<", "<=", ">", ">="])
+
+
+@dataclass(frozen=True)
+class QueryShape:
+    """
+    Everything about a query except its values, so queries that differ only
+    in values share one compiled statement
+    """
+
+    conditions: tuple[tuple[str, str], ...]
+    ordering: tuple[tuple[str, bool], ...]
+    limited: bool
+
+
+@lru_cache(maxsize=1024)
+def compile_select(table_name: str, columns: tuple[str, ...], shape: QueryShape) -> str:
+    return f"SELECT {', '.join(columns)} FROM {table_name}{_compile_tail(shape)}"
+
+
+@lru_cache(maxsize=1024)
+def compile_count(table_name: str, shape: QueryShape) -> str:
+    return f"SELECT COUNT(*) FROM {table_name}{_compile_tail(shape)}"
+
+
+def _compile_tail(shape: QueryShape) -> str:
+    sql = ""
+    if shape.conditions:
+        sql += " WHERE " + " AND ".join(
+            f"{field} {operator} ?" for field, operator in shape.conditions
+        )
+    if shape.ordering:
+        sql += " ORDER BY " + ", ".join(
+            f"{field} DESC" if descending else field
+            for field, descending in shape.ordering
+        )
+    if shape.limited:
+        sql += " LIMIT ? OFFSET ?"
+    return sql
@@ -1,8 +1,18 @@
-import sqlite3
-from dataclasses import dataclass
-from typing import Protocol
+from dataclasses import dataclass, replace
+from typing import Any, Iterator, Protocol
 
-from finalproject.store.sqlstore import SQLBasicStore
+from finalproject.store.binary_ids import IdCodec
+from finalproject.store.database import SQLiteDatabase
+from finalproject.store.memorystore import MemoryBasicStore, MemoryDatabase
+from finalproject.store.metrics import observed
+from finalproject.store.receipt_item import ReceiptItemMemoryStore, ReceiptItemRecord
+from finalproject.store.sqlstore import (
+    DEFAULT_BATCH_SIZE,
+    MAX_QUERY_PARAMETERS,
+    Index,
+    SQLBasicStore,
+    chunked,
+)
 from finalproject.store.store import BasicStore, Record, RecordNotFound
 
 
@@ -13,29 +23,54 @@ class ReceiptRecord(Record):
     shift_id: str
 
 
+ReceiptWithItems = tuple[ReceiptRecord, list[ReceiptItemRecord]]
+
+# Receipt and item tables to read from, the all_ views include the archives
+_MAIN = ("receipt", "receipt_item")
+_ARCHIVED = ("all_receipt", "all_receipt_item")
+
+
 class ReceiptStore(BasicStore[ReceiptRecord], Protocol):
     def get_by_shift_id(self, shift_id: str) -> list[ReceiptRecord]:
         pass
 
+    def get_with_items(self, unique_id: str) -> ReceiptWithItems:
+        pass
+
+    def list_all_with_items(self) -> list[ReceiptWithItems]:
+        pass
+
+    def iter_all_with_items(self, batch_size: int = ...) -> Iterator[ReceiptWithItems]:
+        pass
+
+    def get_by_shift_id_with_items(self, shift_id: str) -> list[ReceiptWithItems]:
+        pass
+
     def close_receipt_by_id(self, unique_id: str) -> None:
         pass
 
 
 class ReceiptSQLiteStore(SQLBasicStore[ReceiptRecord]):
-    def __init__(self, connection: sqlite3.Connection) -> None:
-        super().__init__(connection, "receipt")
-
-    def _create_table(self) -> None:
-        self._conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS receipt (
-                id TEXT PRIMARY KEY,
-                open BOOLEAN,
-                shift_id TEXT
-            );
-            """
+    def __init__(self, database: SQLiteDatabase) -> None:
+        super().__init__(database, "receipt")
+        self._joined_codec = IdCodec(
+            ["id", "open", "shift_id", "id", "receipt_id", "product_id"]
         )
-        self._conn.commit()
+
+    def table_schema(self) -> str:
+        return """
+        CREATE TABLE IF NOT EXISTS receipt (
+            id TEXT PRIMARY KEY,
+            open BOOLEAN,
+            shift_id TEXT
+        );
+        """
+
+    def indexes(self) -> list[Index]:
+        return [Index(("shift_id",))]
+
+    def _columns(self) -> list[str]:
+        return ["id", "open", "shift_id"]
 
     def _record_to_row(self, record: ReceiptRecord) -> tuple[str, bool, str]:
         return record.id, record.open, record.shift_id
@@ -43,30 +78,142 @@ class ReceiptSQLiteStore(SQLBasicStore[ReceiptRecord]):
     def _row_to_record(self, row: tuple[str, bool, str]) -> ReceiptRecord:
         return ReceiptRecord(*row)
 
+    @observed("get_by_shift_id")
     def get_by_shift_id(self, shift_id: str) -> list[ReceiptRecord]:
-        cursor = self._conn.cursor()
-        cursor.execute(
-            """
-            SELECT * FROM receipt
-            WHERE shift_id = ?;
-            """,
-            (shift_id,),
+        return self.filter_by_field("shift_id", shift_id)
+
+    @observed("get_with_items")
+    def get_with_items(self, unique_id: str) -> ReceiptWithItems:
+        where = "WHERE receipt.id = ?"
+        parameters = (self._encode("id", unique_id),)
+        receipts = self._load_with_items(where, parameters)
+        if not receipts and self._db.archives():
+            receipts = self._load_with_items(where, parameters, _ARCHIVED)
+        if not receipts:
+            raise RecordNotFound()
+        return receipts[0]
+
+    @observed("list_all_with_items")
+    def list_all_with_items(self) -> list[ReceiptWithItems]:
+        return self._load_with_items(source=_ARCHIVED if self._db.archives() else _MAIN)
+
+    @observed("get_by_shift_id_with_items")
+    def get_by_shift_id_with_items(self, shift_id: str) -> list[ReceiptWithItems]:
+        where = "WHERE receipt.shift_id = ?"
+        parameters = (self._encode("shift_id", shift_id),)
+        receipts = self._load_with_items(where, parameters)
+        # Shifts are archived whole, so their receipts are in one place
+        if not receipts and self._db.archives():
+            receipts = self._load_with_items(where, parameters, _ARCHIVED)
+        return receipts
+
+    def iter_all_with_items(
+        self, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[ReceiptWithItems]:
+        for schema in ("main", *self._db.archives()):
+            source = (f"{schema}.receipt", f"{schema}.receipt_item")
+            yield from self._iter_with_items(schema, source, batch_size)
+
+    def _iter_with_items(
+        self, schema: str, source: tuple[str, str], batch_size: int
+    ) -> Iterator[ReceiptWithItems]:
+        # Pages over receipts rather than joined rows, so the items of a
+        # receipt are never split between two pages.
+        operation = "iter_all_with_items"
+        select_page = (
+            f"SELECT rowid, {', '.join(self.columns)} FROM {schema}.receipt "
+            "WHERE rowid > ? ORDER BY rowid LIMIT ?"
         )
+        for page in self._pages(operation, select_page, (), batch_size):
+            loaded: dict[str, ReceiptWithItems] = {}
+            with self.metrics.observe(self.table_name, operation) as observation:
+                receipt_ids = [self._encode("id", receipt.id) for receipt in page]
+                for ids in chunked(receipt_ids, MAX_QUERY_PARAMETERS):
+                    placeholders = ", ".join("?" * len(ids))
+                    for receipt in self._load_with_items(
+                        f"WHERE receipt.id IN ({placeholders})", tuple(ids), source
+                    ):
+                        loaded[receipt[0].id] = receipt
+                observation.rows = len(loaded)
+            for receipt_record in page:
+                yield loaded[receipt_record.id]
 
-        return [self._row_to_record(row) for row in cursor.fetchall()]
+    def _load_with_items(
+        self,
+        where: str = "",
+        parameters: tuple[Any, ...] = (),
+        source: tuple[str, str] = _MAIN,
+    ) -> list[ReceiptWithItems]:
+        receipts_table, items_table = source
+        sql = f"""
+            SELECT receipt.id, receipt.open, receipt.shift_id,
+                   item.id, item.receipt_id, item.product_id, item.quantity, item.price
+            FROM {receipts_table} AS receipt
+            LEFT JOIN {items_table} AS item ON item.receipt_id = receipt.id
+            {where}
+            """
+        receipts: dict[str, ReceiptWithItems] = {}
+        for row in self._fetch(sql, parameters):
+            if self._codec is not None:
+                row = self._joined_codec.decode_row(row)
+            receipt_id = row[0]
+            if receipt_id not in receipts:
+                receipts[receipt_id] = (self._row_to_record(row[:3]), [])
+            if row[3] is not None:
+                receipts[receipt_id][1].append(ReceiptItemRecord(*row[3:]))
+        return list(receipts.values())
 
+    @observed("close_receipt_by_id")
     def close_receipt_by_id(self, unique_id: str) -> None:
         if (
-            self._conn.execute(
+            self._execute(
                 """
             UPDATE receipt
             SET open = 0
             WHERE id = ?;
             """,
-                (unique_id,),
-            ).rowcount
+                (self._encode("id", unique_id),),
+            )
             == 0
         ):
             raise RecordNotFound()
 
-        self._conn.commit()
+
+class ReceiptMemoryStore(MemoryBasicStore[ReceiptRecord]):
+    def __init__(
+        self, database: MemoryDatabase, receipt_items: ReceiptItemMemoryStore
+    ) -> None:
+        super().__init__(database, "receipt", ReceiptRecord)
+        self._receipt_items = receipt_items
+
+    def indexed_fields(self) -> tuple[str, ...]:
+        return ("shift_id",)
+
+    @observed("get_by_shift_id")
+    def get_by_shift_id(self, shift_id: str) -> list[ReceiptRecord]:
+        return self.filter_by_field("shift_id", shift_id)
+
+    @observed("get_with_items")
+    def get_with_items(self, unique_id: str) -> ReceiptWithItems:
+        return self._with_items(self.get_by_id(unique_id))
+
+    @observed("list_all_with_items")
+    def list_all_with_items(self) -> list[ReceiptWithItems]:
+        return [self._with_items(receipt) for receipt in self.list_all()]
+
+    def iter_all_with_items(
+        self, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[ReceiptWithItems]:
+        return iter(self.list_all_with_items())
+
+    @observed("get_by_shift_id_with_items")
+    def get_by_shift_id_with_items(self, shift_id: str) -> list[ReceiptWithItems]:
+        return [self._with_items(receipt) for receipt in self.get_by_shift_id(shift_id)]
+
+    @observed("close_receipt_by_id")
+    def close_receipt_by_id(self, unique_id: str) -> None:
+        with self._db.lock:
+            self._put(replace(self.get_by_id(unique_id), open=False))
+
+    def _with_items(self, receipt: ReceiptRecord) -> ReceiptWithItems:
+        return receipt, self._receipt_items.get_by_receipt_id(receipt.id)
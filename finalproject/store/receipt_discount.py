@@ -1,7 +1,8 @@
-import sqlite3
 from dataclasses import dataclass
 from typing import Protocol
 
+from finalproject.store.database import SQLiteDatabase
+from finalproject.store.memorystore import MemoryDatabase, MemoryRemovableStore
 from finalproject.store.sqlstore import (
     SQLRemovableStore,
 )
@@ -24,23 +25,28 @@ class ReceiptDiscountStore(BasicStore[ReceiptDiscountRecord], RemovableStore, Pr
 
 
 class ReceiptDiscountSQLiteStore(SQLRemovableStore[ReceiptDiscountRecord]):
-    def __init__(self, connection: sqlite3.Connection) -> None:
-        super().__init__(connection, "receipt_discount")
-
-    def _create_table(self) -> None:
-        self._conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS receipt_discount (
-                id TEXT PRIMARY KEY,
-                minimum_total REAL,
-                discount REAL
-            );
-            """
-        )
-        self._conn.commit()
+    def __init__(self, database: SQLiteDatabase) -> None:
+        super().__init__(database, "receipt_discount")
+
+    def table_schema(self) -> str:
+        return """
+        CREATE TABLE IF NOT EXISTS receipt_discount (
+            id TEXT PRIMARY KEY,
+            minimum_total REAL,
+            discount REAL
+        );
+        """
+
+    def _columns(self) -> list[str]:
+        return ["id", "minimum_total", "discount"]
 
     def _record_to_row(self, record: ReceiptDiscountRecord) -> tuple[str, float, float]:
         return record.id, record.minimum_total, record.discount
 
     def _row_to_record(self, row: tuple[str, float, float]) -> ReceiptDiscountRecord:
         return ReceiptDiscountRecord(*row)
+
+
+class ReceiptDiscountMemoryStore(MemoryRemovableStore[ReceiptDiscountRecord]):
+    def __init__(self, database: MemoryDatabase) -> None:
+        super().__init__(database, "receipt_discount", ReceiptDiscountRecord)
@@ -1,14 +1,23 @@
-import sqlite3
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Protocol
 
+from finalproject.store.database import SQLiteDatabase
+from finalproject.store.memorystore import (
+    MemoryDatabase,
+    MemoryRemovableStore,
+    MemoryUpdatableStore,
+)
+from finalproject.store.metrics import observed
+from finalproject.store.query import Query
 from finalproject.store.sqlstore import (
+    Index,
     SQLRemovableStore,
     SQLUpdatableStore,
 )
 from finalproject.store.store import (
     BasicStore,
     Record,
+    RecordNotFound,
     RemovableStore,
     UpdatableStore,
 )
@@ -32,27 +41,44 @@ class ReceiptItemStore(
     def get_by_receipt_id(self, receipt_id: str) -> list[ReceiptItemRecord]:
         pass
 
+    def get_by_receipt_and_product(
+        self, receipt_id: str, product_id: str
+    ) -> ReceiptItemRecord:
+        pass
+
+    def increment_quantity(
+        self, receipt_id: str, product_id: str, delta: int, price: float, new_id: str
+    ) -> ReceiptItemRecord | None:
+        """
+        Adds delta to the quantity of the product in the receipt, as one
+        write. A missing item is added under new_id with the given price, and
+        an item whose quantity drops to zero or below is removed, then None is
+        returned.
+        """
+        pass
+
 
 class ReceiptItemSQLiteStore(
     SQLUpdatableStore[ReceiptItemRecord], SQLRemovableStore[ReceiptItemRecord]
 ):
-    def __init__(self, connection: sqlite3.Connection) -> None:
-        super().__init__(connection, "receipt_item")
-
-    def _create_table(self) -> None:
-        self._conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS receipt_item (
-                id TEXT PRIMARY KEY,
-                receipt_id TEXT,
-                product_id TEXT,
-                quantity INTEGER,
-                price REAL
-            );
-            """
-        )
-        self._conn.commit()
-        print("CREATED")
+    def __init__(self, database: SQLiteDatabase) -> None:
+        super().__init__(database, "receipt_item")
+
+    def table_schema(self) -> str:
+        return """
+        CREATE TABLE IF NOT EXISTS receipt_item (
+            id TEXT PRIMARY KEY,
+            receipt_id TEXT,
+            product_id TEXT,
+            quantity INTEGER,
+            price REAL
+        );
+        """
+
+    def indexes(self) -> list[Index]:
+        # Made unique by RECEIPT_ITEM_UNIQUE_STATEMENTS, once older rows
+        # are merged
+        return [Index(("receipt_id", "product_id"))]
 
     def _columns(self) -> list[str]:
         return ["id", "receipt_id", "product_id", "quantity", "price"]
@@ -73,14 +99,126 @@ class ReceiptItemSQLiteStore(
     ) -> ReceiptItemRecord:
         return ReceiptItemRecord(*row)
 
+    @observed("get_by_receipt_id")
+    def get_by_receipt_id(self, receipt_id: str) -> list[ReceiptItemRecord]:
+        return self.filter_by_field("receipt_id", receipt_id)
+
+    @observed("get_by_receipt_and_product")
+    def get_by_receipt_and_product(
+        self, receipt_id: str, product_id: str
+    ) -> ReceiptItemRecord:
+        return self.find_first(
+            Query()
+            .where("receipt_id", "=", receipt_id)
+            .where("product_id", "=", product_id)
+        )
+
+    @observed("increment_quantity")
+    def increment_quantity(
+        self, receipt_id: str, product_id: str, delta: int, price: float, new_id: str
+    ) -> ReceiptItemRecord | None:
+        columns = ", ".join(self.columns)
+        with self._db.transaction():
+            if delta > 0:
+                records = self._execute_returning(
+                    f"""
+                    INSERT INTO receipt_item ({columns}) VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(receipt_id, product_id)
+                    DO UPDATE SET quantity = quantity + excluded.quantity
+                    RETURNING {columns}
+                    """,
+                    self._to_row(
+                        ReceiptItemRecord(new_id, receipt_id, product_id, delta, price)
+                    ),
+                )
+            else:
+                records = self._execute_returning(
+                    f"""
+                    UPDATE receipt_item SET quantity = quantity + ?
+                    WHERE receipt_id = ? AND product_id = ?
+                    RETURNING {columns}
+                    """,
+                    (
+                        delta,
+                        self._encode("receipt_id", receipt_id),
+                        self._encode("product_id", product_id),
+                    ),
+                )
+            if not records:
+                return None
+            if records[0].quantity <= 0:
+                self._execute(
+                    self._statements.delete, (self._encode("id", records[0].id),)
+                )
+                return None
+            return records[0]
+
+
+class ReceiptItemMemoryStore(
+    MemoryUpdatableStore[ReceiptItemRecord], MemoryRemovableStore[ReceiptItemRecord]
+):
+    def __init__(self, database: MemoryDatabase) -> None:
+        super().__init__(database, "receipt_item", ReceiptItemRecord)
+
+    def indexed_fields(self) -> tuple[str, ...]:
+        return ("receipt_id", "product_id")
+
+    def unique_fields(self) -> tuple[tuple[str, ...], ...]:
+        return (("receipt_id", "product_id"),)
+
+    @observed("get_by_receipt_id")
     def get_by_receipt_id(self, receipt_id: str) -> list[ReceiptItemRecord]:
-        cursor = self._conn.cursor()
-        cursor.execute(
-            """
-            SELECT * FROM receipt_item
-            WHERE receipt_id = ?;
-            """,
-            (receipt_id,),
+        return self.filter_by_field("receipt_id", receipt_id)
+
+    @observed("get_by_receipt_and_product")
+    def get_by_receipt_and_product(
+        self, receipt_id: str, product_id: str
+    ) -> ReceiptItemRecord:
+        return self.find_first(
+            Query()
+            .where("receipt_id", "=", receipt_id)
+            .where("product_id", "=", product_id)
         )
 
-        return [self._row_to_record(row) for row in cursor.fetchall()]
+    @observed("increment_quantity")
+    def increment_quantity(
+        self, receipt_id: str, product_id: str, delta: int, price: float, new_id: str
+    ) -> ReceiptItemRecord | None:
+        with self._db.transaction():
+            try:
+                item = self.get_by_receipt_and_product(receipt_id, product_id)
+            except RecordNotFound:
+                if delta <= 0:
+                    return None
+                return self.add(
+                    ReceiptItemRecord(new_id, receipt_id, product_id, delta, price)
+                )
+
+            if item.quantity + delta <= 0:
+                self.remove(item.id)
+                return None
+            return self.update(replace(item, quantity=item.quantity + delta))
+
+
+# Older databases may hold the same product twice in a receipt, those rows
+# are merged into the first one before the index is made unique
+RECEIPT_ITEM_UNIQUE_STATEMENTS = (
+    """
+    UPDATE receipt_item SET quantity = (
+        SELECT sum(other.quantity) FROM receipt_item AS other
+        WHERE other.receipt_id = receipt_item.receipt_id
+        AND other.product_id = receipt_item.product_id
+    )
+    WHERE rowid IN (
+        SELECT min(rowid) FROM receipt_item
+        GROUP BY receipt_id, product_id HAVING count(*) > 1
+    )
+    """,
+    """
+    DELETE FROM receipt_item WHERE rowid NOT IN (
+        SELECT min(rowid) FROM receipt_item GROUP BY receipt_id, product_id
+    )
+    """,
+    "DROP INDEX IF EXISTS idx_receipt_item_receipt_id_product_id",
+    Index(("receipt_id", "product_id"), unique=True).create_statement("receipt_item"),
+)
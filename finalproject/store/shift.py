@@ -1,11 +1,14 @@
-import sqlite3
 from dataclasses import dataclass
 from typing import Protocol
 
+from finalproject.store.database import SQLiteDatabase
+from finalproject.store.memorystore import MemoryDatabase, MemoryUpdatableStore
+from finalproject.store.metrics import observed
 from finalproject.store.sqlstore import SQLUpdatableStore
 from finalproject.store.store import (
     BasicStore,
     Record,
+    RecordNotFound,
     UpdatableStore,
 )
 
@@ -23,21 +26,18 @@ class ShiftStore(BasicStore[ShiftRecord], UpdatableStore[ShiftRecord], Protocol)
 
 
 class ShiftSQLiteStore(SQLUpdatableStore[ShiftRecord]):
-    def __init__(self, connection: sqlite3.Connection) -> None:
-        super().__init__(connection, "shift")
-
-    def _create_table(self) -> None:
-        self._conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS shift (
-                id TEXT PRIMARY KEY,
-                status TEXT,
-                start_time TEXT,
-                end_time TEXT
-            );
-            """
-        )
-        self._conn.commit()
+    def __init__(self, database: SQLiteDatabase) -> None:
+        super().__init__(database, "shift")
+
+    def table_schema(self) -> str:
+        return """
+        CREATE TABLE IF NOT EXISTS shift (
+            id TEXT PRIMARY KEY,
+            status TEXT,
+            start_time TEXT,
+            end_time TEXT
+        );
+        """
 
     def _columns(self) -> list[str]:
         return ["id", "status", "start_time", "end_time"]
@@ -47,3 +47,24 @@ class ShiftSQLiteStore(SQLUpdatableStore[ShiftRecord]):
 
     def _row_to_record(self, row: tuple[str, str, str, str]) -> ShiftRecord:
         return ShiftRecord(*row)
+
+    @observed("get_by_id")
+    def get_by_id(self, record_id: str) -> ShiftRecord:
+        try:
+            return super().get_by_id(record_id)
+        except RecordNotFound:
+            if not self._db.archives():
+                raise
+
+        records = self._query(
+            f"SELECT {', '.join(self.columns)} FROM all_shift WHERE id = ?",
+            (self._encode("id", record_id),),
+        )
+        if not records:
+            raise RecordNotFound()
+        return records[0]
+
+
+class ShiftMemoryStore(MemoryUpdatableStore[ShiftRecord]):
+    def __init__(self, database: MemoryDatabase) -> None:
+        super().__init__(database, "shift", ShiftRecord)
@@ -0,0 +1,124 @@
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SlowQueryConfig:
+    # None turns the log off
+    threshold_ms: float | None = 100.0
+    capacity: int = 200
+    # Parameters hold names, prices and ids, only their types are kept
+    redact_parameters: bool = True
+
+
+@dataclass(frozen=True)
+class SlowQuery:
+    sql: str
+    parameters: tuple[str, ...]
+    duration_ms: float
+    plan: tuple[str, ...]
+    logged_at: float
+
+
+@dataclass(frozen=True)
+class SlowQuerySummary:
+    sql: str
+    occurrences: int
+    worst: SlowQuery
+
+
+def redact(parameters: Sequence[Any]) -> tuple[str, ...]:
+    return tuple(type(value).__name__ for value in parameters)
+
+
+class SlowQueryLog:
+    """
+    Ring buffer of the statements that took longer than the threshold,
+    together with the plan SQLite chose for them.
+
+    Statements under the threshold cost one comparison. Slow ones are also
+    written to the log as a warning.
+    """
+
+    def __init__(self, config: SlowQueryConfig = SlowQueryConfig()) -> None:
+        self._config = config
+        self._threshold = (
+            None if config.threshold_ms is None else config.threshold_ms / 1000
+        )
+        self._entries: deque[SlowQuery] = deque(maxlen=config.capacity)
+        self._lock = threading.Lock()
+
+    def observe(
+        self,
+        conn: sqlite3.Connection,
+        sql: str,
+        parameters: Sequence[Any],
+        seconds: float,
+    ) -> None:
+        if self._threshold is None or seconds < self._threshold:
+            return
+
+        entry = SlowQuery(
+            sql=" ".join(sql.split()),
+            parameters=(
+                redact(parameters)
+                if self._config.redact_parameters
+                else tuple(repr(value) for value in parameters)
+            ),
+            duration_ms=seconds * 1000,
+            plan=self._explain(conn, sql, parameters),
+            logged_at=time.time(),
+        )
+        with self._lock:
+            self._entries.append(entry)
+
+        logger.warning(
+            "Slow query took %.1fms: %s",
+            entry.duration_ms,
+            entry.sql,
+            extra={
+                "sql": entry.sql,
+                "parameters": entry.parameters,
+                "duration_ms": entry.duration_ms,
+                "plan": entry.plan,
+            },
+        )
+
+    def entries(self) -> list[SlowQuery]:
+        with self._lock:
+            return list(self._entries)
+
+    def worst(self, limit: int = 10) -> list[SlowQuerySummary]:
+        """
+        Statements in the buffer by their slowest run, slowest first
+        """
+        by_sql: dict[str, list[SlowQuery]] = {}
+        for entry in self.entries():
+            by_sql.setdefault(entry.sql, []).append(entry)
+
+        summaries = [
+            SlowQuerySummary(
+                sql=sql,
+                occurrences=len(entries),
+                worst=max(entries, key=lambda entry: entry.duration_ms),
+            )
+            for sql, entries in by_sql.items()
+        ]
+        summaries.sort(key=lambda summary: summary.worst.duration_ms, reverse=True)
+        return summaries[:limit]
+
+    def _explain(
+        self, conn: sqlite3.Connection, sql: str, parameters: Sequence[Any]
+    ) -> tuple[str, ...]:
+        try:
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+        except sqlite3.Error:
+            return ()
+        return tuple(str(row[3]) for row in rows)
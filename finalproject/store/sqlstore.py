@@ -1,23 +1,166 @@
 import sqlite3
 from abc import abstractmethod
-from typing import Any
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Iterator, Sequence
 
+from finalproject.store.binary_ids import IdCodec, encode_id, is_id_column
+from finalproject.store.database import SQLiteDatabase
+from finalproject.store.metrics import StoreMetrics, observed
+from finalproject.store.query import Query, compile_count, compile_select
 from finalproject.store.store import (
     BasicStore,
     RecordAlreadyExists,
     RecordNotFound,
     RecordT,
+    UnknownField,
 )
 
+# Stays well below SQLITE_MAX_VARIABLE_NUMBER on every SQLite version
+MAX_QUERY_PARAMETERS = 500
+DEFAULT_BATCH_SIZE = 500
+
+
+def chunked(values: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+@dataclass(frozen=True)
+class Index:
+    columns: tuple[str, ...]
+    unique: bool = False
+
+    def name(self, table_name: str) -> str:
+        return f"idx_{table_name}_{'_'.join(self.columns)}"
+
+    def create_statement(self, table_name: str) -> str:
+        unique = "UNIQUE " if self.unique else ""
+        return (
+            f"CREATE {unique}INDEX IF NOT EXISTS {self.name(table_name)} "
+            f"ON {table_name} ({', '.join(self.columns)})"
+        )
+
+
+@dataclass(frozen=True)
+class Statements:
+    """
+    SQL text of the queries a store runs, built once per table
+    """
+
+    table_name: str
+    columns: tuple[str, ...]
+    insert: str
+    select_all: str
+    select_by_id: str
+    select_page: str
+    update: str
+    upsert: str
+    delete: str
+
+    def select_where(self, field: str) -> str:
+        return _select_where(self.table_name, self.columns, field)
+
+    def select_in(self, field: str, count: int) -> str:
+        return _select_in(self.table_name, self.columns, field, count)
+
+    def select_page_where(self, field: str) -> str:
+        return _select_page_where(self.table_name, self.columns, field)
+
+
+@lru_cache(maxsize=None)
+def table_statements(table_name: str, columns: tuple[str, ...]) -> Statements:
+    column_list = ", ".join(columns)
+    placeholders = ", ".join(["?"] * len(columns))
+    set_part = ", ".join([f"{col} = ?" for col in columns[1:]])
+    upsert_part = ", ".join([f"{col} = excluded.{col}" for col in columns[1:]])
+
+    return Statements(
+        table_name=table_name,
+        columns=columns,
+        insert=f"INSERT INTO {table_name} ({column_list}) VALUES ({placeholders})",
+        select_all=f"SELECT {column_list} FROM {table_name}",
+        select_by_id=f"SELECT {column_list} FROM {table_name} WHERE id = ?",
+        select_page=(
+            f"SELECT rowid, {column_list} FROM {table_name} "
+            "WHERE rowid > ? ORDER BY rowid LIMIT ?"
+        ),
+        update=f"UPDATE {table_name} SET {set_part} WHERE id = ?",
+        upsert=(
+            f"INSERT INTO {table_name} ({column_list}) VALUES ({placeholders}) "
+            f"ON CONFLICT(id) DO UPDATE SET {upsert_part}"
+        ),
+        delete=f"DELETE FROM {table_name} WHERE id = ?",
+    )
+
+
+@lru_cache(maxsize=1024)
+def _select_where(table_name: str, columns: tuple[str, ...], field: str) -> str:
+    return f"SELECT {', '.join(columns)} FROM {table_name} WHERE {field} = ?"
+
+
+@lru_cache(maxsize=1024)
+def _select_in(
+    table_name: str, columns: tuple[str, ...], field: str, count: int
+) -> str:
+    return (
+        f"SELECT {', '.join(columns)} FROM {table_name} "
+        f"WHERE {field} IN ({', '.join(['?'] * count)})"
+    )
+
+
+@lru_cache(maxsize=1024)
+def _select_page_where(table_name: str, columns: tuple[str, ...], field: str) -> str:
+    return (
+        f"SELECT rowid, {', '.join(columns)} FROM {table_name} "
+        f"WHERE {field} = ? AND rowid > ? ORDER BY rowid LIMIT ?"
+    )
+
 
 class SQLBasicStore(BasicStore[RecordT]):
-    def __init__(self, conn: sqlite3.Connection, table_name: str):
-        self._conn = conn
+    def __init__(self, database: SQLiteDatabase, table_name: str):
+        self._db = database
         self.table_name = table_name
-        self._create_table()
+        self._statements = table_statements(table_name, tuple(self._columns()))
+        self._column_names = frozenset(self._statements.columns)
+        self._codec = (
+            IdCodec(self._statements.columns) if database.config.binary_ids else None
+        )
+
+        row_to_record = self._to_record
+        self._row_factory: Callable[[sqlite3.Cursor, tuple[Any, ...]], RecordT] = (
+            lambda _cursor, row: row_to_record(row)
+        )
+
+    @property
+    def metrics(self) -> StoreMetrics:
+        return self._db.metrics
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return self._statements.columns
 
     @abstractmethod
-    def _create_table(self) -> None:
+    def table_schema(self) -> str:
+        """
+        CREATE TABLE statement for this store, applied by the schema migrations
+        """
+        pass
+
+    def indexes(self) -> list[Index]:
+        """
+        Secondary indexes for the columns this store filters on
+        """
+        return []
+
+    def index_statements(self) -> list[str]:
+        return [index.create_statement(self.table_name) for index in self.indexes()]
+
+    @abstractmethod
+    def _columns(self) -> list[str]:
+        """
+        Table columns in the order of _record_to_row, id first
+        """
         pass
 
     @abstractmethod
@@ -28,76 +171,245 @@ class SQLBasicStore(BasicStore[RecordT]):
     def _record_to_row(self, record: RecordT) -> tuple[Any, ...]:
         pass
 
+    def _to_row(self, record: RecordT) -> tuple[Any, ...]:
+        row = self._record_to_row(record)
+        return row if self._codec is None else self._codec.encode_row(row)
+
+    def _to_record(self, row: tuple[Any, ...]) -> RecordT:
+        if self._codec is not None:
+            row = self._codec.decode_row(row)
+        return self._row_to_record(row)
+
+    def _encode(self, field: str, value: Any) -> Any:
+        """
+        Value as stored in the given column
+        """
+        if self._codec is None or not is_id_column(field):
+            return value
+        return encode_id(value)
+
+    def _query_parameters(self, query: Query) -> tuple[Any, ...]:
+        if self._codec is None:
+            return query.parameters()
+        return Query(
+            conditions=tuple(
+                replace(condition, value=self._encode(condition.field, condition.value))
+                for condition in query.conditions
+            ),
+            limit_to=query.limit_to,
+            skip=query.skip,
+        ).parameters()
+
+    def _query(self, sql: str, parameters: Sequence[Any] = ()) -> list[RecordT]:
+        """
+        Runs a SELECT whose rows come back as records of this store
+        """
+        conn = self._db.reader
+        cursor = conn.cursor()
+        cursor.row_factory = self._row_factory
+        with self._db.timed(conn, sql, parameters):
+            records: list[RecordT] = cursor.execute(sql, parameters).fetchall()
+        return records
+
+    def _fetch(self, sql: str, parameters: Sequence[Any] = ()) -> list[Any]:
+        """
+        Runs a SELECT whose rows come back as plain tuples
+        """
+        conn = self._db.reader
+        with self._db.timed(conn, sql, parameters):
+            return conn.execute(sql, parameters).fetchall()
+
+    def _execute(self, sql: str, parameters: Sequence[Any] = ()) -> int:
+        """
+        Runs and commits a write, returns the number of rows it changed
+        """
+        with self._db.writing() as conn, self._db.timed(conn, sql, parameters):
+            return conn.execute(sql, parameters).rowcount
+
+    def _execute_returning(
+        self, sql: str, parameters: Sequence[Any] = ()
+    ) -> list[RecordT]:
+        """
+        Runs and commits a write with a RETURNING clause, whose rows come
+        back as records of this store
+        """
+        with self._db.writing() as conn, self._db.timed(conn, sql, parameters):
+            cursor = conn.cursor()
+            cursor.row_factory = self._row_factory
+            records: list[RecordT] = cursor.execute(sql, parameters).fetchall()
+        return records
+
+    def _execute_many(self, sql: str, rows: Sequence[Sequence[Any]]) -> None:
+        # The plan is the same for every row, the first one stands in for all
+        with (
+            self._db.writing() as conn,
+            self._db.timed(conn, sql, rows[0] if rows else ()),
+        ):
+            conn.executemany(sql, rows)
+
+    def _check_fields(self, fields: Iterable[str]) -> None:
+        """
+        Column names end up in the SQL text, so only columns of this table
+        are let through
+        """
+        for field in fields:
+            if field not in self._column_names:
+                raise UnknownField(field)
+
+    @observed("add")
     def add(self, record: RecordT) -> RecordT:
-        self._create_table()
         try:
-            self.get_by_id(record.id)
+            self._execute(self._statements.insert, self._to_row(record))
+        except sqlite3.IntegrityError:
             raise RecordAlreadyExists()
-        except RecordNotFound:
-            record_row = self._record_to_row(record)
-            self._conn.execute(
-                f"INSERT INTO {self.table_name} VALUES "
-                f"({', '.join(['?'] * len(record_row))})",
-                record_row,
-            )
-            self._conn.commit()
-            return record
+        return record
 
+    @observed("list_all")
     def list_all(self) -> list[RecordT]:
-        self._create_table()
-        cursor = self._conn.execute(f"SELECT * FROM {self.table_name}")
-        return [self._row_to_record(row) for row in cursor.fetchall()]
+        return self._query(self._statements.select_all)
 
+    @observed("get_by_id")
     def get_by_id(self, record_id: str) -> RecordT:
-        self._create_table()
-        cursor = self._conn.execute(
-            f"SELECT * FROM {self.table_name} WHERE id = ?", (record_id,)
+        records = self._query(
+            self._statements.select_by_id, (self._encode("id", record_id),)
         )
-        row = cursor.fetchone()
-        if row is None:
+        if not records:
             raise RecordNotFound()
-        return self._row_to_record(row)
+        return records[0]
 
+    @observed("filter_by_field")
     def filter_by_field(self, field: str, value: str) -> list[RecordT]:
-        self._create_table()
-        cursor = self._conn.execute(
-            f"SELECT * FROM {self.table_name} WHERE {field} = ?", (value,)
+        self._check_fields((field,))
+        return self._query(
+            self._statements.select_where(field), (self._encode(field, value),)
         )
-        return [self._row_to_record(row) for row in cursor.fetchall()]
 
+    def iter_all(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[RecordT]:
+        for page in self._pages(
+            "iter_all", self._statements.select_page, (), batch_size
+        ):
+            yield from page
 
-class SQLUpdatableStore(SQLBasicStore[RecordT]):
-    @abstractmethod
-    def _columns(self) -> list[str]:
-        pass
+    def iter_filter(
+        self, field: str, value: str, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[RecordT]:
+        self._check_fields((field,))
+        sql = self._statements.select_page_where(field)
+        parameters = (self._encode(field, value),)
+        for page in self._pages("iter_filter", sql, parameters, batch_size):
+            yield from page
 
-    def _update_record(self, record: RecordT) -> None:
-        record_row = self._record_to_row(record)
-        record_id = record_row[0]
-        record_data = record_row[1:]
-        columns = self._columns()
-        set_part = ", ".join([f"{col} = ?" for col in columns[1:]])
-        self._conn.execute(
-            f"UPDATE {self.table_name} SET {set_part} WHERE id = ?",
-            (*record_data, record_id),
-        )
+    def _pages(
+        self, operation: str, sql: str, parameters: tuple[Any, ...], batch_size: int
+    ) -> Iterator[list[RecordT]]:
+        """
+        Keyset pagination over rowid, so only one page is in memory at a time,
+        every page is a range scan however deep it is, and records come in the
+        same insertion order as list_all
+        """
+        last_rowid = 0
+        while True:
+            # Observed per page, the caller runs between pages
+            with self.metrics.observe(self.table_name, operation) as observation:
+                rows = self._fetch(sql, (*parameters, last_rowid, batch_size))
+                page = [self._to_record(row[1:]) for row in rows]
+                observation.rows = len(page)
+            if page:
+                yield page
+            if len(rows) < batch_size:
+                return
+            last_rowid = rows[-1][0]
+
+    @observed("add_many")
+    def add_many(self, records: Sequence[RecordT]) -> list[RecordT]:
+        if not records:
+            return []
+
+        try:
+            with self._db.transaction():
+                self._execute_many(
+                    self._statements.insert,
+                    [self._to_row(record) for record in records],
+                )
+        except sqlite3.IntegrityError:
+            raise RecordAlreadyExists()
+        return list(records)
+
+    @observed("get_many_by_ids")
+    def get_many_by_ids(self, unique_ids: Sequence[str]) -> list[RecordT]:
+        return self.filter_by_field_in("id", unique_ids)
+
+    @observed("filter_by_field_in")
+    def filter_by_field_in(self, field: str, values: Sequence[str]) -> list[RecordT]:
+        self._check_fields((field,))
+        records: list[RecordT] = []
+        encoded = [self._encode(field, value) for value in dict.fromkeys(values)]
+        for chunk in chunked(encoded, MAX_QUERY_PARAMETERS):
+            records.extend(
+                self._query(self._statements.select_in(field, len(chunk)), chunk)
+            )
+        return records
+
+    @observed("find")
+    def find(self, query: Query) -> list[RecordT]:
+        self._check_fields(query.referenced_fields())
+        sql = compile_select(self.table_name, self._statements.columns, query.shape())
+        return self._query(sql, self._query_parameters(query))
+
+    @observed("find_first")
+    def find_first(self, query: Query) -> RecordT:
+        records = self.find(query.limit(1))
+        if not records:
+            raise RecordNotFound()
+        return records[0]
+
+    @observed("count")
+    def count(self, query: Query = Query()) -> int:
+        query = query.conditions_only()
+        self._check_fields(query.referenced_fields())
+        sql = compile_count(self.table_name, query.shape())
+        count: int = self._fetch(sql, self._query_parameters(query))[0][0]
+        return count
+
+    @observed("project")
+    def project(self, query: Query, fields: Sequence[str]) -> list[tuple[Any, ...]]:
+        self._check_fields((*fields, *query.referenced_fields()))
+        sql = compile_select(self.table_name, tuple(fields), query.shape())
+        rows = self._fetch(sql, self._query_parameters(query))
+        if self._codec is None:
+            return rows
+        return [IdCodec(fields).decode_row(row) for row in rows]
 
+
+class SQLUpdatableStore(SQLBasicStore[RecordT]):
+    def _update_record(self, record: RecordT) -> int:
+        record_row = self._to_row(record)
+        return self._execute(self._statements.update, (*record_row[1:], record_row[0]))
+
+    @observed("update")
     def update(self, record: RecordT) -> RecordT:
-        self._create_table()
-        if self.get_by_id(record.id) is None:
+        try:
+            updated = self._update_record(record)
+        except sqlite3.IntegrityError:
+            raise RecordAlreadyExists()
+        if updated == 0:
             raise RecordNotFound()
-        self._update_record(record)
-        self._conn.commit()
+        return record
+
+    @observed("upsert")
+    def upsert(self, record: RecordT) -> RecordT:
+        try:
+            self._execute(self._statements.upsert, self._to_row(record))
+        except sqlite3.IntegrityError:
+            raise RecordAlreadyExists()
         return record
 
 
 class SQLRemovableStore(SQLBasicStore[RecordT]):
+    @observed("remove")
     def remove(self, record_id: str) -> None:
         if (
-            self._conn.execute(
-                f"DELETE FROM {self.table_name} WHERE id = ?", (record_id,)
-            ).rowcount
+            self._execute(self._statements.delete, (self._encode("id", record_id),))
             == 0
         ):
             raise RecordNotFound()
-        self._conn.commit()
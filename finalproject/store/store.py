@@ -1,4 +1,7 @@
-from typing import Protocol, TypeVar
+from contextlib import AbstractContextManager
+from typing import Any, Iterator, Protocol, Sequence, TypeVar
+
+from finalproject.store.query import Query
 
 
 class Record(Protocol):
@@ -21,20 +24,86 @@ class BasicStore(Protocol[RecordT]):
     def filter_by_field(self, field: str, value: str) -> list[RecordT]:
         pass
 
+    def iter_all(self, batch_size: int = ...) -> Iterator[RecordT]:
+        """
+        Streams every record in insertion order, batch_size records at a time
+        """
+        pass
+
+    def iter_filter(
+        self, field: str, value: str, batch_size: int = ...
+    ) -> Iterator[RecordT]:
+        pass
+
+    def add_many(self, records: Sequence[RecordT]) -> list[RecordT]:
+        """
+        Adds all records or none of them
+        """
+        pass
+
+    def get_many_by_ids(self, unique_ids: Sequence[str]) -> list[RecordT]:
+        """
+        Returns the records that exist, missing ids are skipped
+        """
+        pass
+
+    def filter_by_field_in(self, field: str, values: Sequence[str]) -> list[RecordT]:
+        pass
+
+    def find(self, query: Query) -> list[RecordT]:
+        pass
+
+    def find_first(self, query: Query) -> RecordT:
+        """
+        Returns the first record matching the query, raises RecordNotFound
+        when there is none
+        """
+        pass
+
+    def count(self, query: Query = ...) -> int:
+        """
+        Counts the records matching the conditions of the query, its ordering
+        and limit are ignored
+        """
+        pass
+
+    def project(self, query: Query, fields: Sequence[str]) -> list[tuple[Any, ...]]:
+        """
+        Returns only the given fields of the records matching the query
+        """
+        pass
+
 
 class UpdatableStore(Protocol[RecordT]):
     def update(self, record: RecordT) -> RecordT:
         pass
 
+    def upsert(self, record: RecordT) -> RecordT:
+        """
+        Adds the record, or updates it when a record with its id exists
+        """
+        pass
+
 
 class RemovableStore(Protocol):
     def remove(self, unique_id: str) -> None:
         pass
 
 
+class UnitOfWork(Protocol):
+    def transaction(self) -> AbstractContextManager[None]:
+        pass
+
+
 class RecordNotFound(Exception):
     pass
 
 
 class RecordAlreadyExists(Exception):
     pass
+
+
+class UnknownField(ValueError):
+    def __init__(self, field: str) -> None:
+        super().__init__(f"Unknown field {field!r}")
+        self.field = field
@@ -1,18 +1,27 @@
-import uuid
+from pathlib import Path
+from typing import Iterator
 
 import pytest
 from starlette.testclient import TestClient
 
 from finalproject.api.api import RunFastAPIUsingTestClient
 from finalproject.runner.setup import mock_setup
-from finalproject.store.distributor import SQLiteStoreDistributor, StoreDistributor
+from finalproject.store.distributor import (
+    InMemoryStoreDistributor,
+    SQLiteStoreDistributor,
+    StoreDistributor,
+)
 from finalproject.store.product import ProductRecord
 from finalproject.store.shift import ShiftRecord
 
 
-@pytest.fixture
-def distributor() -> StoreDistributor:
-    distr = SQLiteStoreDistributor(f"test_{uuid.uuid4()}.db")
+@pytest.fixture(params=["sqlite", "memory"])
+def distributor(
+    request: pytest.FixtureRequest, tmp_path: Path
+) -> Iterator[StoreDistributor]:
+    distr: StoreDistributor = InMemoryStoreDistributor()
+    if request.param == "sqlite":
+        distr = SQLiteStoreDistributor(str(tmp_path / "pos.db"))
     distr.shifts().add(
         ShiftRecord(
             id="1",
@@ -35,7 +44,8 @@ def distributor() -> StoreDistributor:
             price=2.0,
         )
     )
-    return distr
+    yield distr
+    distr.destruct()
 
 
 @pytest.fixture
@@ -0,0 +1,60 @@
+from pathlib import Path
+
+from starlette.testclient import TestClient
+
+from finalproject.api.api import RunFastAPIUsingTestClient
+from finalproject.runner.setup import mock_setup
+from finalproject.store.backup import BackupConfig
+from finalproject.store.database import SQLiteConfig
+from finalproject.store.distributor import SQLiteStoreDistributor
+from finalproject.store.slow_queries import SlowQueryConfig
+
+
+def test_should_list_slow_queries() -> None:
+    run_strategy = RunFastAPIUsingTestClient()
+    distributor = SQLiteStoreDistributor(
+        ":memory:", SQLiteConfig(slow_queries=SlowQueryConfig(threshold_ms=0))
+    )
+    mock_setup(run_strategy=run_strategy, distributor=distributor).run_app()
+    http = run_strategy.client
+    http.get("/products")
+
+    response = http.get("/admin/slow_queries", params={"limit": 1})
+
+    assert response.status_code == 200
+    [slow_query] = response.json()["slow_queries"]
+    assert slow_query["sql"].startswith("SELECT")
+    assert slow_query["occurrences"] >= 1
+    assert slow_query["plan"]
+
+
+def test_should_list_nothing_without_sql(http: TestClient) -> None:
+    http.get("/products")
+
+    response = http.get("/admin/slow_queries")
+
+    assert response.status_code == 200
+    assert response.json() == {"slow_queries": []}
+
+
+def test_should_take_backup(tmp_path: Path) -> None:
+    run_strategy = RunFastAPIUsingTestClient()
+    distributor = SQLiteStoreDistributor(
+        str(tmp_path / "pos.db"), backup=BackupConfig(str(tmp_path / "backups"))
+    )
+    mock_setup(run_strategy=run_strategy, distributor=distributor).run_app()
+    http = run_strategy.client
+    assert not http.post("/admin/backups").json()["incremental"]
+
+    response = http.post("/admin/backups", params={"incremental": True})
+
+    assert response.status_code == 201
+    assert response.json()["incremental"]
+    assert Path(response.json()["path"]).exists()
+    distributor.destruct()
+
+
+def test_should_not_take_backup_without_database(http: TestClient) -> None:
+    response = http.post("/admin/backups")
+
+    assert response.status_code == 409
@@ -0,0 +1,23 @@
+from starlette.testclient import TestClient
+
+
+def test_should_expose_store_metrics(http: TestClient) -> None:
+    http.get("/products/1")
+
+    response = http.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert (
+        'pos_store_operations_total{table="product",operation="get_by_id"} 1'
+        in response.text
+    )
+    assert "pos_store_commits_total" in response.text
+
+
+def test_should_report_store_work_of_request(http: TestClient) -> None:
+    response = http.post("/products", json={"name": "test", "price": 1.0})
+
+    assert response.status_code == 201
+    assert response.headers["server-timing"].startswith("store;dur=")
+    assert '"1 operations, 1 rows' in response.headers["server-timing"]
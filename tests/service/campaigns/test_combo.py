@@ -3,7 +3,10 @@ import pytest
 from finalproject.models.campaigns import Combo, ComboItem
 from finalproject.service.campaigns.combos import ComboService
 from finalproject.service.exceptions import ComboNotFound, ProductNotFound
+from finalproject.store.combo import ComboRecord
+from finalproject.store.combo_item import ComboItemRecord
 from finalproject.store.product import ProductRecord
+from finalproject.store.sqlstore import DEFAULT_BATCH_SIZE
 
 
 def test_should_add_and_get_combo(combo_service: ComboService) -> None:
@@ -98,3 +101,17 @@ def test_should_not_remove_non_existent_combo(
     combo_service: ComboService,
 ) -> None:
     pytest.raises(ComboNotFound, combo_service.remove_combo, "1")
+
+
+def test_should_iterate_combos_past_one_batch(combo_service: ComboService) -> None:
+    count = DEFAULT_BATCH_SIZE + 1
+    combo_service.combo_store.add_many(
+        [ComboRecord(str(i), f"Combo {i}", 0.1) for i in range(count)]
+    )
+    combo_service.combo_item_store.add_many(
+        [ComboItemRecord(f"item {i}", str(i), "1", i + 1) for i in range(count)]
+    )
+
+    combos = combo_service.iter_all_combos()
+
+    assert [combo.items[0].quantity for combo in combos] == list(range(1, count + 1))
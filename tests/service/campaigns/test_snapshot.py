@@ -0,0 +1,59 @@
+from finalproject.models.campaigns import ProductDiscount
+from finalproject.models.models import Receipt, ReceiptItem
+from finalproject.service.campaigns.product_discounts import ProductDiscountService
+from finalproject.service.campaigns.snapshot import CampaignCatalog, CampaignSnapshot
+from finalproject.service.receipts import ReceiptService
+from finalproject.store.distributor import StoreDistributor
+from finalproject.store.metrics import track_request
+from finalproject.store.product_discount import ProductDiscountRecord
+
+
+def compile_empty(version: int) -> CampaignSnapshot:
+    return CampaignSnapshot.compile(version, [], [], [], [])
+
+
+def test_should_reuse_snapshot_until_version_is_bumped() -> None:
+    catalog = CampaignCatalog()
+
+    first = catalog.snapshot(compile_empty)
+
+    assert catalog.snapshot(compile_empty) is first
+    catalog.bump()
+    assert catalog.snapshot(compile_empty).version == first.version + 1
+
+
+def test_should_index_product_discounts_by_product() -> None:
+    discounts = [
+        ProductDiscount(id="1", product_id="1", discount=0.1),
+        ProductDiscount(id="2", product_id="2", discount=0.2),
+        ProductDiscount(id="3", product_id="1", discount=0.3),
+    ]
+
+    snapshot = CampaignSnapshot.compile(0, [], discounts, [], [])
+
+    assert snapshot.index.product_discounts["1"] == (discounts[0], discounts[2])
+    assert snapshot.index.product_discounts["2"] == (discounts[1],)
+
+
+def test_should_price_without_campaign_queries_until_campaigns_change(
+    receipt_service: ReceiptService,
+    product_discount_service: ProductDiscountService,
+    distributor: StoreDistributor,
+) -> None:
+    receipt = receipt_service.add_receipt(
+        Receipt(
+            items=[ReceiptItem(product_id="1", quantity=2, price=1.0)],
+            shift_id="1",
+        )
+    )
+    assert receipt_service.get_receipt_cost(receipt.id) == 2.0
+
+    distributor.product_discount().add(ProductDiscountRecord("1", "1", 0.5))
+    with track_request() as summary:
+        assert receipt_service.get_receipt_cost(receipt.id) == 2.0
+    product_discount_service.add_product_discount(
+        ProductDiscount(product_id="1", discount=0.5)
+    )
+
+    assert summary.operations == 1
+    assert receipt_service.get_receipt_cost(receipt.id) == 0.5
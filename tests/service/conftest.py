@@ -7,11 +7,16 @@ from finalproject.service.campaigns.buy_n_get_n import BuyNGetNService
 from finalproject.service.campaigns.combos import ComboService
 from finalproject.service.campaigns.product_discounts import ProductDiscountService
 from finalproject.service.campaigns.receipt_discounts import ReceiptDiscountService
+from finalproject.service.campaigns.snapshot import CampaignCatalog
 from finalproject.service.receipts import ReceiptService
 from finalproject.store.buy_n_get_n import BuyNGetNStore
 from finalproject.store.combo import ComboStore
 from finalproject.store.combo_item import ComboItemStore
-from finalproject.store.distributor import SQLiteStoreDistributor, StoreDistributor
+from finalproject.store.distributor import (
+    InMemoryStoreDistributor,
+    SQLiteStoreDistributor,
+    StoreDistributor,
+)
 from finalproject.store.paid_receipt import PaidReceiptStore
 from finalproject.store.product import ProductRecord, ProductStore
 from finalproject.store.product_discount import ProductDiscountStore
@@ -21,8 +26,10 @@ from finalproject.store.receipt_item import ReceiptItemStore
 from finalproject.store.shift import ShiftRecord, ShiftStore
 
 
-@pytest.fixture
-def distributor() -> StoreDistributor:
+@pytest.fixture(params=["sqlite", "memory"])
+def distributor(request: pytest.FixtureRequest) -> StoreDistributor:
+    if request.param == "memory":
+        return InMemoryStoreDistributor()
     return SQLiteStoreDistributor(":memory:")
 
 
@@ -77,7 +84,14 @@ def buy_n_get_n_store(distributor: StoreDistributor) -> BuyNGetNStore:
 
 
 @pytest.fixture
-def receipt_service(distributor: StoreDistributor) -> ReceiptService:
+def campaigns() -> CampaignCatalog:
+    return CampaignCatalog()
+
+
+@pytest.fixture
+def receipt_service(
+    distributor: StoreDistributor, campaigns: CampaignCatalog
+) -> ReceiptService:
     distributor.shifts().add(ShiftRecord("1", "open", "2021-01-01", "2021-01-02"))
     distributor.shifts().add(ShiftRecord("2", "open", "2021-01-01", "2021-01-02"))
     distributor.products().add(ProductRecord("1", "product 1", 1.0))
@@ -94,36 +108,51 @@ def receipt_service(distributor: StoreDistributor) -> ReceiptService:
         distributor.receipt_discounts(),
         distributor.buy_n_get_n(),
         ExchangeRateAPIFacade(),
+        distributor,
+        campaigns,
     )
 
 
 @pytest.fixture
-def combo_service(distributor: StoreDistributor) -> ComboService:
+def combo_service(
+    distributor: StoreDistributor, campaigns: CampaignCatalog
+) -> ComboService:
     return ComboService(
         distributor.products(),
         distributor.combos(),
         distributor.combo_items(),
+        distributor,
+        campaigns,
     )
 
 
 @pytest.fixture
-def product_discount_service(distributor: StoreDistributor) -> ProductDiscountService:
+def product_discount_service(
+    distributor: StoreDistributor, campaigns: CampaignCatalog
+) -> ProductDiscountService:
     return ProductDiscountService(
         distributor.products(),
         distributor.product_discount(),
+        campaigns,
     )
 
 
 @pytest.fixture
-def receipt_discount_service(distributor: StoreDistributor) -> ReceiptDiscountService:
+def receipt_discount_service(
+    distributor: StoreDistributor, campaigns: CampaignCatalog
+) -> ReceiptDiscountService:
     return ReceiptDiscountService(
         distributor.receipt_discounts(),
+        campaigns,
     )
 
 
 @pytest.fixture
-def buy_n_get_n_service(distributor: StoreDistributor) -> BuyNGetNService:
+def buy_n_get_n_service(
+    distributor: StoreDistributor, campaigns: CampaignCatalog
+) -> BuyNGetNService:
     return BuyNGetNService(
         distributor.products(),
         distributor.buy_n_get_n(),
+        campaigns,
     )
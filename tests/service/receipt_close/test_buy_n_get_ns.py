@@ -0,0 +1,223 @@
+from finalproject.models.campaigns import BuyNGetN
+from finalproject.models.models import ReceiptItem
+from tests.service.receipt_close.utils import get_engine, get_receipt
+
+
+def test_should_not_add_anything() -> None:
+    engine = get_engine(
+        buy_n_get_ns=[
+            BuyNGetN(
+                buy_product_id="1",
+                buy_product_n=1,
+                get_product_id="1",
+                get_product_n=1,
+            )
+        ]
+    )
+
+    receipt = get_receipt([])
+
+    result = engine.close(receipt)
+
+    assert result.price == 0.0
+    assert len(result.added_products) == 0
+
+
+def test_should_add_free_product() -> None:
+    engine = get_engine(
+        buy_n_get_ns=[
+            BuyNGetN(
+                buy_product_id="1",
+                buy_product_n=1,
+                get_product_id="2",
+                get_product_n=1,
+            )
+        ]
+    )
+
+    receipt = get_receipt([ReceiptItem(product_id="1", quantity=1, price=1.0)])
+
+    result = engine.close(receipt)
+
+    assert result.price == 1.0
+    assert result.added_products["2"] == 1
+
+
+def test_should_not_add_free_product() -> None:
+    engine = get_engine(
+        buy_n_get_ns=[
+            BuyNGetN(
+                buy_product_id="1",
+                buy_product_n=2,
+                get_product_id="2",
+                get_product_n=1,
+            )
+        ]
+    )
+
+    receipt = get_receipt([ReceiptItem(product_id="1", quantity=1, price=1.0)])
+
+    result = engine.close(receipt)
+
+    assert result.price == 1.0
+    assert result.added_products["2"] == 0
+
+
+def test_should_add_free_items_with_other_items() -> None:
+    engine = get_engine(
+        buy_n_get_ns=[
+            BuyNGetN(
+                buy_product_id="1",
+                buy_product_n=2,
+                get_product_id="2",
+                get_product_n=1,
+            )
+        ]
+    )
+
+    receipt = get_receipt(
+        [
+            ReceiptItem(product_id="1", quantity=3, price=3.0),
+            ReceiptItem(product_id="3", quantity=2, price=2.0),
+        ]
+    )
+
+    result = engine.close(receipt)
+
+    assert result.price == 9.0 + 4.0
+    assert result.added_products["2"] == 1
+
+
+def test_should_add_free_product_multiple_times() -> None:
+    engine = get_engine(
+        buy_n_get_ns=[
+            BuyNGetN(
+                buy_product_id="1",
+                buy_product_n=2,
+                get_product_id="2",
+                get_product_n=1,
+            )
+        ]
+    )
+
+    receipt = get_receipt([ReceiptItem(product_id="1", quantity=5, price=5.0)])
+
+    result = engine.close(receipt)
+
+    assert result.price == 5.0 * 5
+    assert result.added_products["2"] == 2
+
+
+def test_should_get_only_one_free_product() -> None:
+    engine = get_engine(
+        buy_n_get_ns=[
+            BuyNGetN(
+                buy_product_id="1",
+                buy_product_n=4,
+                get_product_id="2",
+                get_product_n=1,
+            ),
+            BuyNGetN(
+                buy_product_id="1",
+                buy_product_n=2,
+                get_product_id="2",
+                get_product_n=1,
+            ),
+        ]
+    )
+
+    receipt = get_receipt(
+        [
+            ReceiptItem(product_id="1", quantity=3, price=3.0),
+            ReceiptItem(product_id="3", quantity=2, price=2.0),
+        ]
+    )
+
+    result = engine.close(receipt)
+
+    assert result.price == 9.0 + 4.0
+    assert result.added_products["2"] == 1
+
+
+def test_should_get_multiple_free_products_from_multiple_sources() -> None:
+    engine = get_engine(
+        buy_n_get_ns=[
+            BuyNGetN(
+                buy_product_id="1",
+                buy_product_n=4,
+                get_product_id="2",
+                get_product_n=1,
+            ),
+            BuyNGetN(
+                buy_product_id="1",
+                buy_product_n=2,
+                get_product_id="2",
+                get_product_n=1,
+            ),
+        ]
+    )
+
+    receipt = get_receipt(
+        [
+            ReceiptItem(product_id="1", quantity=4, price=3.0),
+            ReceiptItem(product_id="2", quantity=2, price=2.0),
+        ]
+    )
+
+    result = engine.close(receipt)
+
+    assert result.price == 12.0 + 4.0
+    assert result.added_products["2"] == 2 + 1
+
+
+def test_should_get_different_free_products() -> None:
+    engine = get_engine(
+        buy_n_get_ns=[
+            BuyNGetN(
+                buy_product_id="1",
+                buy_product_n=2,
+                get_product_id="2",
+                get_product_n=1,
+            ),
+            BuyNGetN(
+                buy_product_id="1",
+                buy_product_n=2,
+                get_product_id="3",
+                get_product_n=1,
+            ),
+        ]
+    )
+
+    receipt = get_receipt([ReceiptItem(product_id="1", quantity=2, price=4.0)])
+
+    result = engine.close(receipt)
+
+    assert result.price == 4.0 * 2
+    assert result.added_products["2"] == 1
+    assert result.added_products["3"] == 1
+
+
+def test_got_items_have_no_effect_on_price() -> None:
+    receipt = get_receipt([ReceiptItem(product_id="1", quantity=1, price=1.0)])
+
+    result = get_engine().close(receipt)
+
+    assert result.price == 1.0
+    assert len(result.added_products) == 0
+
+    engine = get_engine(
+        buy_n_get_ns=[
+            BuyNGetN(
+                buy_product_id="1",
+                buy_product_n=1,
+                get_product_id="1",
+                get_product_n=1,
+            )
+        ]
+    )
+
+    result = engine.close(receipt)
+
+    assert result.price == 1.0
+    assert len(result.added_products) == 1
+    assert result.added_products["1"] == 1
@@ -0,0 +1,107 @@
+from finalproject.models.campaigns import (
+    BuyNGetN,
+    Combo,
+    ComboItem,
+    ProductDiscount,
+    ReceiptDiscount,
+)
+from finalproject.models.models import ReceiptItem
+from tests.service.receipt_close.utils import get_engine, get_receipt
+
+
+def test_should_return_empty_result() -> None:
+    engine = get_engine(
+        product_discounts=[ProductDiscount(product_id="1", discount=0.1)],
+        combos=[Combo(discount=0.1)],
+        buy_n_get_ns=[
+            BuyNGetN(
+                buy_product_id="1",
+                buy_product_n=1,
+                get_product_id="1",
+                get_product_n=1,
+            )
+        ],
+        receipt_discounts=[ReceiptDiscount(discount=0.1, minimum_total=100)],
+    )
+
+    result = engine.close(get_receipt([]))
+
+    assert result.price == 0.0
+    assert len(result.added_products) == 0
+
+
+def test_should_discount_with_product_and_receipt() -> None:
+    engine = get_engine(
+        product_discounts=[ProductDiscount(product_id="1", discount=0.1)],
+        receipt_discounts=[ReceiptDiscount(discount=0.1, minimum_total=100)],
+    )
+
+    result = engine.close(
+        get_receipt(
+            [
+                ReceiptItem(product_id="1", quantity=20, price=10.0),
+                ReceiptItem(product_id="2", quantity=1, price=10.0),
+            ]
+        )
+    )
+
+    assert result.price == (20 * 10.0 * 0.9 + 10.0) * 0.9
+
+
+def test_should_discount_combo_part_with_products() -> None:
+    engine = get_engine(
+        product_discounts=[ProductDiscount(product_id="1", discount=0.1)],
+        combos=[
+            Combo(
+                discount=0.1,
+                items=[
+                    ComboItem(id="1", product_id="1", quantity=1),
+                    ComboItem(id="2", product_id="2", quantity=2),
+                ],
+            )
+        ],
+    )
+
+    result = engine.close(
+        get_receipt(
+            [
+                ReceiptItem(product_id="1", quantity=3, price=7.0),
+                ReceiptItem(product_id="2", quantity=4, price=8.0),
+                ReceiptItem(product_id="3", quantity=1, price=10.0),
+            ]
+        )
+    )
+
+    assert result.price == 10.0 + 2 * (7.0 * 0.9 + 2 * 8.0) * 0.9 + 7.0 * 0.9
+
+
+def test_should_not_change_price_with_added_items() -> None:
+    receipt = get_receipt(
+        [
+            ReceiptItem(product_id="1", quantity=10, price=10.0),
+            ReceiptItem(product_id="2", quantity=1, price=10.0),
+        ]
+    )
+    product_discounts = [ProductDiscount(product_id="1", discount=0.1)]
+
+    result = get_engine(product_discounts=product_discounts).close(receipt)
+
+    assert result.price == 10.0 * 10 * 0.9 + 10.0
+    assert len(result.added_products) == 0
+
+    engine = get_engine(
+        product_discounts=product_discounts,
+        buy_n_get_ns=[
+            BuyNGetN(
+                buy_product_id="1",
+                buy_product_n=1,
+                get_product_id="1",
+                get_product_n=1,
+            )
+        ],
+    )
+
+    result = engine.close(receipt)
+
+    assert result.price == 10.0 * 10 * 0.9 + 10.0
+    assert len(result.added_products) == 1
@@ -0,0 +1,137 @@
+import itertools
+import random
+import time
+
+from finalproject.models.campaigns import Combo, ComboItem
+from finalproject.models.models import ReceiptItem
+from finalproject.service.receipt_close.campaign_index import CampaignIndex
+from finalproject.service.receipt_close.combo_matcher import ComboMatcher
+from finalproject.service.receipt_close.receipt_close import (
+    calculate_subtotal,
+    get_info,
+)
+from tests.service.receipt_close.utils import get_receipt
+
+
+def combo(discount: float, **quantities: int) -> Combo:
+    return Combo(
+        discount=discount,
+        items=[
+            ComboItem(product_id=product_id, quantity=quantity)
+            for product_id, quantity in quantities.items()
+        ],
+    )
+
+
+def price(combos: list[Combo], items: list[ReceiptItem]) -> float:
+    receipt = get_receipt(items)
+    info = get_info(None)
+    ComboMatcher(CampaignIndex.build([], combos, [])).apply(receipt, info)
+    return calculate_subtotal(receipt, info)
+
+
+def best_price(combos: list[Combo], items: list[ReceiptItem]) -> float:
+    prices = {item.product_id: item.price for item in items}
+    quantities = {item.product_id: item.quantity for item in items}
+    best = sum(prices[p] * q for p, q in quantities.items())
+    for counts in itertools.product(range(4), repeat=len(combos)):
+        used = {p: 0 for p in quantities}
+        saving = 0.0
+        for count, found in zip(counts, combos):
+            for item in found.items:
+                used[item.product_id] += item.quantity * count
+                saving += (
+                    found.discount * item.quantity * count * prices[item.product_id]
+                )
+        if all(used[p] <= quantities[p] for p in quantities):
+            best = min(best, sum(prices[p] * q for p, q in quantities.items()) - saving)
+    return best
+
+
+def test_should_pick_combos_that_save_the_most() -> None:
+    items = [
+        ReceiptItem(product_id="a", quantity=1, price=10.0),
+        ReceiptItem(product_id="b", quantity=1, price=10.0),
+        ReceiptItem(product_id="c", quantity=1, price=10.0),
+    ]
+    small = combo(0.5, a=1)
+    large = combo(0.4, a=1, b=1, c=1)
+
+    assert price([small, large], items) == 18.0
+    assert price([large, small], items) == 18.0
+
+
+def test_should_not_count_items_twice() -> None:
+    items = [ReceiptItem(product_id="a", quantity=2, price=1.0)]
+
+    assert price([combo(0.5, a=2), combo(0.5, a=2)], items) == 1.0
+
+
+def test_should_match_like_an_exhaustive_search() -> None:
+    rng = random.Random(3)
+    products = ["a", "b", "c", "d"]
+    for _ in range(50):
+        combos = [
+            Combo(
+                discount=round(rng.random() / 2, 2),
+                items=[
+                    ComboItem(product_id=product_id, quantity=rng.randint(1, 2))
+                    for product_id in rng.sample(products, rng.randint(1, 3))
+                ],
+            )
+            for _ in range(4)
+        ]
+        items = [
+            ReceiptItem(product_id=product_id, quantity=rng.randint(0, 3), price=2.0)
+            for product_id in products
+        ]
+
+        assert abs(price(combos, items) - best_price(combos, items)) < 1e-9
+
+
+def test_should_bound_hundreds_of_overlapping_combos() -> None:
+    rng = random.Random(5)
+    products = [str(i) for i in range(40)]
+    combos = [
+        Combo(
+            discount=rng.random() / 2,
+            items=[
+                ComboItem(product_id=product_id, quantity=rng.randint(1, 2))
+                for product_id in rng.sample(products, 3)
+            ],
+        )
+        for _ in range(300)
+    ]
+    items = [
+        ReceiptItem(product_id=product_id, quantity=4, price=1.0)
+        for product_id in products
+    ]
+    receipt = get_receipt(items)
+    info = get_info(None)
+
+    ComboMatcher(CampaignIndex.build([], combos, []), max_states=256).apply(
+        receipt, info
+    )
+
+    for product_id in products:
+        assert sum(count for _, count in info.combo_discounts[product_id]) <= 4
+    assert calculate_subtotal(receipt, info) < 160
+
+
+def test_should_bound_the_work_of_large_quantities() -> None:
+    combos = [
+        combo(0.1, a=1, b=1),
+        combo(0.2, b=1, c=1),
+        combo(0.15, a=1, c=1),
+        combo(0.3, a=2, b=1, c=1),
+    ]
+    items = [
+        ReceiptItem(product_id=product_id, quantity=1_000_000, price=1.0)
+        for product_id in "abc"
+    ]
+
+    started = time.perf_counter()
+    total = price(combos, items)
+
+    assert time.perf_counter() - started < 5
+    assert abs(total - 2_200_000) < 1e-6
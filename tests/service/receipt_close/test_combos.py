@@ -0,0 +1,198 @@
+from finalproject.models.campaigns import Combo, ComboItem
+from finalproject.models.models import ReceiptItem
+from tests.service.receipt_close.utils import get_engine, get_receipt
+
+
+def test_should_return_zero_when_no_items() -> None:
+    engine = get_engine(combos=[Combo(discount=0.1)])
+    assert engine.close(get_receipt([])).price == 0.0
+
+
+def test_should_discount_combo() -> None:
+    engine = get_engine(
+        combos=[
+            Combo(
+                discount=0.1,
+                items=[
+                    ComboItem(product_id="1", quantity=1),
+                ],
+            )
+        ]
+    )
+
+    assert (
+        engine.close(
+            get_receipt([ReceiptItem(product_id="1", quantity=1, price=1.0)])
+        ).price
+        == 0.9
+    )
+
+
+def test_should_not_discount_combo_when_not_enough_items() -> None:
+    engine = get_engine(
+        combos=[
+            Combo(
+                discount=0.1,
+                items=[
+                    ComboItem(product_id="1", quantity=2),
+                ],
+            )
+        ]
+    )
+
+    assert (
+        engine.close(
+            get_receipt([ReceiptItem(product_id="1", quantity=1, price=1.0)])
+        ).price
+        == 1.0
+    )
+
+
+def test_should_discount_combo_only_combo_item() -> None:
+    engine = get_engine(
+        combos=[
+            Combo(
+                discount=0.1,
+                items=[
+                    ComboItem(product_id="1", quantity=1),
+                ],
+            )
+        ]
+    )
+
+    assert (
+        engine.close(
+            get_receipt(
+                [
+                    ReceiptItem(product_id="1", quantity=1, price=1.0),
+                    ReceiptItem(product_id="2", quantity=1, price=2.0),
+                ]
+            )
+        ).price
+        == 1.0 * 0.9 + 2.0
+    )
+
+
+def test_should_only_discount_combo_part_of_receipt_item() -> None:
+    engine = get_engine(
+        combos=[
+            Combo(
+                discount=0.1,
+                items=[
+                    ComboItem(product_id="1", quantity=2),
+                ],
+            )
+        ]
+    )
+    assert (
+        engine.close(
+            get_receipt([ReceiptItem(product_id="1", quantity=3, price=1.0)])
+        ).price
+        == 2.0 * 0.9 + 1.0
+    )
+
+
+def test_should_discount_multiple_same_combos() -> None:
+    engine = get_engine(
+        combos=[
+            Combo(
+                discount=0.1,
+                items=[
+                    ComboItem(product_id="1", quantity=2),
+                ],
+            )
+        ]
+    )
+    assert (
+        engine.close(
+            get_receipt([ReceiptItem(product_id="1", quantity=4, price=1.0)])
+        ).price
+        == 4.0 * 0.9
+    )
+
+
+def test_should_discount_combo_with_multiple_items() -> None:
+    engine = get_engine(
+        combos=[
+            Combo(
+                discount=0.1,
+                items=[
+                    ComboItem(product_id="1", quantity=1),
+                    ComboItem(product_id="2", quantity=1),
+                ],
+            )
+        ]
+    )
+    assert (
+        engine.close(
+            get_receipt(
+                [
+                    ReceiptItem(product_id="1", quantity=1, price=1.0),
+                    ReceiptItem(product_id="2", quantity=1, price=2.0),
+                    ReceiptItem(product_id="3", quantity=1, price=3.0),
+                ]
+            )
+        ).price
+        == (1.0 + 2.0) * 0.9 + 3.0
+    )
+
+
+def test_should_discount_with_multiple_different_combos() -> None:
+    engine = get_engine(
+        combos=[
+            Combo(
+                discount=0.1,
+                items=[
+                    ComboItem(product_id="1", quantity=1),
+                ],
+            ),
+            Combo(
+                discount=0.2,
+                items=[
+                    ComboItem(product_id="2", quantity=1),
+                ],
+            ),
+        ]
+    )
+    assert (
+        engine.close(
+            get_receipt(
+                [
+                    ReceiptItem(product_id="1", quantity=1, price=1.0),
+                    ReceiptItem(product_id="2", quantity=1, price=2.0),
+                    ReceiptItem(product_id="3", quantity=1, price=3.0),
+                ]
+            )
+        ).price
+        == (1.0 * 0.9) + (2.0 * 0.8) + 3.0
+    )
+
+
+def test_should_discount_overlapping_combos_that_save_the_most() -> None:
+    engine = get_engine(
+        combos=[
+            Combo(
+                discount=0.2,
+                items=[
+                    ComboItem(product_id="1", quantity=1),
+                ],
+            ),
+            Combo(
+                discount=0.1,
+                items=[
+                    ComboItem(product_id="1", quantity=2),
+                ],
+            ),
+        ]
+    )
+    assert (
+        engine.close(
+            get_receipt(
+                [
+                    ReceiptItem(product_id="1", quantity=2, price=1.0),
+                    ReceiptItem(product_id="2", quantity=1, price=2.0),
+                ]
+            )
+        ).price
+        == (2.0 * 0.8) + 2.0
+    )
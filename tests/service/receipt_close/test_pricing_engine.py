@@ -0,0 +1,110 @@
+from finalproject.models.campaigns import (
+    BuyNGetN,
+    Combo,
+    ComboItem,
+    ProductDiscount,
+    ReceiptDiscount,
+)
+from finalproject.models.models import ReceiptItem
+from finalproject.service.receipt_close.campaign_index import CampaignIndex
+from finalproject.service.receipt_close.pricing_engine import PricingEngine
+from tests.service.receipt_close.utils import get_engine, get_receipt
+
+
+def test_should_only_look_up_campaigns_of_receipt_products() -> None:
+    index = CampaignIndex.build(
+        [],
+        [
+            Combo(id="1", items=[ComboItem(product_id="1", quantity=1)]),
+            Combo(
+                id="2",
+                items=[
+                    ComboItem(product_id="1", quantity=1),
+                    ComboItem(product_id="3", quantity=1),
+                ],
+            ),
+            Combo(id="3", items=[ComboItem(product_id="2", quantity=1)]),
+            Combo(id="4"),
+        ],
+        [],
+    )
+
+    assert [combo.id for combo in index.combos_for({"1", "2"})] == ["1", "3"]
+    assert [combo.id for combo in index.combos_for({"1", "3"})] == ["1", "2"]
+
+
+def test_should_return_zero_when_no_items_in_receipt() -> None:
+    assert get_engine().close(receipt=get_receipt([])).price == 0.0
+
+
+def test_should_return_sum_of_item_costs() -> None:
+    receipt = get_receipt(
+        [
+            ReceiptItem(product_id="1", quantity=1, price=1.0),
+            ReceiptItem(product_id="2", quantity=1, price=2.0),
+            ReceiptItem(product_id="3", quantity=1, price=3.0),
+        ]
+    )
+    assert get_engine().close(receipt=receipt).price == 1.0 + 2.0 + 3.0
+
+
+def test_should_return_sum_of_item_costs_with_multiple_quantities() -> None:
+    receipt = get_receipt(
+        [
+            ReceiptItem(product_id="1", quantity=2, price=1.0),
+            ReceiptItem(product_id="2", quantity=3, price=2.0),
+            ReceiptItem(product_id="3", quantity=4, price=3.0),
+        ]
+    )
+    assert get_engine().close(receipt=receipt).price == 2 * 1.0 + 3 * 2.0 + 4 * 3.0
+
+
+def test_should_handle_multiple_calls() -> None:
+    engine = get_engine(
+        product_discounts=[ProductDiscount(product_id="1", discount=0.5)],
+        buy_n_get_ns=[
+            BuyNGetN(
+                buy_product_id="1",
+                buy_product_n=1,
+                get_product_id="2",
+                get_product_n=1,
+            )
+        ],
+    )
+    receipt = get_receipt([ReceiptItem(product_id="1", quantity=1, price=1.0)])
+
+    for _ in range(2):
+        result = engine.close(receipt)
+        assert result.price == 0.5
+        assert result.added_products == {"2": 1}
+
+
+def test_should_apply_best_receipt_discount_the_subtotal_reaches() -> None:
+    engine = PricingEngine(
+        CampaignIndex.build([], [], []),
+        [
+            ReceiptDiscount(minimum_total=50, discount=0.5),
+            ReceiptDiscount(minimum_total=10, discount=0.3),
+            ReceiptDiscount(minimum_total=20, discount=0.1),
+        ],
+    )
+
+    def price(total: float) -> float:
+        receipt = get_receipt([ReceiptItem(product_id="1", quantity=1, price=total)])
+        return engine.close(receipt).price
+
+    assert price(5) == 5
+    assert price(10) == 10 * 0.7
+    assert price(25) == 25 * 0.7
+    assert price(50) == 50 * 0.5
+
+
+def test_should_check_receipt_discount_after_item_discounts() -> None:
+    engine = PricingEngine(
+        CampaignIndex.build([ProductDiscount(product_id="1", discount=0.5)], [], []),
+        [ReceiptDiscount(minimum_total=10, discount=0.1)],
+    )
+
+    receipt = get_receipt([ReceiptItem(product_id="1", quantity=1, price=15.0)])
+
+    assert engine.close(receipt).price == 7.5
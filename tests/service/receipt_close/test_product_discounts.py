@@ -0,0 +1,96 @@
+from finalproject.models.campaigns import ProductDiscount
+from finalproject.models.models import ReceiptItem
+from tests.service.receipt_close.utils import get_engine, get_receipt
+
+
+def test_should_return_zero_when_no_items() -> None:
+    engine = get_engine(
+        product_discounts=[ProductDiscount(product_id="1", discount=0.1)]
+    )
+    assert engine.close(get_receipt([])).price == 0.0
+
+
+def test_should_discount_product() -> None:
+    engine = get_engine(
+        product_discounts=[ProductDiscount(product_id="1", discount=0.1)]
+    )
+    assert (
+        engine.close(
+            get_receipt([ReceiptItem(product_id="1", quantity=1, price=1.0)])
+        ).price
+        == 0.9
+    )
+    assert (
+        engine.close(
+            get_receipt([ReceiptItem(product_id="1", quantity=2, price=1.0)])
+        ).price
+        == 1.8
+    )
+
+
+def test_should_discount_one_in_multiple_products() -> None:
+    engine = get_engine(
+        product_discounts=[ProductDiscount(product_id="2", discount=0.1)]
+    )
+    assert (
+        engine.close(
+            get_receipt(
+                [
+                    ReceiptItem(product_id="1", quantity=1, price=1.0),
+                    ReceiptItem(product_id="2", quantity=1, price=2.0),
+                ]
+            )
+        ).price
+        == 1.0 + 1.8
+    )
+
+
+def test_should_not_discount_if_product_not_in_receipt() -> None:
+    engine = get_engine(
+        product_discounts=[ProductDiscount(product_id="2", discount=0.1)]
+    )
+    assert (
+        engine.close(
+            get_receipt([ReceiptItem(product_id="1", quantity=1, price=1.0)])
+        ).price
+        == 1.0
+    )
+
+
+def test_should_discount_multiple_products() -> None:
+    engine = get_engine(
+        product_discounts=[
+            ProductDiscount(product_id="1", discount=0.1),
+            ProductDiscount(product_id="2", discount=0.2),
+        ]
+    )
+    assert (
+        engine.close(
+            get_receipt(
+                [
+                    ReceiptItem(product_id="1", quantity=1, price=1.0),
+                    ReceiptItem(product_id="2", quantity=1, price=2.0),
+                ]
+            )
+        ).price
+        == 0.9 + 1.6
+    )
+
+
+def test_should_discount_same_product_multiple_times() -> None:
+    engine = get_engine(
+        product_discounts=[
+            ProductDiscount(product_id="1", discount=0.2),
+            ProductDiscount(product_id="1", discount=0.1),
+        ]
+    )
+    assert (
+        engine.close(
+            get_receipt(
+                [
+                    ReceiptItem(product_id="1", quantity=2, price=1.0),
+                ]
+            )
+        ).price
+        == 2 * 0.9 * 0.8
+    )
@@ -0,0 +1,108 @@
+from finalproject.models.campaigns import ReceiptDiscount
+from finalproject.models.models import ReceiptItem
+from tests.service.receipt_close.utils import get_engine, get_receipt
+
+
+def test_should_return_zero_on_empty_receipt() -> None:
+    engine = get_engine(
+        receipt_discounts=[ReceiptDiscount(discount=0.1, minimum_total=10.0)]
+    )
+    assert engine.close(get_receipt([])).price == 0.0
+
+
+def test_should_discount_receipt() -> None:
+    engine = get_engine(
+        receipt_discounts=[ReceiptDiscount(discount=0.1, minimum_total=10.0)]
+    )
+    assert (
+        engine.close(
+            get_receipt([ReceiptItem(product_id="1", quantity=1, price=10.0)])
+        ).price
+        == 9.0
+    )
+
+
+def test_should_not_discount_because_lower_than_main() -> None:
+    engine = get_engine(
+        receipt_discounts=[ReceiptDiscount(discount=0.1, minimum_total=10.0)]
+    )
+    assert (
+        engine.close(
+            get_receipt([ReceiptItem(product_id="1", quantity=1, price=9.0)])
+        ).price
+        == 9.0
+    )
+
+
+def test_should_discount_multiple_products() -> None:
+    engine = get_engine(
+        receipt_discounts=[ReceiptDiscount(discount=0.1, minimum_total=10.0)]
+    )
+    assert (
+        engine.close(
+            get_receipt(
+                [
+                    ReceiptItem(product_id="1", quantity=1, price=7.0),
+                    ReceiptItem(product_id="2", quantity=1, price=12.0),
+                ]
+            )
+        ).price
+        == (7.0 + 12.0) * 0.9
+    )
+
+
+def test_should_not_discount_if_total_lower_than_main() -> None:
+    engine = get_engine(
+        receipt_discounts=[ReceiptDiscount(discount=0.1, minimum_total=10.0)]
+    )
+    assert (
+        engine.close(
+            get_receipt(
+                [
+                    ReceiptItem(product_id="1", quantity=1, price=4.0),
+                    ReceiptItem(product_id="2", quantity=1, price=5.0),
+                ]
+            )
+        ).price
+        == 9.0
+    )
+
+
+def test_should_choose_the_only_discount_that_fits() -> None:
+    engine = get_engine(
+        receipt_discounts=[
+            ReceiptDiscount(discount=0.1, minimum_total=10.0),
+            ReceiptDiscount(discount=0.2, minimum_total=20.0),
+        ]
+    )
+    assert (
+        engine.close(
+            get_receipt(
+                [
+                    ReceiptItem(product_id="1", quantity=1, price=3.0),
+                    ReceiptItem(product_id="2", quantity=1, price=10.0),
+                ]
+            )
+        ).price
+        == (3.0 + 10.0) * 0.9
+    )
+
+
+def test_should_choose_the_best_discount() -> None:
+    engine = get_engine(
+        receipt_discounts=[
+            ReceiptDiscount(discount=0.1, minimum_total=10.0),
+            ReceiptDiscount(discount=0.2, minimum_total=20.0),
+        ]
+    )
+    assert (
+        engine.close(
+            get_receipt(
+                [
+                    ReceiptItem(product_id="1", quantity=1, price=13.0),
+                    ReceiptItem(product_id="2", quantity=1, price=10.0),
+                ]
+            )
+        ).price
+        == (13.0 + 10.0) * 0.8
+    )
@@ -1,5 +1,27 @@
+from typing import Sequence
+
+from finalproject.models.campaigns import (
+    BuyNGetN,
+    Combo,
+    ProductDiscount,
+    ReceiptDiscount,
+)
 from finalproject.models.models import Receipt, ReceiptItem
+from finalproject.service.receipt_close.campaign_index import CampaignIndex
+from finalproject.service.receipt_close.pricing_engine import PricingEngine
 
 
 def get_receipt(items: list[ReceiptItem]) -> Receipt:
     return Receipt(id="1", open=True, items=items, shift_id="1")
+
+
+def get_engine(
+    product_discounts: Sequence[ProductDiscount] = (),
+    combos: Sequence[Combo] = (),
+    buy_n_get_ns: Sequence[BuyNGetN] = (),
+    receipt_discounts: Sequence[ReceiptDiscount] = (),
+) -> PricingEngine:
+    return PricingEngine(
+        CampaignIndex.build(product_discounts, combos, buy_n_get_ns),
+        receipt_discounts,
+    )
@@ -0,0 +1,62 @@
+import threading
+from uuid import UUID
+
+from finalproject.service.ids import IdGenerator, generate_id
+
+
+class _Clock:
+    def __init__(self, now_ms: int) -> None:
+        self.now_ms = now_ms
+
+    def __call__(self) -> int:
+        return self.now_ms * 1_000_000
+
+
+def test_should_generate_uuid_version_7() -> None:
+    uuid = UUID(generate_id())
+
+    assert uuid.version == 7
+    assert uuid.variant == "specified in RFC 4122"
+
+
+def test_should_start_with_timestamp() -> None:
+    generator = IdGenerator(clock_ns=_Clock(1_700_000_000_000))
+
+    assert UUID(generator.generate()).int >> 80 == 1_700_000_000_000
+
+
+def test_should_increase_within_same_millisecond_and_when_clock_steps_back() -> None:
+    clock = _Clock(1_000)
+    generator = IdGenerator(clock_ns=clock)
+
+    ids = [generator.generate() for _ in range(10)]
+    clock.now_ms = 900
+    ids += [generator.generate() for _ in range(10)]
+
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_should_borrow_next_millisecond_when_counter_runs_out() -> None:
+    generator = IdGenerator(clock_ns=_Clock(1_000), random_bits=lambda bits: 0)
+
+    ids = [generator.generate() for _ in range(4097)]
+
+    assert ids == sorted(ids)
+    assert UUID(ids[-1]).int >> 80 == 1_001
+
+
+def test_should_generate_unique_ids_across_threads() -> None:
+    generator = IdGenerator()
+    ids: list[str] = []
+
+    def generate() -> None:
+        ids.extend(generator.generate() for _ in range(1_000))
+
+    threads = [threading.Thread(target=generate) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(ids)) == 8_000
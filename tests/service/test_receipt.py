@@ -1,6 +1,11 @@
+import threading
+
 import pytest
 
 from finalproject.models.models import Receipt, ReceiptItem
+from finalproject.service.currency_conversion.currency_conversion import (
+    ConversionError,
+)
 from finalproject.service.exceptions import (
     ProductNotFound,
     ReceiptItemNotFound,
@@ -10,9 +15,15 @@ from finalproject.service.exceptions import (
 from finalproject.service.receipts import (
     ReceiptService,
 )
+from finalproject.store.buy_n_get_n import BuyNGetNRecord, BuyNGetNStore
 from finalproject.store.paid_receipt import PaidReceiptStore
 
 
+class _FailingConversion:
+    def convert(self, amount: float, from_currency: str, to_currency: str) -> float:
+        raise ConversionError()
+
+
 def test_should_add_and_get_empty_receipt(receipt_service: ReceiptService) -> None:
     receipt = Receipt(shift_id="1")
     receipt_response = receipt_service.add_receipt(receipt)
@@ -33,6 +44,27 @@ def test_should_add_receipt_with_items(receipt_service: ReceiptService) -> None:
     assert receipt_service.get_receipt(receipt_response.id).compare_without_id(receipt)
 
 
+def test_should_merge_lines_of_the_same_product(
+    receipt_service: ReceiptService,
+) -> None:
+    receipt = receipt_service.add_receipt(
+        Receipt(
+            items=[
+                ReceiptItem(product_id="1", quantity=1, price=1.0),
+                ReceiptItem(product_id="2", quantity=1, price=2.0),
+                ReceiptItem(product_id="1", quantity=2, price=1.0),
+            ],
+            shift_id="1",
+        )
+    )
+
+    for found in [receipt, receipt_service.get_receipt(receipt.id)]:
+        assert [(item.product_id, item.quantity) for item in found.items] == [
+            ("1", 3),
+            ("2", 1),
+        ]
+
+
 def test_should_get_all_receipts(receipt_service: ReceiptService) -> None:
     assert len(receipt_service.get_all_receipts()) == 0
 
@@ -196,3 +228,59 @@ def test_should_raise_shift_not_found_when_getting_receipts_by_non_existent_shif
     receipt_service: ReceiptService,
 ) -> None:
     pytest.raises(ShiftNotFound, receipt_service.get_receipts_by_shift_id, "3")
+
+
+def test_should_keep_receipt_open_when_closing_fails(
+    receipt_service: ReceiptService,
+    paid_receipt_store: PaidReceiptStore,
+    buy_n_get_n_store: BuyNGetNStore,
+) -> None:
+    buy_n_get_n_store.add(BuyNGetNRecord("1", "1", 1, "2", 1))
+    receipt = receipt_service.add_receipt(
+        Receipt(
+            items=[ReceiptItem(product_id="1", quantity=1, price=1.0)],
+            shift_id="1",
+        )
+    )
+    receipt_service.currency_conversion_service = _FailingConversion()
+
+    pytest.raises(ConversionError, receipt_service.close_receipt, receipt.id, "USD")
+
+    assert receipt_service.get_receipt(receipt.id) == receipt
+    assert paid_receipt_store.list_all() == []
+
+
+def test_should_convert_outside_the_transaction_and_price_concurrent_changes(
+    receipt_service: ReceiptService,
+    paid_receipt_store: PaidReceiptStore,
+) -> None:
+    receipt = receipt_service.add_receipt(
+        Receipt(
+            items=[ReceiptItem(product_id="1", quantity=1, price=1.0)],
+            shift_id="1",
+        )
+    )
+    writers: list[threading.Thread] = []
+
+    class _WritingConversion:
+        def convert(self, amount: float, from_currency: str, to_currency: str) -> float:
+            if not writers:
+                # Blocks until the close commits if the conversion holds
+                # the write lock
+                writers.append(
+                    threading.Thread(
+                        target=receipt_service.update_product_in_receipt,
+                        args=(receipt.id, "2", 1),
+                    )
+                )
+                writers[0].start()
+                writers[0].join(timeout=5)
+            return amount
+
+    receipt_service.currency_conversion_service = _WritingConversion()
+
+    closed = receipt_service.close_receipt(receipt.id, "GEL")
+
+    assert not writers[0].is_alive()
+    assert len(closed.items) == 2
+    assert [paid.paid for paid in paid_receipt_store.list_all()] == [3.0]
@@ -1,8 +1,20 @@
 import pytest
 
-from finalproject.store.distributor import SQLiteStoreDistributor, StoreDistributor
+from finalproject.store.database import SQLiteConfig
+from finalproject.store.distributor import (
+    DEFAULT_STORE_CACHES,
+    InMemoryStoreDistributor,
+    SQLiteStoreDistributor,
+    StoreDistributor,
+)
 
 
-@pytest.fixture
-def distributor() -> StoreDistributor:
+@pytest.fixture(params=["sqlite", "sqlite_cached", "sqlite_binary_ids", "memory"])
+def distributor(request: pytest.FixtureRequest) -> StoreDistributor:
+    if request.param == "memory":
+        return InMemoryStoreDistributor()
+    if request.param == "sqlite_cached":
+        return SQLiteStoreDistributor(":memory:", caches=DEFAULT_STORE_CACHES)
+    if request.param == "sqlite_binary_ids":
+        return SQLiteStoreDistributor(":memory:", SQLiteConfig(binary_ids=True))
     return SQLiteStoreDistributor(":memory:")
@@ -0,0 +1,172 @@
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from finalproject.store.archive import ArchiveConfig, ShiftArchiver
+from finalproject.store.database import SQLiteConfig
+from finalproject.store.distributor import SQLiteStoreDistributor
+from finalproject.store.paid_receipt import PaidReceiptRecord
+from finalproject.store.receipt import ReceiptRecord
+from finalproject.store.receipt_item import ReceiptItemRecord
+from finalproject.store.shift import ShiftRecord
+
+OLD_SHIFT = ShiftRecord(
+    id="old",
+    status="closed",
+    start_time="2020-01-15T09:00:00",
+    end_time="2020-01-15T18:00:00",
+)
+OPEN_SHIFT = ShiftRecord(
+    id="open", status="open", start_time="2020-01-15T09:00:00", end_time=""
+)
+OLD_RECEIPT = ReceiptRecord(id="old_receipt", open=False, shift_id="old")
+OLD_ITEM = ReceiptItemRecord(
+    id="old_item", receipt_id="old_receipt", product_id="1", quantity=2, price=3.0
+)
+OPEN_RECEIPT = ReceiptRecord(id="open_receipt", open=True, shift_id="open")
+
+
+def create_distributor(
+    tmp_path: Path, config: SQLiteConfig = SQLiteConfig()
+) -> SQLiteStoreDistributor:
+    return SQLiteStoreDistributor(
+        str(tmp_path / "pos.db"),
+        config,
+        archive=ArchiveConfig(str(tmp_path / "archive"), retention_days=30),
+    )
+
+
+@pytest.fixture(params=[False, True], ids=["text_ids", "binary_ids"])
+def distributor(
+    tmp_path: Path, request: pytest.FixtureRequest
+) -> SQLiteStoreDistributor:
+    distributor = create_distributor(tmp_path, SQLiteConfig(binary_ids=request.param))
+    distributor.shifts().add_many([OLD_SHIFT, OPEN_SHIFT])
+    distributor.receipt().add_many([OLD_RECEIPT, OPEN_RECEIPT])
+    distributor.receipt_items().add(OLD_ITEM)
+    distributor.paid_receipts().add(
+        PaidReceiptRecord(id="1", receipt_id="old_receipt", currency_name="GEL", paid=6)
+    )
+    return distributor
+
+
+def test_should_move_closed_shifts_past_retention(
+    distributor: SQLiteStoreDistributor, tmp_path: Path
+) -> None:
+    assert distributor.archive_shifts() == 1
+    assert distributor.archive_shifts() == 0
+
+    assert os.listdir(tmp_path / "archive") == ["pos-archive-2020.db"]
+    conn = distributor._db.connection
+    for table, rows in [
+        ("shift", 1),
+        ("receipt", 1),
+        ("receipt_item", 0),
+        ("paid_receipt", 0),
+    ]:
+        assert conn.execute(f"SELECT count(*) FROM main.{table}").fetchone()[0] == rows
+        assert conn.execute(f"SELECT count(*) FROM all_{table}").fetchone()[0] == 2 - (
+            table in ("receipt_item", "paid_receipt")
+        )
+    distributor.destruct()
+
+
+def test_should_read_archived_shifts(distributor: SQLiteStoreDistributor) -> None:
+    distributor.archive_shifts()
+
+    assert distributor.shifts().get_by_id("old") == OLD_SHIFT
+    assert distributor.receipt().get_with_items("old_receipt") == (
+        OLD_RECEIPT,
+        [OLD_ITEM],
+    )
+    assert distributor.receipt().get_by_shift_id_with_items("old") == [
+        (OLD_RECEIPT, [OLD_ITEM])
+    ]
+    assert len(distributor.receipt().list_all_with_items()) == 2
+    receipts = distributor.receipt().iter_all_with_items()
+    assert [receipt.id for receipt, _ in receipts] == ["open_receipt", "old_receipt"]
+    distributor.destruct()
+
+
+def test_should_attach_archives_in_every_thread(
+    distributor: SQLiteStoreDistributor, tmp_path: Path
+) -> None:
+    distributor.archive_shifts()
+    distributor.destruct()
+    reopened = create_distributor(tmp_path)
+    found: list[ShiftRecord] = []
+
+    thread = threading.Thread(
+        target=lambda: found.append(reopened.shifts().get_by_id("old"))
+    )
+    thread.start()
+    thread.join()
+
+    assert found == [OLD_SHIFT]
+    reopened.destruct()
+
+
+def test_should_keep_shifts_within_retention(tmp_path: Path) -> None:
+    distributor = create_distributor(tmp_path)
+    distributor.shifts().add(OLD_SHIFT)
+    archiver = ShiftArchiver(
+        distributor._db,
+        distributor._sql_stores(),
+        ArchiveConfig(str(tmp_path / "archive"), retention_days=30),
+        now=lambda: datetime(2020, 2, 1),
+    )
+
+    assert archiver.archive() == 0
+    distributor.destruct()
+
+
+def add_shift_with_receipt(distributor: SQLiteStoreDistributor, month: str) -> None:
+    distributor.shifts().add(
+        ShiftRecord(
+            id=month,
+            status="closed",
+            start_time=f"{month}-15T09:00:00",
+            end_time=f"{month}-15T18:00:00",
+        )
+    )
+    distributor.receipt().add(ReceiptRecord(id=f"r{month}", open=False, shift_id=month))
+    distributor.receipt_items().add(
+        ReceiptItemRecord(
+            id=f"i{month}", receipt_id=f"r{month}", product_id="1", quantity=1, price=1
+        )
+    )
+
+
+def test_should_read_every_archived_month(tmp_path: Path) -> None:
+    months = [f"{year}-{month:02}" for year in (2018, 2019) for month in range(1, 13)]
+    distributor = create_distributor(tmp_path)
+    for month in months:
+        add_shift_with_receipt(distributor, month)
+
+    assert distributor.archive_shifts() == 24
+    assert len(os.listdir(tmp_path / "archive")) == 2
+
+    def assert_readable(opened: SQLiteStoreDistributor, months: list[str]) -> None:
+        for month in months:
+            receipt, items = opened.receipt().get_with_items(f"r{month}")
+            assert [item.id for item in items] == [f"i{month}"]
+        assert sorted(r.id for r, _ in opened.receipt().iter_all_with_items()) == [
+            f"r{month}" for month in months
+        ]
+
+    assert_readable(distributor, months)
+    distributor.destruct()
+
+    reopened = create_distributor(tmp_path)
+    assert_readable(reopened, months)
+    add_shift_with_receipt(reopened, "2020-01")
+    assert reopened.archive_shifts() == 1
+    assert (
+        reopened._db.reader.execute("SELECT count(*) FROM main.shift").fetchone()[0]
+        == 0
+    )
+    assert_readable(reopened, [*months, "2020-01"])
+    reopened.destruct()
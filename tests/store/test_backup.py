@@ -0,0 +1,190 @@
+import json
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from finalproject.store.archive import ArchiveConfig
+from finalproject.store.backup import BackupConfig, Backups, BackupUnavailable
+from finalproject.store.database import SQLiteConfig
+from finalproject.store.distributor import (
+    InMemoryStoreDistributor,
+    SQLiteStoreDistributor,
+    schema_migrations,
+)
+from finalproject.store.product import ProductRecord
+from finalproject.store.product_discount import ProductDiscountRecord
+from finalproject.store.receipt import ReceiptRecord
+from finalproject.store.shift import ShiftRecord
+
+PRODUCT_ID = "0192a3b4-c5d6-7e8f-9a0b-1c2d3e4f5a6b"
+
+
+def create_distributor(
+    tmp_path: Path, config: SQLiteConfig = SQLiteConfig()
+) -> SQLiteStoreDistributor:
+    return SQLiteStoreDistributor(
+        str(tmp_path / "pos.db"),
+        config,
+        backup=BackupConfig(str(tmp_path / "backups"), pages_per_step=1),
+    )
+
+
+def read_changes(path: str) -> list[dict[str, object]]:
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def test_should_copy_database_in_steps(tmp_path: Path) -> None:
+    distributor = create_distributor(tmp_path)
+    products = [ProductRecord(id=str(i), name="p" * 100, price=1.0) for i in range(100)]
+    distributor.products().add_many(products)
+
+    result = distributor.backup()
+
+    assert not result.incremental
+    assert result.size > 1
+    copy = sqlite3.connect(result.path)
+    assert copy.execute("SELECT count(*) FROM product").fetchone()[0] == 100
+    copy.close()
+    distributor.destruct()
+
+
+@pytest.mark.parametrize("binary_ids", [False, True])
+def test_should_export_changes_since_last_backup(
+    tmp_path: Path, binary_ids: bool
+) -> None:
+    distributor = create_distributor(tmp_path, SQLiteConfig(binary_ids=binary_ids))
+    product = ProductRecord(id=PRODUCT_ID, name="Product", price=1.0)
+    distributor.products().add(product)
+    distributor.backup()
+    distributor.products().update(ProductRecord(id=PRODUCT_ID, name="New", price=2.0))
+    discount = ProductDiscountRecord(id="1", product_id=PRODUCT_ID, discount=0.1)
+    distributor.product_discount().add(discount)
+    distributor.product_discount().remove("1")
+
+    result = distributor.backup(incremental=True)
+
+    assert result.incremental
+    assert read_changes(result.path) == [
+        {
+            "table": "product",
+            "id": PRODUCT_ID,
+            "record": {"id": PRODUCT_ID, "name": "New", "price": 2.0},
+        },
+        {"table": "product_discount", "id": "1", "record": None},
+    ]
+    assert distributor.backup(incremental=True).size == 0
+    conn = distributor._db.connection
+    assert conn.execute("SELECT count(*) FROM change_log").fetchone()[0] == 0
+    distributor.destruct()
+
+
+def test_should_take_backups_when_due(tmp_path: Path) -> None:
+    distributor = create_distributor(tmp_path)
+    now = [0.0]
+    backups = Backups(
+        distributor._db,
+        BackupConfig(
+            str(tmp_path / "backups"),
+            full_every_seconds=100,
+            incremental_every_seconds=10,
+        ),
+        clock=lambda: now[0],
+    )
+
+    assert backups.run_due()
+    assert not backups.run_due()
+    now[0] = 10
+    assert backups.run_due()
+    assert len(list((tmp_path / "backups").iterdir())) == 2
+    distributor.destruct()
+
+
+def test_should_not_back_up_in_memory_stores() -> None:
+    pytest.raises(BackupUnavailable, InMemoryStoreDistributor().backup)
+
+
+def test_should_keep_last_full_backups_and_the_changes_after_them(
+    tmp_path: Path,
+) -> None:
+    distributor = create_distributor(tmp_path)
+    now = [datetime(2024, 1, 1)]
+    backups = Backups(
+        distributor._db,
+        BackupConfig(str(tmp_path / "backups"), keep_full=2),
+        now=lambda: now[0],
+    )
+
+    taken = []
+    for incremental in [False, True, False, True, False, True]:
+        now[0] += timedelta(hours=1)
+        distributor.products().add(ProductRecord(id=str(now[0]), name="p", price=1))
+        result = backups.incremental() if incremental else backups.full()
+        taken.append(Path(result.path).name)
+
+    assert sorted(path.name for path in (tmp_path / "backups").iterdir()) == sorted(
+        taken[2:]
+    )
+    distributor.destruct()
+
+
+def test_should_not_track_changes_without_backups(tmp_path: Path) -> None:
+    database = str(tmp_path / "pos.db")
+    create_distributor(tmp_path).destruct()
+    distributor = SQLiteStoreDistributor(database)
+    distributor.products().add(ProductRecord(id="1", name="Product", price=1.0))
+
+    conn = distributor._db.connection
+    assert conn.execute("SELECT count(*) FROM change_log").fetchone()[0] == 0
+    assert conn.execute(
+        "SELECT count(*) FROM sqlite_master WHERE type = 'trigger'"
+    ).fetchone() == (0,)
+    distributor.destruct()
+
+    distributor = create_distributor(tmp_path)
+    distributor.products().add(ProductRecord(id="2", name="Product", price=1.0))
+
+    # Changes made without tracking are only in a full backup
+    assert not distributor.backup(incremental=True).incremental
+    distributor.products().update(ProductRecord(id="2", name="New", price=1.0))
+    assert distributor.backup(incremental=True).size == 1
+    distributor.destruct()
+
+
+def test_should_back_up_archived_shifts(tmp_path: Path) -> None:
+    distributor = SQLiteStoreDistributor(
+        str(tmp_path / "pos.db"),
+        archive=ArchiveConfig(str(tmp_path / "archive"), retention_days=30),
+        backup=BackupConfig(str(tmp_path / "backups")),
+    )
+    distributor.shifts().add(
+        ShiftRecord("old", "closed", "2020-01-15T09:00:00", "2020-01-15T18:00:00")
+    )
+    distributor.receipt().add(ReceiptRecord(id="r", open=False, shift_id="old"))
+    distributor.backup()
+
+    assert distributor.archive_shifts() == 1
+    # Restoring the full backup and this one keeps the shift in main
+    assert distributor.backup(incremental=True).size == 0
+
+    result = distributor.backup()
+    assert len(result.archives) == 1
+    copy = sqlite3.connect(result.archives[0])
+    assert copy.execute("SELECT id FROM shift").fetchall() == [("old",)]
+    assert copy.execute("SELECT id FROM receipt").fetchall() == [("r",)]
+    copy.close()
+    distributor.destruct()
+
+
+def test_should_leave_triggers_to_backups() -> None:
+    stores = SQLiteStoreDistributor(":memory:")._sql_stores()
+    conn = sqlite3.connect(":memory:")
+
+    schema_migrations(stores).migrate(conn)
+
+    assert conn.execute(
+        "SELECT count(*) FROM sqlite_master WHERE type = 'trigger'"
+    ).fetchone() == (0,)
+    assert conn.execute("SELECT count(*) FROM change_log").fetchone() == (0,)
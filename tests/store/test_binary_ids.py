@@ -0,0 +1,76 @@
+import sqlite3
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+from finalproject.store.binary_ids import decode_id, encode_id
+from finalproject.store.database import SQLiteConfig
+from finalproject.store.distributor import SQLiteStoreDistributor
+from finalproject.store.query import Query
+from finalproject.store.receipt import ReceiptRecord
+from finalproject.store.receipt_item import ReceiptItemRecord
+
+RECEIPT_ID = str(uuid4())
+PRODUCT_ID = str(uuid4())
+RECEIPT = ReceiptRecord(id=RECEIPT_ID, open=True, shift_id="1")
+ITEM = ReceiptItemRecord(
+    id=str(uuid4()), receipt_id=RECEIPT_ID, product_id=PRODUCT_ID, quantity=1, price=1
+)
+
+
+def _id_types(database: str) -> set[str]:
+    conn = sqlite3.connect(database)
+    rows = conn.execute(
+        "SELECT typeof(id), typeof(receipt_id), typeof(product_id) FROM receipt_item"
+    ).fetchall()
+    conn.close()
+    return {kind for row in rows for kind in row}
+
+
+@pytest.mark.parametrize("value", [RECEIPT_ID, "1", RECEIPT_ID.upper(), None, 5])
+def test_should_round_trip_ids(value: object) -> None:
+    assert decode_id(encode_id(value)) == value
+
+
+def test_should_only_encode_canonical_uuids() -> None:
+    assert encode_id(RECEIPT_ID) == bytes.fromhex(RECEIPT_ID.replace("-", ""))
+    assert encode_id(RECEIPT_ID.upper()) == RECEIPT_ID.upper()
+
+
+def test_should_store_and_query_binary_ids(tmp_path: Path) -> None:
+    database = str(tmp_path / "pos.db")
+    distributor = SQLiteStoreDistributor(database, SQLiteConfig(binary_ids=True))
+    distributor.receipt().add(RECEIPT)
+    distributor.receipt_items().add(ITEM)
+
+    receipt_items = distributor.receipt_items()
+    assert _id_types(database) == {"blob"}
+    assert distributor.receipt().get_with_items(RECEIPT_ID) == (RECEIPT, [ITEM])
+    assert list(distributor.receipt().iter_all_with_items()) == [(RECEIPT, [ITEM])]
+    assert receipt_items.get_by_receipt_and_product(RECEIPT_ID, PRODUCT_ID) == ITEM
+    assert receipt_items.filter_by_field_in("product_id", [PRODUCT_ID]) == [ITEM]
+    assert receipt_items.project(Query(), ["receipt_id"]) == [(RECEIPT_ID,)]
+
+    receipt_items.remove(ITEM.id)
+    assert receipt_items.list_all() == []
+    distributor.destruct()
+
+
+def test_should_convert_existing_database_both_ways(tmp_path: Path) -> None:
+    database = str(tmp_path / "pos.db")
+    distributor = SQLiteStoreDistributor(database)
+    distributor.receipt().add(RECEIPT)
+    distributor.receipt_items().add(ITEM)
+    distributor.destruct()
+    assert _id_types(database) == {"text"}
+
+    distributor = SQLiteStoreDistributor(database, SQLiteConfig(binary_ids=True))
+    assert _id_types(database) == {"blob"}
+    assert distributor.receipt().get_with_items(RECEIPT_ID) == (RECEIPT, [ITEM])
+    distributor.destruct()
+
+    distributor = SQLiteStoreDistributor(database)
+    assert _id_types(database) == {"text"}
+    assert distributor.receipt_items().get_by_id(ITEM.id) == ITEM
+    distributor.destruct()
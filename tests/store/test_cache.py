@@ -0,0 +1,150 @@
+import pytest
+
+from finalproject.store.cache import CacheConfig, CacheStats, LRUCache
+from finalproject.store.distributor import (
+    DEFAULT_STORE_CACHES,
+    SQLiteStoreDistributor,
+)
+from finalproject.store.product import ProductRecord
+from finalproject.store.product_discount import ProductDiscountRecord
+from finalproject.store.store import RecordNotFound
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def distributor() -> SQLiteStoreDistributor:
+    return SQLiteStoreDistributor(":memory:", caches=DEFAULT_STORE_CACHES)
+
+
+def test_should_evict_least_recently_used_entry() -> None:
+    stats = CacheStats()
+    cache: LRUCache[int] = LRUCache(CacheConfig(max_entries=2), stats)
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert stats == CacheStats(hits=3, misses=1, evictions=1)
+
+
+def test_should_expire_entries_after_ttl() -> None:
+    clock = _Clock()
+    cache: LRUCache[int] = LRUCache(
+        CacheConfig(ttl_seconds=10), CacheStats(), clock=clock
+    )
+
+    cache.put("a", 1)
+    clock.now = 10
+    assert cache.get("a") == 1
+    clock.now = 10.5
+    assert cache.get("a") is None
+
+
+def test_should_count_hits_and_misses(distributor: SQLiteStoreDistributor) -> None:
+    product_store = distributor.products()
+    product_store.add(ProductRecord(id="1", name="Product 1", price=1.0))
+    product_store.list_all()
+    product_store.list_all()
+
+    product_store.get_by_id("1")
+
+    stats = distributor.cache_stats()["products"]
+    assert (stats.hits, stats.misses) == (2, 1)
+    assert "receipt" not in distributor.cache_stats()
+
+
+def test_should_write_through_on_update_and_add(
+    distributor: SQLiteStoreDistributor,
+) -> None:
+    product_store = distributor.products()
+    product_store.add(ProductRecord(id="1", name="Product 1", price=1.0))
+    assert len(product_store.list_all()) == 1
+
+    product_store.update(ProductRecord(id="1", name="Product 1", price=2.0))
+    product_store.add(ProductRecord(id="2", name="Product 2", price=3.0))
+
+    assert product_store.get_by_id("1").price == 2.0
+    assert len(product_store.list_all()) == 2
+
+
+def test_should_invalidate_on_remove(distributor: SQLiteStoreDistributor) -> None:
+    discount_store = distributor.product_discount()
+    discount_store.add(ProductDiscountRecord(id="1", product_id="1", discount=0.1))
+    assert len(discount_store.get_by_product_id("1")) == 1
+    assert discount_store.get_by_id("1").discount == 0.1
+
+    discount_store.remove("1")
+
+    pytest.raises(RecordNotFound, discount_store.get_by_id, "1")
+    assert discount_store.get_by_product_id("1") == []
+    assert discount_store.list_all() == []
+
+
+def test_should_not_keep_rolled_back_writes(
+    distributor: SQLiteStoreDistributor,
+) -> None:
+    product_store = distributor.products()
+    product = ProductRecord(id="1", name="Product 1", price=1.0)
+    product_store.add(product)
+    product_store.get_by_id("1")
+
+    with pytest.raises(RuntimeError):
+        with distributor.transaction():
+            product_store.update(ProductRecord(id="1", name="Product 1", price=2.0))
+            assert product_store.get_by_id("1").price == 2.0
+            raise RuntimeError()
+
+    assert product_store.get_by_id("1") == product
+    assert product_store.list_all() == [product]
+
+
+def test_should_not_cache_reads_that_raced_with_a_write(
+    distributor: SQLiteStoreDistributor,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    product_store = distributor.products()
+    inner = product_store._store  # type: ignore[attr-defined]
+    inner.add(ProductRecord(id="1", name="Product 1", price=2.0))
+    load = inner.get_by_id
+
+    def load_then_write(unique_id: str) -> ProductRecord:
+        # The read loads the old price, then a writer commits before it
+        # gets to fill the cache
+        stale: ProductRecord = load(unique_id)
+        monkeypatch.setattr(inner, "get_by_id", load)
+        product_store.update(ProductRecord(id="1", name="Product 1", price=3.0))
+        return stale
+
+    monkeypatch.setattr(inner, "get_by_id", load_then_write)
+
+    assert product_store.get_by_id("1").price == 2.0
+    assert product_store.get_by_id("1").price == 3.0
+
+
+def test_should_cache_store_specific_reads(
+    distributor: SQLiteStoreDistributor,
+) -> None:
+    discount_store = distributor.product_discount()
+    discount_store.add(ProductDiscountRecord(id="1", product_id="1", discount=0.1))
+
+    for _ in range(3):
+        assert len(discount_store.get_by_product_id("1")) == 1
+    assert discount_store.get_by_id("1").discount == 0.1
+
+    stats = distributor.cache_stats()["product_discount"]
+    # The record stays cached through the lookups
+    assert (stats.hits, stats.misses) == (3, 1)
+
+    discount_store.add(ProductDiscountRecord(id="2", product_id="1", discount=0.2))
+    assert len(discount_store.get_by_product_id("1")) == 2
@@ -0,0 +1,121 @@
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from finalproject.store.database import SQLiteConfig, SQLiteDatabase
+from finalproject.store.distributor import SQLiteStoreDistributor
+from finalproject.store.product import ProductRecord
+
+
+def _in_thread(target: Callable[[], object]) -> None:
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+
+
+def test_should_apply_configured_pragmas(tmp_path: Path) -> None:
+    db = SQLiteDatabase(
+        str(tmp_path / "pos.db"), SQLiteConfig(synchronous="FULL", busy_timeout_ms=123)
+    )
+
+    assert db.connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert db.connection.execute("PRAGMA synchronous").fetchone()[0] == 2
+    assert db.connection.execute("PRAGMA busy_timeout").fetchone()[0] == 123
+    assert db.connection.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    db.close()
+
+
+def test_should_give_each_thread_its_own_reader(tmp_path: Path) -> None:
+    db = SQLiteDatabase(str(tmp_path / "pos.db"))
+    readers: list[sqlite3.Connection] = []
+    writers: list[sqlite3.Connection] = []
+
+    def connect() -> None:
+        readers.append(db.reader)
+        writers.append(db.connection)
+
+    _in_thread(connect)
+
+    assert readers[0] is not db.reader
+    assert db.reader is db.reader
+    assert db.reader is not db.connection
+    assert writers[0] is db.connection
+    db.close()
+
+
+def test_should_not_write_through_reader(tmp_path: Path) -> None:
+    db = SQLiteDatabase(str(tmp_path / "pos.db"))
+
+    pytest.raises(sqlite3.OperationalError, db.reader.execute, "CREATE TABLE t (a)")
+    db.close()
+
+
+def test_should_queue_writers_of_different_threads(tmp_path: Path) -> None:
+    distributor = SQLiteStoreDistributor(str(tmp_path / "pos.db"))
+
+    def add_products(prefix: str) -> None:
+        for i in range(50):
+            distributor.products().add(
+                ProductRecord(id=f"{prefix}{i}", name="Product", price=1.0)
+            )
+
+    threads = [
+        threading.Thread(target=add_products, args=(prefix,)) for prefix in "abcd"
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(distributor.products().list_all()) == 200
+    distributor.destruct()
+
+
+def test_should_read_own_writes_inside_transaction(tmp_path: Path) -> None:
+    distributor = SQLiteStoreDistributor(str(tmp_path / "pos.db"))
+    product = ProductRecord(id="1", name="Product 1", price=1.0)
+
+    with distributor.transaction():
+        distributor.products().add(product)
+        assert distributor.products().get_by_id("1") == product
+
+    distributor.destruct()
+
+
+def test_should_share_connection_of_in_memory_database() -> None:
+    db = SQLiteDatabase(":memory:")
+    connections: list[sqlite3.Connection] = []
+
+    _in_thread(lambda: connections.append(db.connection))
+
+    assert connections[0] is db.connection
+    db.close()
+
+
+def test_should_read_committed_data_while_other_thread_writes(tmp_path: Path) -> None:
+    distributor = SQLiteStoreDistributor(str(tmp_path / "pos.db"))
+    product = ProductRecord(id="1", name="Product 1", price=1.0)
+    distributor.products().add(product)
+    read: list[list[ProductRecord]] = []
+
+    with distributor.transaction():
+        distributor.products().add(ProductRecord(id="2", name="Product 2", price=2.0))
+        _in_thread(lambda: read.append(distributor.products().list_all()))
+
+    assert read == [[product]]
+    assert len(distributor.products().list_all()) == 2
+    distributor.destruct()
+
+
+def test_should_close_every_connection(tmp_path: Path) -> None:
+    db = SQLiteDatabase(str(tmp_path / "pos.db"))
+    connections = [db.connection]
+
+    _in_thread(lambda: connections.append(db.connection))
+    db.close()
+
+    for connection in connections:
+        pytest.raises(sqlite3.ProgrammingError, connection.execute, "SELECT 1")
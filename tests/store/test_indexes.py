@@ -0,0 +1,93 @@
+from typing import Callable
+
+import pytest
+
+from finalproject.store.buy_n_get_n import BuyNGetNSQLiteStore
+from finalproject.store.combo_item import ComboItemSQLiteStore
+from finalproject.store.database import SQLiteDatabase
+from finalproject.store.distributor import schema_migrations
+from finalproject.store.paid_receipt import PaidReceiptSQLiteStore
+from finalproject.store.product import ProductRecord, ProductSQLiteStore
+from finalproject.store.product_discount import ProductDiscountSQLiteStore
+from finalproject.store.receipt import ReceiptRecord, ReceiptSQLiteStore
+from finalproject.store.receipt_item import ReceiptItemSQLiteStore
+from finalproject.store.shift import ShiftSQLiteStore
+from finalproject.store.store import RecordNotFound
+
+
+class _Stores:
+    def __init__(self, db: SQLiteDatabase) -> None:
+        self.products = ProductSQLiteStore(db)
+        self.receipts = ReceiptSQLiteStore(db)
+        self.receipt_items = ReceiptItemSQLiteStore(db)
+        self.combo_items = ComboItemSQLiteStore(db)
+        self.product_discounts = ProductDiscountSQLiteStore(db)
+        self.paid_receipts = PaidReceiptSQLiteStore(db)
+        self.buy_n_get_n = BuyNGetNSQLiteStore(db)
+        self.shifts = ShiftSQLiteStore(db)
+
+        schema_migrations(vars(self).values()).migrate(db.connection)
+
+
+STORE_QUERIES: dict[str, Callable[[_Stores], object]] = {
+    "product.get_by_id": lambda s: s.products.get_by_id("1"),
+    "product.update": lambda s: s.products.update(ProductRecord("1", "p", 1.0)),
+    "product.iter_all": lambda s: list(s.products.iter_all()),
+    "receipt.get_by_shift_id": lambda s: s.receipts.get_by_shift_id("1"),
+    "receipt.close_receipt_by_id": lambda s: s.receipts.close_receipt_by_id("1"),
+    "receipt.get_with_items": lambda s: s.receipts.get_with_items("1"),
+    "receipt.iter_all_with_items": (
+        lambda s: (
+            s.receipts.add(ReceiptRecord("1", True, "1")),
+            list(s.receipts.iter_all_with_items()),
+        )
+    ),
+    "receipt.get_by_shift_id_with_items": (
+        lambda s: s.receipts.get_by_shift_id_with_items("1")
+    ),
+    "receipt_item.get_by_receipt_id": lambda s: s.receipt_items.get_by_receipt_id("1"),
+    "receipt_item.remove": lambda s: s.receipt_items.remove("1"),
+    "receipt_item.get_by_receipt_and_product": (
+        lambda s: s.receipt_items.get_by_receipt_and_product("1", "1")
+    ),
+    "receipt_item.iter_filter_by_receipt_id": (
+        lambda s: list(s.receipt_items.iter_filter("receipt_id", "1"))
+    ),
+    "combo_item.filter_by_combo_id": (
+        lambda s: s.combo_items.filter_by_field("combo_id", "1")
+    ),
+    "product_discount.get_by_product_id": (
+        lambda s: s.product_discounts.get_by_product_id("1")
+    ),
+    "paid_receipt.filter_by_receipt_id": (
+        lambda s: s.paid_receipts.filter_by_field("receipt_id", "1")
+    ),
+    "buy_n_get_n.get_by_product_id": lambda s: s.buy_n_get_n.get_by_product_id("1"),
+    "shift.get_by_id": lambda s: s.shifts.get_by_id("1"),
+}
+
+
+@pytest.mark.parametrize("query", STORE_QUERIES.keys())
+def test_store_query_should_use_index(query: str) -> None:
+    db = SQLiteDatabase(":memory:")
+    stores = _Stores(db)
+    conn = db.connection
+
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    try:
+        STORE_QUERIES[query](stores)
+    except RecordNotFound:
+        pass
+    conn.set_trace_callback(None)
+
+    searches = [s for s in statements if " WHERE " in s.upper()]
+    assert searches
+
+    for statement in searches:
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {statement}").fetchall()
+        details = [row[3] for row in plan]
+        assert not any(detail.startswith("SCAN") for detail in details), (
+            statement,
+            details,
+        )
@@ -0,0 +1,105 @@
+import logging
+from pathlib import Path
+
+import pytest
+
+from finalproject.store.distributor import SQLiteStoreDistributor
+from finalproject.store.maintenance import (
+    ActivityMonitor,
+    MaintenanceConfig,
+    MaintenanceScheduler,
+)
+from finalproject.store.product_discount import ProductDiscountRecord
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_should_count_requests_in_window() -> None:
+    clock = FakeClock()
+    activity = ActivityMonitor(window_seconds=10, clock=clock)
+
+    for _ in range(3):
+        activity.record_request()
+    clock.now += 5
+    activity.record_request()
+    assert activity.requests_in_window() == 4
+
+    clock.now += 7
+    assert activity.requests_in_window() == 1
+
+
+def test_should_wait_for_quiet_period(tmp_path: Path) -> None:
+    distributor = SQLiteStoreDistributor(str(tmp_path / "pos.db"))
+    scheduler = MaintenanceScheduler(
+        str(tmp_path / "pos.db"), MaintenanceConfig(quiet_max_requests=1)
+    )
+
+    scheduler.activity.record_request()
+    scheduler.activity.record_request()
+
+    assert scheduler.run_once() == []
+    scheduler.stop()
+    distributor.destruct()
+
+
+def test_should_analyze_vacuum_and_checkpoint(tmp_path: Path) -> None:
+    path = str(tmp_path / "pos.db")
+    distributor = SQLiteStoreDistributor(path)
+    discounts = [
+        ProductDiscountRecord(id=str(i), product_id="x" * 200, discount=0.1)
+        for i in range(2000)
+    ]
+    distributor.product_discount().add_many(discounts)
+    for discount in discounts:
+        distributor.product_discount().remove(discount.id)
+    clock = FakeClock()
+    scheduler = MaintenanceScheduler(path, clock=clock)
+
+    assert scheduler.run_once() == ["analyze", "incremental_vacuum", "checkpoint"]
+    conn = distributor._db.connection
+    assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    assert conn.execute("SELECT count(*) FROM sqlite_stat1").fetchone()[0] > 0
+
+    clock.now += 60
+    assert scheduler.run_once() == ["checkpoint"]
+    scheduler.stop()
+    distributor.destruct()
+
+
+def test_should_stop_maintenance_with_distributor(tmp_path: Path) -> None:
+    distributor = SQLiteStoreDistributor(
+        str(tmp_path / "pos.db"), maintenance=MaintenanceConfig(interval_seconds=0.01)
+    )
+    distributor.activity().record_request()
+
+    distributor.destruct()
+
+    assert distributor._maintenance is not None
+    assert distributor._maintenance._thread is None
+
+
+def test_should_keep_running_tasks_after_one_fails(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    path = str(tmp_path / "pos.db")
+    distributor = SQLiteStoreDistributor(path)
+
+    def back_up() -> bool:
+        raise FileExistsError(str(tmp_path / "backups"))
+
+    scheduler = MaintenanceScheduler(
+        path, clock=FakeClock(), tasks=[("backup", back_up), ("archive", lambda: True)]
+    )
+
+    with caplog.at_level(logging.ERROR):
+        assert scheduler.run_once()[:2] == ["archive", "analyze"]
+        assert scheduler.run_once() == ["archive", "checkpoint"]
+    assert "Maintenance task backup failed" in caplog.text
+    scheduler.stop()
+    distributor.destruct()
@@ -0,0 +1,42 @@
+import pytest
+
+from finalproject.store.distributor import SQLiteStoreDistributor
+from finalproject.store.metrics import OperationStats, track_request
+from finalproject.store.product import ProductRecord
+from finalproject.store.receipt_item import ReceiptItemRecord
+from finalproject.store.store import RecordAlreadyExists
+
+
+def test_should_count_outermost_operations_rows_and_commits() -> None:
+    distributor = SQLiteStoreDistributor(":memory:")
+    item = ReceiptItemRecord(
+        id="1", receipt_id="1", product_id="1", quantity=1, price=1
+    )
+    distributor.receipt_items().add_many([item])
+
+    with track_request() as summary:
+        distributor.receipt_items().get_by_receipt_id("1")
+        distributor.receipt_items().get_by_receipt_and_product("1", "1")
+        list(distributor.receipt_items().iter_all(batch_size=1))
+
+    snapshot = distributor.metrics().snapshot()
+    assert snapshot[("receipt_item", "get_by_receipt_id")].rows == 1
+    assert ("receipt_item", "filter_by_field") not in snapshot
+    assert ("receipt_item", "find_first") not in snapshot
+    assert snapshot[("receipt_item", "iter_all")].count == 2
+    assert distributor.metrics().commits == 1
+    assert summary.operations == 4
+    assert summary.rows == 3
+
+
+def test_should_count_failed_operations() -> None:
+    distributor = SQLiteStoreDistributor(":memory:")
+    product = ProductRecord(id="1", name="Product 1", price=1.0)
+    distributor.products().add(product)
+
+    pytest.raises(RecordAlreadyExists, distributor.products().add, product)
+
+    stats = distributor.metrics().snapshot()[("product", "add")]
+    assert stats.count == 2
+    assert stats.errors == 1
+    assert stats == OperationStats(count=2, seconds=stats.seconds, rows=1, errors=1)
@@ -0,0 +1,111 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from finalproject.store.distributor import SQLiteStoreDistributor
+from finalproject.store.migrations import Migration, MigrationRegistry
+from finalproject.store.product import ProductRecord
+from finalproject.store.receipt_item import ReceiptItemRecord
+
+
+def _tables(conn: sqlite3.Connection) -> set[str]:
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    return {row[0] for row in rows.fetchall()}
+
+
+def test_should_apply_migrations_in_order() -> None:
+    conn = sqlite3.connect(":memory:")
+    registry = (
+        MigrationRegistry()
+        .register(Migration(2, "Add column", ("ALTER TABLE a ADD COLUMN b TEXT",)))
+        .register(Migration(1, "Create table", ("CREATE TABLE a (id TEXT)",)))
+    )
+
+    assert registry.migrate(conn) == 2
+    assert registry.current_version(conn) == 2
+    conn.execute("INSERT INTO a (id, b) VALUES ('1', '2')")
+
+
+def test_should_skip_applied_migrations() -> None:
+    conn = sqlite3.connect(":memory:")
+    MigrationRegistry().register(
+        Migration(1, "Create table", ("CREATE TABLE a (id TEXT)",))
+    ).migrate(conn)
+
+    registry = (
+        MigrationRegistry()
+        .register(Migration(1, "Create table", ("CREATE TABLE a (id TEXT)",)))
+        .register(Migration(2, "Create table", ("CREATE TABLE b (id TEXT)",)))
+    )
+
+    assert registry.migrate(conn) == 2
+    assert {"a", "b"} <= _tables(conn)
+
+
+def test_should_roll_back_failed_migration() -> None:
+    conn = sqlite3.connect(":memory:")
+    registry = MigrationRegistry().register(
+        Migration(1, "Broken", ("CREATE TABLE a (id TEXT)", "NOT SQL"))
+    )
+
+    pytest.raises(sqlite3.OperationalError, registry.migrate, conn)
+
+    assert registry.current_version(conn) == 0
+    assert "a" not in _tables(conn)
+
+
+def test_should_raise_error_when_registering_same_version_twice() -> None:
+    registry = MigrationRegistry().register(Migration(1, "First", ()))
+
+    pytest.raises(ValueError, registry.register, Migration(1, "Second", ()))
+
+
+def test_should_keep_data_when_reopening_database(tmp_path: Path) -> None:
+    database = str(tmp_path / "pos.db")
+    product = ProductRecord(id="unique-id-1", name="Product 1", price=9.99)
+
+    distributor = SQLiteStoreDistributor(database)
+    distributor.products().add(product)
+    distributor.destruct()
+
+    distributor = SQLiteStoreDistributor(database)
+
+    assert distributor.products().get_by_id("unique-id-1") == product
+    distributor.destruct()
+
+
+def test_should_merge_duplicate_receipt_items(tmp_path: Path) -> None:
+    database = str(tmp_path / "pos.db")
+    # A database from before migrations, tables without any index
+    conn = sqlite3.connect(database)
+    conn.executescript(
+        """
+        CREATE TABLE receipt_item (
+            id TEXT PRIMARY KEY,
+            receipt_id TEXT,
+            product_id TEXT,
+            quantity INTEGER,
+            price REAL
+        );
+        INSERT INTO receipt_item VALUES ('1', 'r', 'p', 1, 2.0);
+        INSERT INTO receipt_item VALUES ('2', 'r', 'p', 3, 2.0);
+        INSERT INTO receipt_item VALUES ('3', 'r', 'q', 1, 1.0);
+        """
+    )
+    conn.close()
+
+    distributor = SQLiteStoreDistributor(database)
+    items = distributor.receipt_items()
+
+    assert items.get_by_receipt_id("r") == [
+        ReceiptItemRecord(
+            id="1", receipt_id="r", product_id="p", quantity=4, price=2.0
+        ),
+        ReceiptItemRecord(
+            id="3", receipt_id="r", product_id="q", quantity=1, price=1.0
+        ),
+    ]
+    items.increment_quantity("r", "p", 1, 2.0, new_id="4")
+    assert items.get_by_receipt_and_product("r", "p").quantity == 5
+    distributor.destruct()
@@ -74,3 +74,78 @@ def test_should_raise_error_in_update_when_product_does_not_exist(
     product = ProductRecord(id="unique-id-1", name="Product 1", price=9.99)
 
     pytest.raises(RecordNotFound, product_store.update, product)
+
+
+def test_should_add_and_get_many_products(distributor: StoreDistributor) -> None:
+    product_store = distributor.products()
+
+    products = [
+        ProductRecord(id=f"unique-id-{i}", name=f"Product {i}", price=float(i))
+        for i in range(1200)
+    ]
+    product_store.add_many(products)
+
+    found = product_store.get_many_by_ids(
+        [product.id for product in products] + ["missing-id"]
+    )
+    assert len(found) == len(products)
+    assert set(found) == set(products)
+
+
+def test_should_raise_error_and_add_nothing_when_adding_many_with_same_id(
+    distributor: StoreDistributor,
+) -> None:
+    product_store = distributor.products()
+
+    product1 = ProductRecord(id="unique-id-1", name="Product 1", price=9.99)
+    product2 = ProductRecord(id="unique-id-2", name="Product 2", price=19.99)
+    product3 = ProductRecord(id="unique-id-2", name="Product 3", price=29.99)
+
+    pytest.raises(
+        RecordAlreadyExists, product_store.add_many, [product1, product2, product3]
+    )
+    assert product_store.list_all() == []
+
+
+def test_should_filter_products_by_field_in(distributor: StoreDistributor) -> None:
+    product_store = distributor.products()
+
+    product1 = ProductRecord(id="unique-id-1", name="Product 1", price=9.99)
+    product2 = ProductRecord(id="unique-id-2", name="Product 2", price=19.99)
+    product3 = ProductRecord(id="unique-id-3", name="Product 3", price=29.99)
+    product_store.add_many([product1, product2, product3])
+
+    found = product_store.filter_by_field_in("name", ["Product 1", "Product 3"])
+
+    assert sorted(found, key=lambda product: product.id) == [product1, product3]
+    assert product_store.filter_by_field_in("name", []) == []
+
+
+def test_should_upsert_product(distributor: StoreDistributor) -> None:
+    product_store = distributor.products()
+
+    product = ProductRecord(id="unique-id-1", name="Product 1", price=9.99)
+    updated_product = ProductRecord(id="unique-id-1", name="Product 1", price=19.99)
+
+    product_store.upsert(product)
+    assert product_store.get_by_id("unique-id-1") == product
+
+    product_store.upsert(updated_product)
+    assert product_store.list_all() == [updated_product]
+
+
+def test_should_iterate_over_all_products_in_batches(
+    distributor: StoreDistributor,
+) -> None:
+    product_store = distributor.products()
+    products = [
+        ProductRecord(id=f"unique-id-{i:02}", name=f"Product {i % 3}", price=i)
+        for i in range(10)
+    ]
+    product_store.add_many(products)
+
+    assert list(product_store.iter_all(batch_size=3)) == products
+    assert list(product_store.iter_all(batch_size=10)) == products
+    assert list(product_store.iter_filter("name", "Product 1", batch_size=2)) == [
+        product for product in products if product.name == "Product 1"
+    ]
@@ -0,0 +1,133 @@
+import pytest
+
+from finalproject.store.distributor import StoreDistributor
+from finalproject.store.product import ProductRecord
+from finalproject.store.query import Query
+from finalproject.store.receipt_item import ReceiptItemRecord
+from finalproject.store.store import RecordNotFound, UnknownField
+
+PRODUCTS = [
+    ProductRecord(id=f"unique-id-{i}", name=f"Product {i % 2}", price=float(i))
+    for i in range(6)
+]
+
+
+@pytest.fixture
+def products(distributor: StoreDistributor) -> StoreDistributor:
+    distributor.products().add_many(PRODUCTS)
+    return distributor
+
+
+def test_should_find_by_equality_and_range(products: StoreDistributor) -> None:
+    query = Query().where("name", "=", "Product 1").where("price", ">", 1.0)
+
+    assert products.products().find(query) == [PRODUCTS[3], PRODUCTS[5]]
+    assert products.products().find(Query().between("price", 2.0, 3.0)) == [
+        PRODUCTS[2],
+        PRODUCTS[3],
+    ]
+
+
+def test_should_order_and_limit(products: StoreDistributor) -> None:
+    query = Query().order_by("price", descending=True).limit(2, offset=1)
+
+    assert products.products().find(query) == [PRODUCTS[4], PRODUCTS[3]]
+
+
+def test_should_skip_without_limit(products: StoreDistributor) -> None:
+    query = Query().order_by("price").offset(4)
+
+    assert products.products().find(query) == [PRODUCTS[4], PRODUCTS[5]]
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        (Query().where("price", ">", 3.0), ["unique-id-4", "unique-id-5"]),
+        (Query().where("price", "!=", 0.0).where("price", "<", 2.0), ["unique-id-1"]),
+        (Query().where("price", "=", None), []),
+        (
+            Query().where("name", "=", "Product 0").order_by("price"),
+            ["unique-id-null", "unique-id-0", "unique-id-2", "unique-id-4"],
+        ),
+        (
+            Query().where("name", "=", "Product 0").order_by("price", descending=True),
+            ["unique-id-4", "unique-id-2", "unique-id-0", "unique-id-null"],
+        ),
+    ],
+)
+def test_should_treat_missing_values_like_null(
+    products: StoreDistributor, query: Query, expected: list[str]
+) -> None:
+    store = products.products()
+    store.add(ProductRecord(id="unique-id-null", name="Product 0", price=None))  # type: ignore[arg-type]
+
+    assert [record.id for record in store.find(query)] == expected
+
+
+def test_should_count_ignoring_limit(products: StoreDistributor) -> None:
+    query = Query().where("name", "=", "Product 0").limit(1)
+
+    assert products.products().count(query) == 3
+    assert products.products().count() == 6
+
+
+def test_should_project_fields(products: StoreDistributor) -> None:
+    query = Query().where("price", "<", 2.0).order_by("price")
+
+    assert products.products().project(query, ["id", "price"]) == [
+        ("unique-id-0", 0.0),
+        ("unique-id-1", 1.0),
+    ]
+
+
+def test_should_raise_error_when_first_record_does_not_exist(
+    products: StoreDistributor,
+) -> None:
+    query = Query().where("price", ">", 100.0)
+
+    pytest.raises(RecordNotFound, products.products().find_first, query)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        Query().where("price; DROP TABLE product", "=", 1),
+        Query().order_by("missing"),
+    ],
+)
+def test_should_reject_unknown_fields(products: StoreDistributor, query: Query) -> None:
+    pytest.raises(UnknownField, products.products().find, query)
+
+
+def test_should_reject_unknown_field_in_filter(products: StoreDistributor) -> None:
+    store = products.products()
+
+    pytest.raises(UnknownField, store.filter_by_field, "1 = 1 OR name", "x")
+    pytest.raises(UnknownField, store.filter_by_field_in, "1 = 1 OR name", ["x"])
+    pytest.raises(UnknownField, store.project, Query(), ["id", "secret"])
+    assert len(store.list_all()) == len(PRODUCTS)
+
+
+def test_should_share_shape_between_queries_with_different_values() -> None:
+    first = Query().where("name", "=", "a").limit(1, offset=2)
+    second = Query().where("name", "=", "b").limit(5)
+
+    assert first.shape() == second.shape()
+    assert first.shape() != Query().where("name", ">", "a").limit(1).shape()
+
+
+def test_should_get_receipt_item_by_receipt_and_product(
+    distributor: StoreDistributor,
+) -> None:
+    items = [
+        ReceiptItemRecord(id="1", receipt_id="1", product_id="1", quantity=1, price=1),
+        ReceiptItemRecord(id="2", receipt_id="1", product_id="2", quantity=2, price=2),
+        ReceiptItemRecord(id="3", receipt_id="2", product_id="2", quantity=3, price=2),
+    ]
+    distributor.receipt_items().add_many(items)
+
+    store = distributor.receipt_items()
+
+    assert store.get_by_receipt_and_product("1", "2") == items[1]
+    pytest.raises(RecordNotFound, store.get_by_receipt_and_product, "2", "1")
@@ -1,3 +1,118 @@
+import pytest
+
+from finalproject.store.distributor import StoreDistributor
+from finalproject.store.receipt import ReceiptRecord
+from finalproject.store.receipt_item import ReceiptItemRecord
+from finalproject.store.store import RecordAlreadyExists, RecordNotFound
+
+
+def test_should_load_receipts_with_items_by_shift_id(
+    distributor: StoreDistributor,
+) -> None:
+    receipt1 = ReceiptRecord(id="1", open=True, shift_id="1")
+    receipt2 = ReceiptRecord(id="2", open=True, shift_id="1")
+    receipt3 = ReceiptRecord(id="3", open=True, shift_id="2")
+    item1 = ReceiptItemRecord(
+        id="1", receipt_id="1", product_id="1", quantity=1, price=1.0
+    )
+    item2 = ReceiptItemRecord(
+        id="2", receipt_id="1", product_id="2", quantity=2, price=2.0
+    )
+    item3 = ReceiptItemRecord(
+        id="3", receipt_id="3", product_id="1", quantity=1, price=1.0
+    )
+    distributor.receipt().add_many([receipt1, receipt2, receipt3])
+    distributor.receipt_items().add_many([item1, item2, item3])
+
+    receipts = distributor.receipt().get_by_shift_id_with_items("1")
+
+    assert sorted(receipts, key=lambda receipt: receipt[0].id) == [
+        (receipt1, [item1, item2]),
+        (receipt2, []),
+    ]
+    assert len(distributor.receipt().list_all_with_items()) == 3
+    assert distributor.receipt().get_with_items("3") == (receipt3, [item3])
+
+
+def test_should_iterate_over_receipts_with_items_in_batches(
+    distributor: StoreDistributor,
+) -> None:
+    receipts = [ReceiptRecord(id=str(i), open=True, shift_id="1") for i in range(5)]
+    items = [
+        ReceiptItemRecord(
+            id=f"{receipt.id}-{product}",
+            receipt_id=receipt.id,
+            product_id=str(product),
+            quantity=1,
+            price=1.0,
+        )
+        for receipt in receipts
+        for product in range(3)
+    ]
+    distributor.receipt().add_many(receipts)
+    distributor.receipt_items().add_many(items)
+
+    loaded = list(distributor.receipt().iter_all_with_items(batch_size=2))
+
+    assert [receipt for receipt, _ in loaded] == receipts
+    assert all(len(receipt_items) == 3 for _, receipt_items in loaded)
+
+
+def test_should_raise_error_when_loading_non_existent_receipt_with_items(
+    distributor: StoreDistributor,
+) -> None:
+    pytest.raises(RecordNotFound, distributor.receipt().get_with_items, "1")
+
+
+def test_should_increment_item_quantity(distributor: StoreDistributor) -> None:
+    items = distributor.receipt_items()
+
+    added = items.increment_quantity("1", "1", 2, 3.0, new_id="1")
+    incremented = items.increment_quantity("1", "1", 3, 4.0, new_id="2")
+
+    assert added == ReceiptItemRecord(
+        id="1", receipt_id="1", product_id="1", quantity=2, price=3.0
+    )
+    assert incremented == ReceiptItemRecord(
+        id="1", receipt_id="1", product_id="1", quantity=5, price=3.0
+    )
+    assert items.get_by_receipt_id("1") == [incremented]
+
+
+def test_should_remove_item_when_quantity_drops_to_zero(
+    distributor: StoreDistributor,
+) -> None:
+    items = distributor.receipt_items()
+    items.increment_quantity("1", "1", 2, 3.0, new_id="1")
+
+    assert items.increment_quantity("1", "1", -5, 3.0, new_id="2") is None
+    assert items.increment_quantity("1", "2", -1, 3.0, new_id="3") is None
+    assert items.get_by_receipt_id("1") == []
+
+
+def test_should_keep_one_item_per_receipt_and_product(
+    distributor: StoreDistributor,
+) -> None:
+    items = distributor.receipt_items()
+    items.add(ReceiptItemRecord("1", "1", "1", 1, 1.0))
+    items.add(ReceiptItemRecord("2", "1", "2", 1, 1.0))
+
+    duplicate = ReceiptItemRecord("3", "1", "1", 1, 1.0)
+    pytest.raises(RecordAlreadyExists, items.add, duplicate)
+    pytest.raises(
+        RecordAlreadyExists,
+        items.add_many,
+        [
+            ReceiptItemRecord("4", "2", "1", 1, 1.0),
+            ReceiptItemRecord("5", "2", "1", 1, 1.0),
+        ],
+    )
+    pytest.raises(
+        RecordAlreadyExists, items.update, ReceiptItemRecord("2", "1", "1", 1, 1.0)
+    )
+    assert len(items.list_all()) == 2
+
+
 # import pytest
 #
 # from finalproject.store.distributor import StoreDistributor
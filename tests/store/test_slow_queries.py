@@ -0,0 +1,68 @@
+import sqlite3
+
+from finalproject.store.database import SQLiteConfig
+from finalproject.store.distributor import SQLiteStoreDistributor
+from finalproject.store.product import ProductRecord
+from finalproject.store.receipt_item import ReceiptItemRecord
+from finalproject.store.slow_queries import SlowQueryConfig, SlowQueryLog
+
+
+def log_everything(capacity: int = 100) -> SQLiteConfig:
+    return SQLiteConfig(slow_queries=SlowQueryConfig(threshold_ms=0, capacity=capacity))
+
+
+def test_should_log_statement_with_plan_and_redacted_parameters() -> None:
+    distributor = SQLiteStoreDistributor(":memory:", log_everything())
+    item = ReceiptItemRecord(
+        id="1", receipt_id="secret", product_id="1", quantity=1, price=1
+    )
+    distributor.receipt_items().add(item)
+
+    distributor.receipt_items().get_by_receipt_id("secret")
+
+    entry = distributor.slow_queries().entries()[-1]
+    assert entry.sql.startswith("SELECT")
+    assert "receipt_id = ?" in entry.sql
+    assert entry.parameters == ("str",)
+    assert any("idx_receipt_item_receipt_id" in step for step in entry.plan)
+    assert entry.duration_ms >= 0
+
+
+def test_should_skip_statements_under_threshold() -> None:
+    distributor = SQLiteStoreDistributor(":memory:")
+
+    distributor.products().list_all()
+
+    assert distributor.slow_queries().entries() == []
+
+
+def test_should_keep_only_latest_entries() -> None:
+    distributor = SQLiteStoreDistributor(":memory:", log_everything(capacity=2))
+    for i in range(3):
+        distributor.products().add(ProductRecord(id=str(i), name="p", price=1.0))
+
+    distributor.products().list_all()
+
+    entries = distributor.slow_queries().entries()
+    assert len(entries) == 2
+    assert entries[-1].sql.startswith("SELECT")
+
+
+def test_should_rank_statements_by_slowest_run() -> None:
+    log = SlowQueryLog(SlowQueryConfig(threshold_ms=10))
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t (a TEXT)")
+
+    log.observe(conn, "SELECT a FROM t", (), 0.02)
+    log.observe(conn, "SELECT a FROM t WHERE a = ?", ("x",), 0.05)
+    log.observe(conn, "SELECT a FROM t", (), 0.03)
+    log.observe(conn, "SELECT a FROM t", (), 0.001)
+
+    worst = log.worst()
+    assert [summary.sql for summary in worst] == [
+        "SELECT a FROM t WHERE a = ?",
+        "SELECT a FROM t",
+    ]
+    assert worst[1].occurrences == 2
+    assert round(worst[1].worst.duration_ms) == 30
+    assert worst[0].worst.parameters == ("str",)
@@ -0,0 +1,82 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from finalproject.store.distributor import (
+    InMemoryStoreDistributor,
+    SQLiteStoreDistributor,
+)
+from finalproject.store.product import ProductRecord
+from finalproject.store.receipt import ReceiptRecord
+from finalproject.store.receipt_item import ReceiptItemRecord
+
+
+def _count_products(database: str) -> int:
+    conn = sqlite3.connect(database)
+    count: int = conn.execute("SELECT COUNT(*) FROM product").fetchone()[0]
+    conn.close()
+    return count
+
+
+def test_should_commit_transaction_once_on_exit(tmp_path: Path) -> None:
+    database = str(tmp_path / "pos.db")
+    distributor = SQLiteStoreDistributor(database)
+    product_store = distributor.products()
+
+    with distributor.transaction():
+        product_store.add(ProductRecord(id="1", name="Product 1", price=1.0))
+        product_store.add(ProductRecord(id="2", name="Product 2", price=2.0))
+        product_store.update(ProductRecord(id="1", name="Product 1", price=3.0))
+
+        assert _count_products(database) == 0
+
+    assert _count_products(database) == 2
+    assert product_store.get_by_id("1").price == 3.0
+    distributor.destruct()
+
+
+def test_should_roll_back_every_write_on_error(tmp_path: Path) -> None:
+    database = str(tmp_path / "pos.db")
+    distributor = SQLiteStoreDistributor(database)
+    product_store = distributor.products()
+
+    with pytest.raises(RuntimeError):
+        with distributor.transaction():
+            product_store.add(ProductRecord(id="1", name="Product 1", price=1.0))
+            with distributor.transaction():
+                product_store.add(ProductRecord(id="2", name="Product 2", price=2.0))
+            raise RuntimeError()
+
+    assert product_store.list_all() == []
+    assert _count_products(database) == 0
+    distributor.destruct()
+
+
+def test_should_roll_back_in_memory_writes_and_indexes_on_error() -> None:
+    distributor = InMemoryStoreDistributor()
+    item = ReceiptItemRecord(
+        id="1", receipt_id="1", product_id="1", quantity=1, price=1
+    )
+    distributor.receipt().add(ReceiptRecord(id="1", open=True, shift_id="1"))
+    distributor.receipt_items().add(item)
+
+    with pytest.raises(RuntimeError):
+        with distributor.transaction():
+            distributor.receipt().close_receipt_by_id("1")
+            distributor.receipt_items().update(
+                ReceiptItemRecord(
+                    id="1", receipt_id="2", product_id="1", quantity=5, price=1
+                )
+            )
+            distributor.receipt_items().remove("1")
+            distributor.receipt_items().add(
+                ReceiptItemRecord(
+                    id="2", receipt_id="1", product_id="2", quantity=1, price=1
+                )
+            )
+            raise RuntimeError()
+
+    assert distributor.receipt().get_by_id("1").open
+    assert distributor.receipt_items().get_by_receipt_id("1") == [item]
+    assert distributor.receipt_items().get_by_receipt_id("2") == []